@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Any, Callable, Tuple
+
+if sys.version_info > (3, 9):
+    from collections.abc import Sequence
+else:
+    from typing import Sequence
+
+import sqlitecollections as sc
+from sqlitecollections import codecs
+
+target_len = 10000
+targets: Sequence[Tuple[str, codecs.Codec, Sequence[Any]]] = (
+    ("str", codecs.STR, [f"user:{i}:name" for i in range(target_len)]),
+    ("bytes", codecs.BYTES, [f"payload-{i}".encode("utf-8") for i in range(target_len)]),
+    ("int", codecs.INT, list(range(target_len))),
+    ("float", codecs.FLOAT, [i / 7 for i in range(target_len)]),
+    ("tuple", codecs.TUPLE, [(i, f"k{i}", i / 3) for i in range(target_len)]),
+)
+
+
+def measure(fn: Callable[[], Any]) -> float:
+    t1 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t1
+
+
+def bench_dict(codec: codecs.Codec, data: Sequence[Any]) -> Tuple[float, float]:
+    sut = sc.Dict[Any, Any](
+        key_serializer=codec.serializer,
+        key_deserializer=codec.deserializer,
+        value_serializer=codec.serializer,
+        value_deserializer=codec.deserializer,
+    )
+    write = measure(lambda: sut.update((d, d) for d in data))
+    read = measure(lambda: [sut[d] for d in data])
+    return (write, read)
+
+
+def bench_list(codec: codecs.Codec, data: Sequence[Any]) -> Tuple[float, float]:
+    sut = sc.List[Any](serializer=codec.serializer, deserializer=codec.deserializer)
+    write = measure(lambda: sut.extend(data))
+    read = measure(lambda: list(sut))
+    return (write, read)
+
+
+def bench_set(codec: codecs.Codec, data: Sequence[Any]) -> Tuple[float, float]:
+    sut = sc.Set[Any](serializer=codec.serializer, deserializer=codec.deserializer)
+    write = measure(lambda: sut.update(data))
+    read = measure(lambda: [d in sut for d in data])
+    return (write, read)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--prefix", default="benchmarks")
+    args = parser.parse_args()
+    wd = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(wd)), "benchmark_results", args.prefix)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    lines = [
+        "| container | data type | operation | `pickle` | codec | ratio |",
+        "| :-------- | :-------- | :-------- | -------: | ----: | ----: |",
+    ]
+    for container_name, bench in (("Dict", bench_dict), ("List", bench_list), ("Set", bench_set)):
+        for type_name, codec, data in targets:
+            pickle_timing = bench(codecs.PICKLE, data)
+            codec_timing = bench(codec, data)
+            for op, one, another in zip(("write", "read"), pickle_timing, codec_timing):
+                lines.append(
+                    f"| {container_name} | {type_name} | {op} | {one:.5f} | {another:.5f} | {another / one:.5f} |"
+                )
+    with open(os.path.join(output_dir, "codecs.md"), "w") as fout:
+        fout.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
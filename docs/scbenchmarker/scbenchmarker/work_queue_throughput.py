@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import time
+from argparse import ArgumentParser
+from multiprocessing import Process, Queue
+from tempfile import TemporaryDirectory
+
+import sqlitecollections as sc
+
+table_name = "jobs"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def worker(path: str, batch_size: int, results: "Queue[int]") -> None:
+    sut = sc.WorkQueue[int](connection=connect(path), table_name=table_name)
+    processed = 0
+    while True:
+        jobs = sut.claim(batch_size)
+        if len(jobs) == 0:
+            break
+        for job in jobs:
+            sut.ack(job)
+            processed += 1
+    results.put(processed)
+
+
+def run(path: str, jobs: int, workers: int, batch_size: int) -> float:
+    sc.WorkQueue[int](connection=connect(path), table_name=table_name, data=range(jobs))
+    results: "Queue[int]" = Queue()
+    processes = [Process(target=worker, args=(path, batch_size, results)) for _ in range(workers)]
+    t1 = time.perf_counter()
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - t1
+    processed = sum(results.get() for _ in processes)
+    if processed != jobs:
+        raise RuntimeError(f"processed {processed} jobs, expected {jobs}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--prefix", default="benchmarks")
+    parser.add_argument("--jobs", default=10000, type=int)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--batch-sizes", default="1,16")
+    args = parser.parse_args()
+    wd = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(wd)), "benchmark_results", args.prefix)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    lines = [
+        "| workers | batch size | jobs | elapsed (s) | jobs/s |",
+        "| ------: | ---------: | ---: | ----------: | -----: |",
+    ]
+    for batch_size in (int(d) for d in args.batch_sizes.split(",")):
+        for workers in (int(d) for d in args.workers.split(",")):
+            with TemporaryDirectory() as tmpdir:
+                elapsed = run(os.path.join(tmpdir, "queue.db"), args.jobs, workers, batch_size)
+            lines.append(f"| {workers} | {batch_size} | {args.jobs} | {elapsed:.5f} | {args.jobs / elapsed:.1f} |")
+    with open(os.path.join(output_dir, "work_queue.md"), "w") as fout:
+        fout.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
@@ -5,9 +5,37 @@ __email__ = "osoken.devel@outlook.jp"
 __package_name__ = "sqlitecollections"
 
 
-from .base import RebuildStrategy
+from . import codecs
+from .aio import AsyncDict, AsyncList, AsyncSet
+from .base import ColumnType, RebuildStrategy, RetryPolicy, SpillPolicy
+from .compression import Compression
+from .connection import ConnectionPool
 from .dict import Dict
+from .integer_key_dict import IntegerKeyDict
 from .list import List
+from .priority_queue import PriorityQueue
+from .scored_set import ScoredSet
 from .set import Set
+from .sorted_dict import SortedDict
+from .work_queue import WorkQueue
 
-__all__ = ["Dict", "List", "Set", "RebuildStrategy"]
+__all__ = [
+    "AsyncDict",
+    "AsyncList",
+    "AsyncSet",
+    "codecs",
+    "ColumnType",
+    "Compression",
+    "ConnectionPool",
+    "Dict",
+    "IntegerKeyDict",
+    "List",
+    "PriorityQueue",
+    "RebuildStrategy",
+    "RetryPolicy",
+    "ScoredSet",
+    "Set",
+    "SortedDict",
+    "SpillPolicy",
+    "WorkQueue",
+]
@@ -0,0 +1,180 @@
+import asyncio
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable, Mapping
+else:
+    from typing import Iterable, Mapping
+
+from .base import KT, VT, T
+
+if TYPE_CHECKING:
+    from .dict import Dict
+    from .list import List as _List
+    from .set import Set
+
+_R = TypeVar("_R")
+_Container = Union["Dict[Any, Any]", "_List[Any]", "Set[Any]"]
+
+
+class _AsyncContainer(Generic[T]):
+    def __init__(self, container: _Container) -> None:
+        if container.connection_pool is None:
+            raise ValueError(f"{self.__class__.__name__} requires a container created with a ConnectionPool")
+        self._container = container
+
+    async def _run(self, fn: Callable[..., _R], *args: Any, **kwargs: Any) -> _R:
+        return await asyncio.wrap_future(self._container.submit(fn, *args, **kwargs))
+
+    def _fetch_chunk(self, after: Optional[Any], chunk_size: int) -> List[Tuple[Any, Any]]:
+        cur = self._container.connection.cursor()
+        rows = self._container._driver_class.get_partition_chunk(self._container.table_name, cur, after, chunk_size)
+        return [(d[0], self._container._deserialize_partition_row(d[1:])) for d in rows]
+
+    async def _iter_rows(self, chunk_size: int) -> AsyncIterator[Any]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        pending: Optional["asyncio.Future[List[Tuple[Any, Any]]]"] = asyncio.ensure_future(
+            self._run(self._fetch_chunk, None, chunk_size)
+        )
+        while pending is not None:
+            chunk = await pending
+            pending = None
+            if len(chunk) == chunk_size:
+                pending = asyncio.ensure_future(self._run(self._fetch_chunk, chunk[-1][0], chunk_size))
+            for _, d in chunk:
+                yield d
+
+    async def len(self) -> int:
+        return await self._run(len, self._container)
+
+    async def contains(self, x: object) -> bool:
+        return await self._run(self._container.__contains__, x)
+
+    async def clear(self) -> None:
+        await self._run(self._container.clear)
+
+    async def flush(self) -> None:
+        await self._run(lambda: None)
+
+
+class AsyncDict(_AsyncContainer[KT], Generic[KT, VT]):
+    def __init__(self, container: "Dict[KT, VT]") -> None:
+        super(AsyncDict, self).__init__(container)
+        self._container: "Dict[KT, VT]" = container
+
+    @property
+    def container(self) -> "Dict[KT, VT]":
+        return self._container
+
+    async def get(self, key: KT, default: Any = None) -> Any:
+        return await self._run(self._container.get, key, default)
+
+    async def set(self, key: KT, value: VT) -> None:
+        await self._run(self._container.__setitem__, key, value)
+
+    async def delete(self, key: KT) -> None:
+        await self._run(self._container.__delitem__, key)
+
+    async def pop(self, key: KT, default: Any = None) -> Any:
+        return await self._run(self._container.pop, key, default)
+
+    async def update_many(self, data: Union[Mapping[KT, VT], Iterable[Tuple[KT, VT]]]) -> None:
+        await self._run(self._container.update, data)
+
+    async def items(self, chunk_size: int = 1000) -> AsyncIterator[Tuple[KT, VT]]:
+        async for d in self._iter_rows(chunk_size):
+            yield d
+
+    async def keys(self, chunk_size: int = 1000) -> AsyncIterator[KT]:
+        async for k, _ in self._iter_rows(chunk_size):
+            yield k
+
+    async def values(self, chunk_size: int = 1000) -> AsyncIterator[VT]:
+        async for _, v in self._iter_rows(chunk_size):
+            yield v
+
+    def __aiter__(self) -> AsyncIterator[KT]:
+        return self.keys()
+
+
+class AsyncList(_AsyncContainer[T]):
+    def __init__(self, container: "_List[T]") -> None:
+        super(AsyncList, self).__init__(container)
+        self._container: "_List[T]" = container
+
+    @property
+    def container(self) -> "_List[T]":
+        return self._container
+
+    async def get(self, index: int) -> T:
+        return await self._run(self._container.__getitem__, index)
+
+    async def set(self, index: int, value: T) -> None:
+        await self._run(self._container.__setitem__, index, value)
+
+    async def delete(self, index: int) -> None:
+        await self._run(self._container.__delitem__, index)
+
+    async def append(self, value: T) -> None:
+        await self._run(self._container.append, value)
+
+    async def insert(self, index: int, value: T) -> None:
+        await self._run(self._container.insert, index, value)
+
+    async def pop(self, index: int = -1) -> T:
+        return await self._run(self._container.pop, index)
+
+    async def update_many(self, values: Iterable[T]) -> None:
+        await self._run(self._container.extend, values)
+
+    async def values(self, chunk_size: int = 1000) -> AsyncIterator[T]:
+        async for d in self._iter_rows(chunk_size):
+            yield d
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self.values()
+
+
+class AsyncSet(_AsyncContainer[T]):
+    def __init__(self, container: "Set[T]") -> None:
+        super(AsyncSet, self).__init__(container)
+        self._container: "Set[T]" = container
+
+    @property
+    def container(self) -> "Set[T]":
+        return self._container
+
+    async def add(self, value: T) -> None:
+        await self._run(self._container.add, value)
+
+    async def discard(self, value: T) -> None:
+        await self._run(self._container.discard, value)
+
+    async def remove(self, value: T) -> None:
+        await self._run(self._container.remove, value)
+
+    async def pop(self) -> T:
+        return await self._run(self._container.pop)
+
+    async def update_many(self, values: Iterable[T]) -> None:
+        await self._run(self._container.update, values)
+
+    async def values(self, chunk_size: int = 1000) -> AsyncIterator[T]:
+        async for d in self._iter_rows(chunk_size):
+            yield d
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self.values()
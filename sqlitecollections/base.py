@@ -1,15 +1,56 @@
+import os
+import random
 import sqlite3
 import sys
+import threading
+import time
+import weakref
 from abc import ABCMeta, abstractmethod
+from collections import deque
 from collections.abc import Hashable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from enum import Enum
+from functools import wraps
+from hashlib import blake2b, sha256
+from itertools import islice
 from pickle import dumps, loads
 from tempfile import NamedTemporaryFile
 from types import TracebackType
-from typing import Callable, Generic, Optional, Type, TypeVar, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+from urllib.request import pathname2url
 from uuid import uuid4
 
+from .bloom import BloomFilter
+from .codecs import loads_bytes
+from .compression import (
+    DICTIONARY_FLAG,
+    DICTIONARY_HEADER_SIZE,
+    Compression,
+    decompress,
+    dictionary_version,
+    train_dictionary,
+)
+from .connection import ConnectionPool
 from .logger import logger
+from .parallel import Partition, _missing, map_reduce, parallel_map, partitions
 
 if sys.version_info >= (3, 9):
     from contextlib import AbstractContextManager
@@ -23,6 +64,9 @@ KT = TypeVar("KT")
 VT = TypeVar("VT")
 _T = TypeVar("_T")
 _S = TypeVar("_S")
+_F = TypeVar("_F", bound=Callable[..., Any])
+_R = TypeVar("_R")
+_C = TypeVar("_C", bound="SqliteCollectionBase[Any]")
 
 
 class RebuildStrategy(Enum):
@@ -31,6 +75,112 @@ class RebuildStrategy(Enum):
     SKIP = 3
 
 
+class ColumnType(Enum):
+    INTEGER = 1
+    REAL = 2
+    TEXT = 3
+    BLOB = 4
+    MIXED = 5
+
+
+_SQLITE_INTEGER_MIN = -(2**63)
+_SQLITE_INTEGER_MAX = 2**63 - 1
+
+
+class ColumnTypeError(TypeError):
+    pass
+
+
+def _is_sqlite_integer(x: object) -> bool:
+    return type(x) is int and _SQLITE_INTEGER_MIN <= x <= _SQLITE_INTEGER_MAX
+
+
+def _is_sqlite_real(x: object) -> bool:
+    return type(x) is float and x == x
+
+
+def _serialize_integer_column(x: Any) -> Any:
+    if not isinstance(x, int) or isinstance(x, bool):
+        raise ColumnTypeError(f"ColumnType.INTEGER requires int, not '{type(x).__name__}'")
+    return int(x) if _is_sqlite_integer(int(x)) else dumps(int(x))
+
+
+def _serialize_real_column(x: Any) -> Any:
+    if not isinstance(x, (int, float)) or isinstance(x, bool):
+        raise ColumnTypeError(f"ColumnType.REAL requires float, not '{type(x).__name__}'")
+    return float(x) if _is_sqlite_real(float(x)) else dumps(float(x))
+
+
+def _serialize_text_column(x: Any) -> Any:
+    if not isinstance(x, str):
+        raise ColumnTypeError(f"ColumnType.TEXT requires str, not '{type(x).__name__}'")
+    return str(x)
+
+
+def _serialize_blob_column(x: Any) -> Any:
+    if not isinstance(x, (bytes, bytearray, memoryview)):
+        raise ColumnTypeError(f"ColumnType.BLOB requires bytes, not '{type(x).__name__}'")
+    return bytes(x)
+
+
+def _serialize_mixed_column(x: Any) -> Any:
+    if _is_sqlite_integer(x) or _is_sqlite_real(x) or type(x) is str:
+        return x
+    return dumps(x)
+
+
+def _deserialize_native_column(x: Any) -> Any:
+    if isinstance(x, bytes):
+        return loads(x)
+    return x
+
+
+def _deserialize_blob_column(x: Any) -> Any:
+    return x
+
+
+def serialize_lookup_value(serialize: Callable[[Any], _S], x: object) -> Optional[_S]:
+    # A value that a typed column can't store can't be in it either, except for numbers equal to a storable one.
+    try:
+        return serialize(x)
+    except ColumnTypeError:
+        pass
+    if isinstance(x, bool) or (isinstance(x, float) and x.is_integer()):
+        return serialize_lookup_value(serialize, int(x))
+    return None
+
+
+def is_identity_deserializer(deserializer: Optional[Callable[[bytes], Any]]) -> bool:
+    return deserializer is loads_bytes or deserializer is _deserialize_blob_column
+
+
+def get_column_type_codec(column_type: ColumnType) -> Tuple[Callable[[Any], Any], Callable[[Any], Any]]:
+    if column_type == ColumnType.INTEGER:
+        return (_serialize_integer_column, _deserialize_native_column)
+    if column_type == ColumnType.REAL:
+        return (_serialize_real_column, _deserialize_native_column)
+    if column_type == ColumnType.TEXT:
+        return (_serialize_text_column, _deserialize_native_column)
+    if column_type == ColumnType.BLOB:
+        return (_serialize_blob_column, _deserialize_blob_column)
+    if column_type == ColumnType.MIXED:
+        return (_serialize_mixed_column, _deserialize_native_column)
+    raise TypeError(f"column_type must be a ColumnType, not '{type(column_type).__name__}'")
+
+
+def resolve_column_type(
+    column_type: Optional[ColumnType],
+    serializer: Optional[Callable[[T], bytes]],
+    deserializer: Optional[Callable[[bytes], T]],
+) -> Tuple[Optional[Callable[[T], bytes]], Optional[Callable[[bytes], T]]]:
+    if column_type is None:
+        return (serializer, deserializer)
+    if serializer is not None or deserializer is not None:
+        raise ValueError("column_type cannot be used together with serializer or deserializer")
+    column_serializer, column_deserializer = get_column_type_codec(column_type)
+    return (cast(Callable[[T], bytes], column_serializer), cast(Callable[[bytes], T], column_deserializer))
+
+
 def sanitize_table_name(table_name: str) -> str:
     ret = "".join(c for c in table_name if c.isalnum() or c == "_")
     if ret != table_name:
@@ -42,10 +192,152 @@ def create_random_name(suffix: str) -> str:
     return f"{suffix}_{str(uuid4()).replace('-', '')}"
 
 
+def hash_serialized_key(serialized_key: bytes) -> int:
+    return int.from_bytes(blake2b(serialized_key, digest_size=8).digest(), "big", signed=True)
+
+
 def is_hashable(x: object) -> bool:
     return isinstance(x, Hashable)
 
 
+def iter_chunks(rows: Iterable[_S], size: int) -> Iterator[List[_S]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def _map_chunk(fn: Callable[[_S], _R], chunk: List[_S]) -> List[_R]:
+    return [fn(d) for d in chunk]
+
+
+def prefetch_chunks(chunks: Iterable[List[_S]], fn: Callable[[_S], _R], depth: int) -> Iterator[List[_R]]:
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlitecollections-prefetch")
+    pending: "Deque[Future[List[_R]]]" = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(_map_chunk, fn, chunk))
+            if len(pending) > depth:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class RetryPolicy(NamedTuple):
+    max_retries: int = 5
+    base_delay: float = 0.01
+    max_delay: float = 1.0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+
+class SpillPolicy(NamedTuple):
+    max_bytes: Optional[int] = 4 << 20
+    max_entries: Optional[int] = None
+
+
+def is_busy_error(e: BaseException) -> bool:
+    if not isinstance(e, sqlite3.OperationalError):
+        return False
+    message = str(e)
+    return "locked" in message or "busy" in message
+
+
+_write_state = threading.local()
+_WRITE_SAVEPOINT = "sc_serialized_write"
+_unspilled_connections: "weakref.WeakValueDictionary[int, SqliteCollectionBase[Any]]" = weakref.WeakValueDictionary()
+
+
+def _unspilled_owner(connection: sqlite3.Connection) -> "Optional[SqliteCollectionBase[Any]]":
+    owner = _unspilled_connections.get(id(connection))
+    return owner if owner is not None and owner._connection is connection else None
+
+
+def _check_not_unspilled(connection: sqlite3.Connection) -> None:
+    if _unspilled_owner(connection) is not None:
+        raise ValueError(
+            "the in-memory connection of a container that hasn't spilled can't be shared, call spill() first"
+        )
+
+
+def _spill_shared_connection(connection: sqlite3.Connection) -> sqlite3.Connection:
+    owner = _unspilled_owner(connection)
+    if owner is None:
+        return connection
+    owner.spill()
+    return owner._connection
+
+
+def _active_write_connections() -> Set[int]:
+    connections: Optional[Set[int]] = getattr(_write_state, "connections", None)
+    if connections is None:
+        connections = _write_state.connections = set()
+    return connections
+
+
+def serialized_write(method: _F) -> _F:
+    # Only the outermost write on a connection owns the transaction, nested writes join it so that a retry starts
+    # again from the data the first attempt saw.
+    @wraps(method)
+    def wrapper(self: "SqliteCollectionBase[Any]", *args: Any, **kwargs: Any) -> Any:
+        active = _active_write_connections()
+        if id(self.connection) in active:
+            return method(self, *args, **kwargs)
+        attempt = 0
+        while True:
+            with self._write_lock:
+                connection = self.connection
+                active.add(id(connection))
+                # A transaction opened by the caller must survive a failing write, so only roll back to a savepoint.
+                savepoint = connection.in_transaction
+                bloom_filter_versions = self._begin_bloom_filter_write()
+                try:
+                    if savepoint:
+                        connection.execute(f"SAVEPOINT {_WRITE_SAVEPOINT}")
+                    else:
+                        # A temporary container only writes to the temp schema, which needs no lock on the file.
+                        connection.execute("BEGIN" if self._temporary else "BEGIN IMMEDIATE")
+                    res = method(self, *args, **kwargs)
+                    if savepoint:
+                        connection.execute(f"RELEASE {_WRITE_SAVEPOINT}")
+                    connection.commit()
+                except BaseException as e:
+                    if savepoint and connection.in_transaction:
+                        connection.execute(f"ROLLBACK TO {_WRITE_SAVEPOINT}")
+                        connection.execute(f"RELEASE {_WRITE_SAVEPOINT}")
+                    elif connection.in_transaction:
+                        connection.rollback()
+                    self._end_bloom_filter_write(bloom_filter_versions, False)
+                    if not is_busy_error(e) or attempt >= self.retry_policy.max_retries:
+                        raise
+                    logger.debug(f"retrying {method.__name__} after {e}")
+                else:
+                    self._end_bloom_filter_write(bloom_filter_versions, not connection.in_transaction)
+                    self._spill_if_needed()
+                    return res
+                finally:
+                    active.discard(id(connection))
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+    return cast(_F, wrapper)
+
+
+def materialize_iterators(method: _F) -> _F:
+    @wraps(method)
+    def wrapper(self: "SqliteCollectionBase[Any]", *args: Any, **kwargs: Any) -> Any:
+        return method(self, *(list(d) if isinstance(d, Iterator) else d for d in args), **kwargs)
+
+    return cast(_F, wrapper)
+
+
 class TemporaryTableContext(ContextManager[str]):
     def __init__(self, cur: sqlite3.Cursor, reference_table_name: str):
         self._cursor = cur
@@ -54,7 +346,7 @@ class TemporaryTableContext(ContextManager[str]):
 
     def __enter__(self) -> str:
         self._cursor.execute(
-            f"CREATE TABLE {self._table_name} AS SELECT * FROM {self._reference_table_name} WHERE 0 = 1"
+            f"CREATE TEMP TABLE {self._table_name} AS SELECT * FROM {self._reference_table_name} WHERE 0 = 1"
         )
         return self._table_name
 
@@ -69,6 +361,11 @@ class TemporaryTableContext(ContextManager[str]):
 
 
 class _SqliteCollectionBaseDatabaseDriver(metaclass=ABCMeta):
+    partition_column = "rowid"
+    partition_value_columns = "serialized_value"
+    key_column = "serialized_value"
+    row_batch_size = 1000
+
     @classmethod
     def initialize_metadata_table(cls, cur: sqlite3.Cursor) -> None:
         if not cls.is_metadata_table_initialized(cur):
@@ -127,6 +424,72 @@ class _SqliteCollectionBaseDatabaseDriver(metaclass=ABCMeta):
             pass
         return False
 
+    @classmethod
+    def get_schema_version(cls, table_name: str, container_type_name: str, cur: sqlite3.Cursor) -> Optional[str]:
+        if not cls.is_metadata_table_initialized(cur):
+            return None
+        cur.execute(
+            "SELECT schema_version FROM metadata WHERE table_name=? AND container_type=?",
+            (table_name, container_type_name),
+        )
+        res = cur.fetchone()
+        return None if res is None else cast(str, res[0])
+
+    @classmethod
+    def migrate_table(
+        cls, table_name: str, container_type_name: str, schema_version: str, cur: sqlite3.Cursor, order_column: str
+    ) -> None:
+        tmp_table_name = create_random_name("migrate")
+        cls.do_create_table(tmp_table_name, container_type_name, schema_version, cur)
+        cls.copy_rows(table_name, tmp_table_name, cur, order_column)
+        cur.execute(f"DROP TABLE {table_name}")
+        cls.alter_table_name(tmp_table_name, table_name, cur)
+        cur.execute(
+            "UPDATE metadata SET schema_version=? WHERE table_name=? AND container_type=?",
+            (schema_version, table_name, container_type_name),
+        )
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def persist_temporary_table(
+        cls, table_name: str, container_type_name: str, schema_version: str, cur: sqlite3.Cursor
+    ) -> None:
+        tmp_table_name = create_random_name("persist")
+        cls.do_create_table(tmp_table_name, container_type_name, schema_version, cur)
+        if cls.is_options_table_initialized(cur, "temp"):
+            cls.initialize_options_table(cur)
+            cur.execute(
+                "INSERT INTO main.metadata_options (table_name, name, value) "
+                "SELECT ?, name, value FROM temp.metadata_options WHERE table_name=?",
+                (tmp_table_name, table_name),
+            )
+            cur.execute("DELETE FROM temp.metadata_options WHERE table_name=?", (table_name,))
+        deduplicated = cls.get_option(tmp_table_name, cur, "deduplicate") is not None
+        if deduplicated:
+            cls.initialize_blob_table(cur)
+            cur.execute(
+                "INSERT OR IGNORE INTO main.metadata_blobs (hash, serialized_value, refcount) "
+                "SELECT hash, serialized_value, 0 FROM temp.metadata_blobs "
+                f"WHERE hash IN (SELECT serialized_value FROM temp.{table_name})"
+            )
+            cls.create_blob_triggers(tmp_table_name, cur)
+        cur.execute(f"INSERT INTO main.{tmp_table_name} SELECT * FROM temp.{table_name}")
+        if deduplicated:
+            # Release the references of the temporary rows without deleting them, their row triggers would also
+            # drop the large values that the persisted rows still point to.
+            cur.execute(
+                "UPDATE temp.metadata_blobs SET refcount=refcount-("
+                f"SELECT COUNT(*) FROM temp.{table_name} t WHERE t.serialized_value=temp.metadata_blobs.hash) "
+                f"WHERE hash IN (SELECT serialized_value FROM temp.{table_name})"
+            )
+            cls.delete_unreferenced_blobs(cur, "temp")
+        cur.execute(f"DROP TABLE temp.{table_name}")
+        cls.do_tidy_table_metadata(tmp_table_name, container_type_name, schema_version, cur)
+        cls.alter_table_name(tmp_table_name, table_name, cur)
+
     @classmethod
     def do_tidy_table_metadata(
         cls, table_name: str, container_type_name: str, schema_version: str, cur: sqlite3.Cursor
@@ -139,7 +502,12 @@ class _SqliteCollectionBaseDatabaseDriver(metaclass=ABCMeta):
     @classmethod
     @abstractmethod
     def do_create_table(
-        cls, table_name: str, container_type_name: str, schema_version: str, cur: sqlite3.Cursor
+        cls,
+        table_name: str,
+        container_type_name: str,
+        schema_version: str,
+        cur: sqlite3.Cursor,
+        temporary: bool = False,
     ) -> None:
         ...
 
@@ -149,20 +517,340 @@ class _SqliteCollectionBaseDatabaseDriver(metaclass=ABCMeta):
             "DELETE FROM metadata WHERE table_name=? AND container_type=?",
             (table_name, container_type_name),
         )
+        if cls.has_row_triggers(table_name, cur):
+            cur.execute(f"DELETE FROM {table_name}")
+        if cls.is_options_table_initialized(cur):
+            cur.execute("DELETE FROM main.metadata_options WHERE table_name=?", (table_name,))
         cur.execute(f"DROP TABLE {table_name}")
 
+    @classmethod
+    def drop_temporary_table(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        if cls.has_row_triggers(table_name, cur, "temp"):
+            cur.execute(f"DELETE FROM temp.{table_name}")
+        if cls.is_options_table_initialized(cur, "temp"):
+            cur.execute("DELETE FROM temp.metadata_options WHERE table_name=?", (table_name,))
+        cur.execute(f"DROP TABLE temp.{table_name}")
+
     @classmethod
     def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
         cur.execute("UPDATE metadata SET table_name=? WHERE table_name=?", (new_table_name, table_name))
+        if cls.is_options_table_initialized(cur):
+            cur.execute(
+                "UPDATE main.metadata_options SET table_name=? WHERE table_name=?", (new_table_name, table_name)
+            )
         cur.execute(f"ALTER TABLE {table_name} RENAME TO {new_table_name}")
+        cls.rename_row_triggers(table_name, new_table_name, cur)
+
+    @classmethod
+    def has_row_triggers(cls, table_name: str, cur: sqlite3.Cursor, schema: str = "main") -> bool:
+        return cls.get_option(table_name, cur, "deduplicate", schema) is not None
+
+    @classmethod
+    def rename_row_triggers(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        if cls.get_option(new_table_name, cur, "deduplicate") is not None:
+            cls.drop_blob_triggers(table_name, cur)
+            cls.create_blob_triggers(new_table_name, cur)
+
+    @classmethod
+    def is_options_table_initialized(cls, cur: sqlite3.Cursor, schema: str = "main") -> bool:
+        cur.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name='metadata_options'")
+        return cur.fetchone() is not None
+
+    @classmethod
+    def get_option(cls, table_name: str, cur: sqlite3.Cursor, name: str, schema: str = "main") -> Optional[str]:
+        if not cls.is_options_table_initialized(cur, schema):
+            return None
+        cur.execute(f"SELECT value FROM {schema}.metadata_options WHERE table_name=? AND name=?", (table_name, name))
+        res = cur.fetchone()
+        return None if res is None else cast(str, res[0])
+
+    @classmethod
+    def get_binary_option(
+        cls, table_name: str, cur: sqlite3.Cursor, name: str, schema: str = "main"
+    ) -> Optional[bytes]:
+        if not cls.is_options_table_initialized(cur, schema):
+            return None
+        cur.execute(
+            f"SELECT CAST(value AS BLOB) FROM {schema}.metadata_options WHERE table_name=? AND name=?",
+            (table_name, name),
+        )
+        res = cur.fetchone()
+        return None if res is None else cast(bytes, res[0])
+
+    @classmethod
+    def get_options_with_prefix(
+        cls, table_name: str, cur: sqlite3.Cursor, prefix: str, schema: str = "main"
+    ) -> List[Tuple[str, Any]]:
+        if not cls.is_options_table_initialized(cur, schema):
+            return []
+        cur.execute(
+            f"SELECT name, value FROM {schema}.metadata_options WHERE table_name=? AND substr(name, 1, ?)=?",
+            (table_name, len(prefix), prefix),
+        )
+        return cast(List[Tuple[str, Any]], cur.fetchall())
+
+    @classmethod
+    def get_option_names_with_prefix(
+        cls, table_name: str, cur: sqlite3.Cursor, prefix: str, schema: str = "main"
+    ) -> List[str]:
+        if not cls.is_options_table_initialized(cur, schema):
+            return []
+        cur.execute(
+            f"SELECT name FROM {schema}.metadata_options WHERE table_name=? AND substr(name, 1, ?)=?",
+            (table_name, len(prefix), prefix),
+        )
+        return [cast(str, d[0]) for d in cur.fetchall()]
+
+    @classmethod
+    def initialize_options_table(cls, cur: sqlite3.Cursor, schema: str = "main") -> None:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {schema}.metadata_options ("
+            "table_name TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (table_name, name))"
+        )
+
+    @classmethod
+    def set_option(
+        cls, table_name: str, cur: sqlite3.Cursor, name: str, value: Union[str, bytes], schema: str = "main"
+    ) -> None:
+        cls.initialize_options_table(cur, schema)
+        cur.execute(
+            f"INSERT OR REPLACE INTO {schema}.metadata_options (table_name, name, value) VALUES (?, ?, ?)",
+            (table_name, name, value),
+        )
+
+    @classmethod
+    def delete_option(cls, table_name: str, cur: sqlite3.Cursor, name: str, schema: str = "main") -> None:
+        if cls.is_options_table_initialized(cur, schema):
+            cur.execute(f"DELETE FROM {schema}.metadata_options WHERE table_name=? AND name=?", (table_name, name))
+
+    @classmethod
+    def get_data_version(cls, cur: sqlite3.Cursor) -> int:
+        cur.execute("PRAGMA data_version")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_count(cls, table_name: str, cur: sqlite3.Cursor) -> int:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_journal_mode(cls, cur: sqlite3.Cursor) -> str:
+        cur.execute("PRAGMA journal_mode")
+        return cast(str, cur.fetchone()[0]).lower()
+
+    @classmethod
+    def set_journal_mode(cls, cur: sqlite3.Cursor, journal_mode: str) -> str:
+        cur.execute(f"PRAGMA journal_mode={journal_mode}")
+        return cast(str, cur.fetchone()[0]).lower()
+
+    @classmethod
+    def get_page_count(cls, cur: sqlite3.Cursor) -> int:
+        cur.execute("PRAGMA page_count")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_page_size(cls, cur: sqlite3.Cursor) -> int:
+        cur.execute("PRAGMA page_size")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_serialized_key_column(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT {cls.key_column} FROM {table_name}")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_sample_serialized_values(cls, table_name: str, cur: sqlite3.Cursor, n: int) -> List[bytes]:
+        cur.execute(
+            f"SELECT serialized_value FROM {table_name} WHERE typeof(serialized_value)='blob' "
+            "ORDER BY RANDOM() LIMIT ?",
+            (n,),
+        )
+        return [cast(bytes, d[0]) for d in cur.fetchall()]
+
+    @classmethod
+    def get_row_batches(
+        cls, table_name: str, cur: sqlite3.Cursor, columns: str, order_column: str, condition: str = "1"
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        # Keyset pagination on a unique column, so that each batch is fetched before the caller writes with cur.
+        cur.execute(
+            f"SELECT {order_column}, {columns} FROM {table_name} WHERE {condition} ORDER BY {order_column} LIMIT ?",
+            (cls.row_batch_size,),
+        )
+        rows = cast(List[Tuple[Any, ...]], cur.fetchall())
+        while len(rows) > 0:
+            yield rows
+            cur.execute(
+                f"SELECT {order_column}, {columns} FROM {table_name} "
+                f"WHERE {order_column} > ? AND ({condition}) ORDER BY {order_column} LIMIT ?",
+                (rows[-1][0], cls.row_batch_size),
+            )
+            rows = cast(List[Tuple[Any, ...]], cur.fetchall())
+
+    @classmethod
+    def get_serialized_value_prefixes(
+        cls, table_name: str, cur: sqlite3.Cursor, flag: bytes, length: int
+    ) -> List[bytes]:
+        cur.execute(
+            f"SELECT DISTINCT substr(serialized_value, 1, ?) FROM {table_name} "
+            "WHERE typeof(serialized_value)='blob' AND substr(serialized_value, 1, 1)=?",
+            (length, flag),
+        )
+        return [cast(bytes, d[0]) for d in cur.fetchall()]
+
+    @classmethod
+    def transform_serialized_values(cls, table_name: str, cur: sqlite3.Cursor, fn: Callable[[bytes], bytes]) -> None:
+        for rows in cls.get_row_batches(
+            table_name, cur, "serialized_value", cls.partition_column, "typeof(serialized_value)='blob'"
+        ):
+            cur.executemany(
+                f"UPDATE {table_name} SET serialized_value=? WHERE {cls.partition_column}=?",
+                ((fn(d[1]), d[0]) for d in rows),
+            )
+
+    @classmethod
+    def initialize_blob_table(cls, cur: sqlite3.Cursor, schema: str = "main") -> None:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {schema}.metadata_blobs ("
+            "hash BLOB PRIMARY KEY, serialized_value BLOB NOT NULL, refcount INTEGER NOT NULL)"
+        )
+
+    @classmethod
+    def create_blob_triggers(cls, table_name: str, cur: sqlite3.Cursor, schema: str = "main") -> None:
+        # Triggers resolve metadata_blobs in the schema of their table.  Rows of a temporary table may be copied
+        # from a table in the file, so their blobs are copied over as well.
+        increment = "UPDATE metadata_blobs SET refcount=refcount+1 WHERE hash=NEW.serialized_value;"
+        cur.execute("SELECT 1 FROM main.sqlite_master WHERE type='table' AND name='metadata_blobs'")
+        if schema == "temp" and cur.fetchone() is not None:
+            increment = (
+                "INSERT OR IGNORE INTO metadata_blobs (hash, serialized_value, refcount) "
+                "SELECT hash, serialized_value, 0 FROM main.metadata_blobs WHERE hash=NEW.serialized_value;"
+                f"{increment}"
+            )
+        decrement = (
+            "UPDATE metadata_blobs SET refcount=refcount-1 WHERE hash=OLD.serialized_value;"
+            "DELETE FROM metadata_blobs WHERE hash=OLD.serialized_value AND refcount<=0;"
+        )
+        cur.execute(f"CREATE TRIGGER {table_name}_blob_insert AFTER INSERT ON {table_name} BEGIN {increment} END")
+        cur.execute(f"CREATE TRIGGER {table_name}_blob_delete AFTER DELETE ON {table_name} BEGIN {decrement} END")
+        cur.execute(
+            f"CREATE TRIGGER {table_name}_blob_update AFTER UPDATE OF serialized_value ON {table_name} "
+            f"WHEN NEW.serialized_value IS NOT OLD.serialized_value BEGIN {increment} {decrement} END"
+        )
+
+    @classmethod
+    def drop_blob_triggers(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        for event in ("insert", "delete", "update"):
+            cur.execute(f"DROP TRIGGER IF EXISTS {table_name}_blob_{event}")
+
+    @classmethod
+    def add_blob(cls, cur: sqlite3.Cursor, blob_hash: bytes, blob: bytes, schema: str = "main") -> None:
+        cur.execute(
+            f"INSERT OR IGNORE INTO {schema}.metadata_blobs (hash, serialized_value, refcount) VALUES (?, ?, 0)",
+            (blob_hash, blob),
+        )
+
+    @classmethod
+    def get_blob(cls, cur: sqlite3.Cursor, blob_hash: bytes, schema: str = "main") -> Optional[bytes]:
+        cur.execute(f"SELECT serialized_value FROM {schema}.metadata_blobs WHERE hash=?", (blob_hash,))
+        res = cur.fetchone()
+        return None if res is None else cast(bytes, res[0])
+
+    @classmethod
+    def delete_unreferenced_blobs(cls, cur: sqlite3.Cursor, schema: str = "main") -> None:
+        cur.execute(f"DELETE FROM {schema}.metadata_blobs WHERE refcount<=0")
+
+    @classmethod
+    def get_partition_bounds(cls, table_name: str, cur: sqlite3.Cursor, n: int) -> List[Any]:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        count = cast(int, cur.fetchone()[0])
+        bounds: List[Any] = []
+        for offset in sorted({count * i // n for i in range(1, n)} - {0}):
+            cur.execute(
+                f"SELECT {cls.partition_column} FROM {table_name} ORDER BY {cls.partition_column} LIMIT 1 OFFSET ?",
+                (offset,),
+            )
+            res = cur.fetchone()
+            if res is not None and (len(bounds) == 0 or bounds[-1] != res[0]):
+                bounds.append(res[0])
+        return bounds
+
+    @classmethod
+    def get_partition_rows(
+        cls, table_name: str, cur: sqlite3.Cursor, lower: Optional[Any], upper: Optional[Any]
+    ) -> Iterable[Tuple[Any, ...]]:
+        conditions = []
+        params = []
+        if lower is not None:
+            conditions.append(f"{cls.partition_column} >= ?")
+            params.append(lower)
+        if upper is not None:
+            conditions.append(f"{cls.partition_column} < ?")
+            params.append(upper)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        cur.execute(
+            f"SELECT {cls.partition_value_columns} FROM {table_name} {where}ORDER BY {cls.partition_column}", params
+        )
+        for res in cur:
+            yield cast(Tuple[Any, ...], res)
+
+    @classmethod
+    def get_partition_chunk(
+        cls, table_name: str, cur: sqlite3.Cursor, after: Optional[Any], limit: int
+    ) -> List[Tuple[Any, ...]]:
+        if after is None:
+            cur.execute(
+                f"SELECT {cls.partition_column}, {cls.partition_value_columns} FROM {table_name} "
+                f"ORDER BY {cls.partition_column} LIMIT ?",
+                (limit,),
+            )
+        else:
+            cur.execute(
+                f"SELECT {cls.partition_column}, {cls.partition_value_columns} FROM {table_name} "
+                f"WHERE {cls.partition_column} > ? ORDER BY {cls.partition_column} LIMIT ?",
+                (after, limit),
+            )
+        return cast(List[Tuple[Any, ...]], cur.fetchall())
 
 
 class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
     _driver_class = _SqliteCollectionBaseDatabaseDriver
+    _compression: Optional[Compression] = None
+    _compression_dictionary: Optional[Tuple[int, bytes]] = None
+    _compression_dictionaries: Mapping[int, bytes] = {}
+    _compression_dictionaries_state: Optional[Tuple[int, int, int]] = None
+    _deduplicate = False
+    _raw_values = False
+    _bloom_filter_enabled = False
+    _bloom_filter: Optional[BloomFilter] = None
+    _bloom_filter_state: Optional[Tuple[int, int, int]] = None
+    _bloom_filter_clean: Optional[Tuple[int, int, int]] = None
+    _temporary = False
+    _spill_database: Optional[str] = None
+    _spill_policy = SpillPolicy()
+    _spill_checked_pages = -1
+    _spill_checked_entries: Optional[Tuple[int, int]] = None
+    _busy_timeout = 5.0
+    # Attributes handed to other processes by pickle; caches are left out and rebuilt from the database.
+    _reference_fields: Tuple[str, ...] = (
+        "_table_name",
+        "_serializer",
+        "_deserializer",
+        "_driver_class",
+        "_compression",
+        "_deduplicate",
+        "_bloom_filter_enabled",
+        "_raw_values",
+        "_retry_policy",
+        "_busy_timeout",
+        "_fetch_size",
+        "_prefetch",
+        "_spill_policy",
+    )
 
     def __init__(
         self,
-        connection: Optional[Union[str, sqlite3.Connection]] = None,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
         table_name: Optional[str] = None,
         serializer: Optional[Callable[[T], bytes]] = None,
         deserializer: Optional[Callable[[bytes], T]] = None,
@@ -170,18 +858,37 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
         rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
     ):
         super(SqliteCollectionBase, self).__init__()
+        if self._temporary and isinstance(connection, ConnectionPool):
+            raise ValueError("temporary can't be combined with a ConnectionPool")
         self._serializer = cast(Callable[[T], bytes], dumps) if serializer is None else serializer
         self._deserializer = cast(Callable[[bytes], T], loads) if deserializer is None else deserializer
-        self._persist = persist
-        if connection is None:
-            self._connection = sqlite3.connect(NamedTemporaryFile().name)
+        self._persist = persist and not self._temporary
+        self._connection_pool: Optional[ConnectionPool] = None
+        self._local_write_lock = threading.RLock()
+        self._retry_policy = RetryPolicy()
+        self._fetch_size: Optional[int] = None
+        self._prefetch = 0
+        self._database: Optional[str] = None
+        self._pid = self._owner_pid = os.getpid()
+        self._readonly = False
+        if connection is None and not self._temporary and hasattr(sqlite3.Connection, "backup"):
+            self._spill_database = NamedTemporaryFile().name
+            self._connection = sqlite3.connect(":memory:")
+            _unspilled_connections[id(self._connection)] = self
+        elif connection is None:
+            self._database = NamedTemporaryFile().name
+            self._connection = sqlite3.connect(self._database)
         elif isinstance(connection, str):
+            self._database = connection
             self._connection = sqlite3.connect(connection)
         elif isinstance(connection, sqlite3.Connection):
-            self._connection = connection
+            self._connection = connection if self._temporary else _spill_shared_connection(connection)
+        elif isinstance(connection, ConnectionPool):
+            self._connection_pool = connection
         else:
             raise TypeError(
-                f"connection argument must be None or a string or a sqlite3.Connection, not '{type(connection)}'"
+                "connection argument must be None or a string or a sqlite3.Connection or a ConnectionPool, "
+                f"not '{type(connection)}'"
             )
         self._table_name = (
             sanitize_table_name(create_random_name(self.container_type_name))
@@ -191,18 +898,288 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
         self._initialize(rebuild_strategy=rebuild_strategy)
 
     def __del__(self) -> None:
-        if not self.persist:
+        if not getattr(self, "_persist", True) and self._owner_pid == os.getpid():
             cur = self.connection.cursor()
-            self._driver_class.drop_table(self.table_name, self.container_type_name, cur)
-            self.connection.commit()
+            if self._temporary:
+                self._driver_class.drop_temporary_table(self.table_name, cur)
+            else:
+                self._driver_class.drop_table(self.table_name, self.container_type_name, cur)
+            if id(self.connection) not in _active_write_connections():
+                self.connection.commit()
 
+    @serialized_write
     def _initialize(self, rebuild_strategy: RebuildStrategy) -> None:
         cur = self.connection.cursor()
-        self._driver_class.initialize_metadata_table(cur)
-        self._driver_class.initialize_table(self.table_name, self.container_type_name, self.schema_version, cur)
+        if self._temporary:
+            self._driver_class.do_create_table(
+                self.table_name, self.container_type_name, self.schema_version, cur, temporary=True
+            )
+        else:
+            self._driver_class.initialize_metadata_table(cur)
+            self._migrate_schema(cur)
+            self._driver_class.initialize_table(self.table_name, self.container_type_name, self.schema_version, cur)
+        self._initialize_deduplication(cur)
+        self._initialize_compression(cur)
+        self._initialize_bloom_filter(cur)
         if self._should_rebuild(rebuild_strategy):
             self._do_rebuild()
-        self.connection.commit()
+            self._driver_class.delete_option(self.table_name, cur, "bloom_filter.bits", self._metadata_schema)
+
+    def _migrate_schema(self, cur: sqlite3.Cursor) -> None:
+        pass
+
+    def _initialize_compression(self, cur: sqlite3.Cursor) -> None:
+        stored = self._driver_class.get_option(self.table_name, cur, "compression", self._metadata_schema)
+        if self._compression is None:
+            if stored is None:
+                return
+            self._compression = Compression.loads(stored)
+        self._load_compression_dictionaries(cur)
+        if stored == self._compression.dumps():
+            return
+        self._driver_class.transform_serialized_values(
+            self.table_name,
+            cur,
+            self._encode_value if stored is None else lambda blob: self._encode_value(self._decode_value(blob)),
+        )
+        self._driver_class.set_option(
+            self.table_name, cur, "compression", self._compression.dumps(), self._metadata_schema
+        )
+
+    def _initialize_deduplication(self, cur: sqlite3.Cursor) -> None:
+        stored = self._driver_class.get_option(self.table_name, cur, "deduplicate", self._metadata_schema)
+        if stored is None and not self._deduplicate:
+            return
+        self._deduplicate = True
+        stored_compression = self._driver_class.get_option(self.table_name, cur, "compression", self._metadata_schema)
+        if self._compression is not None or stored_compression is not None:
+            raise ValueError("deduplicate can't be combined with compression")
+        if stored is not None:
+            return
+        self._driver_class.initialize_blob_table(cur, self._metadata_schema)
+        self._driver_class.create_blob_triggers(self.table_name, cur, self._metadata_schema)
+        self._driver_class.transform_serialized_values(self.table_name, cur, self._store_blob)
+        self._driver_class.set_option(self.table_name, cur, "deduplicate", "1", self._metadata_schema)
+
+    def _initialize_bloom_filter(self, cur: sqlite3.Cursor) -> None:
+        if self._driver_class.get_option(self.table_name, cur, "bloom_filter", self._metadata_schema) is not None:
+            self._bloom_filter_enabled = True
+        elif self._bloom_filter_enabled:
+            self._driver_class.set_option(self.table_name, cur, "bloom_filter", "1", self._metadata_schema)
+
+    @property
+    def bloom_filter(self) -> bool:
+        return self._bloom_filter_enabled
+
+    def _data_version(self) -> Tuple[int, int, int]:
+        # data_version only moves on commits of other connections, total_changes catches the other containers and
+        # statements sharing this connection.
+        return (
+            id(self.connection),
+            self._driver_class.get_data_version(self.connection.cursor()),
+            self.connection.total_changes,
+        )
+
+    def _might_contain(self, serialized_key: bytes) -> bool:
+        if not self._bloom_filter_enabled:
+            return True
+        version = self._data_version()
+        if self._bloom_filter is None or self._bloom_filter_state != version:
+            self._load_bloom_filter(version)
+        return serialized_key in cast(BloomFilter, self._bloom_filter)
+
+    def _load_bloom_filter(self, version: Tuple[int, int, int]) -> None:
+        cur = self.connection.cursor()
+        stored = self._driver_class.get_binary_option(self.table_name, cur, "bloom_filter.bits", self._metadata_schema)
+        if stored is not None:
+            self._bloom_filter = BloomFilter.loads(stored)
+            self._bloom_filter_state = version
+            return
+        bloom = BloomFilter(max(2 * self._driver_class.get_count(self.table_name, cur), 1024))
+        for d in self._driver_class.get_serialized_key_column(self.table_name, cur):
+            bloom.add(d)
+        self._bloom_filter = bloom
+        self._bloom_filter_state = version
+        if not self.readonly and not self._temporary and not self.connection.in_transaction:
+            self._save_bloom_filter(bloom, version)
+
+    def _save_bloom_filter(self, bloom: BloomFilter, version: Tuple[int, int, int]) -> None:
+        cur = self.connection.cursor()
+        with self._write_lock:
+            if self.connection.total_changes != version[2]:
+                self._bloom_filter_state = None
+                return
+            cur.execute("PRAGMA busy_timeout")
+            busy_timeout = cur.fetchone()[0]
+            cur.execute("PRAGMA busy_timeout=0")
+            try:
+                self._driver_class.set_option(
+                    self.table_name, cur, "bloom_filter.bits", bloom.dumps(), self._metadata_schema
+                )
+                if self._data_version()[:2] != version[:2]:
+                    self.connection.rollback()
+                    self._bloom_filter_state = None
+                    return
+                self.connection.commit()
+                self._bloom_filter_state = self._data_version()
+                self._bloom_filter_clean = None
+            except sqlite3.OperationalError as e:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                if not is_busy_error(e):
+                    raise
+                logger.debug(f"skipped saving the bloom filter of {self.table_name} after {e}")
+            finally:
+                cur.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+
+    def _add_to_bloom_filter(self, serialized_key: bytes) -> bytes:
+        if self._bloom_filter is not None:
+            self._bloom_filter.add(serialized_key)
+            if self._bloom_filter.is_full:
+                self._bloom_filter = None
+        return serialized_key
+
+    def _invalidate_saved_bloom_filter(self, cur: sqlite3.Cursor) -> None:
+        if not self._bloom_filter_enabled:
+            return
+        if self._bloom_filter_clean != self._data_version():
+            self._driver_class.delete_option(self.table_name, cur, "bloom_filter.bits", self._metadata_schema)
+            self._bloom_filter_clean = self._data_version()
+
+    def _begin_bloom_filter_write(self) -> Optional[Tuple[Tuple[int, int, int], Optional[Tuple[int, int, int]]]]:
+        if not self._bloom_filter_enabled:
+            return None
+        return (self._data_version(), self._bloom_filter_clean)
+
+    def _end_bloom_filter_write(
+        self,
+        versions: Optional[Tuple[Tuple[int, int, int], Optional[Tuple[int, int, int]]]],
+        committed: bool,
+    ) -> None:
+        # Writes of this container add their keys to the filter as they go, so a filter that was current before the
+        # write stays a superset of the keys afterwards.  Only the changes made by others force a reload.
+        if versions is None:
+            return
+        version, clean = versions
+        current = self._data_version()
+        if self._bloom_filter_state == version:
+            self._bloom_filter_state = current
+        if committed and (self._bloom_filter_clean == version or self._bloom_filter_clean != clean):
+            self._bloom_filter_clean = current
+        else:
+            self._bloom_filter_clean = None
+
+    def _load_compression_dictionaries(self, cur: sqlite3.Cursor) -> None:
+        prefix = "compression_dictionary."
+        self._compression_dictionaries = {
+            int(name[len(prefix) :]): bytes(value)
+            for name, value in self._driver_class.get_options_with_prefix(
+                self.table_name, cur, prefix, self._metadata_schema
+            )
+        }
+        if len(self._compression_dictionaries) > 0:
+            version = max(self._compression_dictionaries)
+            self._compression_dictionary = (version, self._compression_dictionaries[version])
+
+    def _refresh_compression_dictionaries(self) -> None:
+        # Another container may have trained or pruned dictionaries since this one loaded them.
+        current = self._data_version()
+        if current == self._compression_dictionaries_state:
+            return
+        cur = self.connection.cursor()
+        prefix = "compression_dictionary."
+        versions = {
+            int(name[len(prefix) :])
+            for name in self._driver_class.get_option_names_with_prefix(
+                self.table_name, cur, prefix, self._metadata_schema
+            )
+        }
+        if versions != set(self._compression_dictionaries):
+            self._load_compression_dictionaries(cur)
+        self._compression_dictionaries_state = current
+
+    @property
+    def compression(self) -> Optional[Compression]:
+        return self._compression
+
+    @property
+    def deduplicate(self) -> bool:
+        return self._deduplicate
+
+    def _store_blob(self, blob: bytes) -> bytes:
+        blob_hash = sha256(blob).digest()
+        if id(self.connection) in _active_write_connections():
+            self._driver_class.add_blob(self.connection.cursor(), blob_hash, blob, self._metadata_schema)
+        return blob_hash
+
+    def _encode_value(self, blob: bytes) -> bytes:
+        if self._deduplicate:
+            return self._store_blob(blob)
+        if self._compression is None:
+            return blob
+        if self._compression.uses_dictionary:
+            self._refresh_compression_dictionaries()
+        return self._compression.compress(blob, self._compression_dictionary)
+
+    def _encode_lookup_values(self, blob: bytes) -> Tuple[bytes, ...]:
+        # Stored values keep the dictionary version they were written with, so an equal value may be stored in
+        # any of them.
+        if self._deduplicate or self._compression is None or not self._compression.uses_dictionary:
+            return (self._encode_value(blob),)
+        self._refresh_compression_dictionaries()
+        compression = self._compression
+        res = {compression.compress(blob)}
+        res.update(compression.compress(blob, d) for d in self._compression_dictionaries.items())
+        return tuple(sorted(res))
+
+    def _decode_value(self, blob: bytes) -> bytes:
+        if self._deduplicate:
+            res = self._driver_class.get_blob(self.connection.cursor(), blob, self._metadata_schema)
+            if res is None:
+                raise ValueError(f"missing deduplicated value: {blob.hex()}")
+            return res
+        if self._compression is None:
+            return blob
+        version = dictionary_version(blob)
+        if version is not None and version not in self._compression_dictionaries:
+            self._load_compression_dictionaries(self.connection.cursor())
+        return decompress(blob, self._compression_dictionaries)
+
+    @serialized_write
+    def optimize(self) -> None:
+        if self._deduplicate:
+            self._driver_class.delete_unreferenced_blobs(self.connection.cursor(), self._metadata_schema)
+            return
+        if self._compression is None or not self._compression.uses_dictionary:
+            return
+        compression = self._compression
+        cur = self.connection.cursor()
+        self._load_compression_dictionaries(cur)
+        samples = self._driver_class.get_sample_serialized_values(self.table_name, cur, compression.sample_size)
+        if len(samples) == 0:
+            return
+        dictionary = (
+            0 if self._compression_dictionary is None else self._compression_dictionary[0] + 1,
+            train_dictionary((self._decode_value(d) for d in samples), compression.dictionary_size),
+        )
+        self._driver_class.set_option(
+            self.table_name, cur, f"compression_dictionary.{dictionary[0]}", dictionary[1], self._metadata_schema
+        )
+        self._compression_dictionaries = {**self._compression_dictionaries, dictionary[0]: dictionary[1]}
+        self._compression_dictionary = dictionary
+        used = {
+            dictionary_version(d)
+            for d in self._driver_class.get_serialized_value_prefixes(
+                self.table_name, cur, DICTIONARY_FLAG, DICTIONARY_HEADER_SIZE
+            )
+        }
+        for version in set(self._compression_dictionaries) - used - {dictionary[0]}:
+            self._driver_class.delete_option(
+                self.table_name, cur, f"compression_dictionary.{version}", self._metadata_schema
+            )
+        self._compression_dictionaries = {
+            k: v for k, v in self._compression_dictionaries.items() if k in used or k == dictionary[0]
+        }
 
     def _should_rebuild(self, rebuild_strategy: RebuildStrategy) -> bool:
         if rebuild_strategy == RebuildStrategy.ALWAYS:
@@ -224,8 +1201,132 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
         return self._persist
 
     def set_persist(self, persist: bool) -> None:
+        if persist and self._temporary:
+            self._persist_temporary_table()
         self._persist = persist
 
+    @serialized_write
+    def _persist_temporary_table(self) -> None:
+        _check_not_unspilled(self.connection)
+        cur = self.connection.cursor()
+        self._driver_class.initialize_metadata_table(cur)
+        self._driver_class.persist_temporary_table(self.table_name, self.container_type_name, self.schema_version, cur)
+        self._temporary = False
+
+    @property
+    def temporary(self) -> bool:
+        return self._temporary
+
+    @property
+    def _metadata_schema(self) -> str:
+        # The options and blobs of a temporary container live next to its table so that building one never writes
+        # to the database file.
+        return "temp" if self._temporary else "main"
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    def set_retry_policy(self, retry_policy: RetryPolicy) -> None:
+        self._retry_policy = retry_policy
+
+    @property
+    def busy_timeout(self) -> float:
+        cur = self.connection.cursor()
+        cur.execute("PRAGMA busy_timeout")
+        return int(cur.fetchone()[0]) / 1000
+
+    def set_busy_timeout(self, busy_timeout: float) -> None:
+        if self._connection_pool is not None:
+            raise ValueError("the busy timeout of a ConnectionPool is set with ConnectionPool(timeout=...)")
+        self._busy_timeout = busy_timeout
+        self.connection.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+
+    @property
+    def spill_policy(self) -> SpillPolicy:
+        return self._spill_policy
+
+    @serialized_write
+    def set_spill_policy(self, spill_policy: SpillPolicy) -> None:
+        self._spill_policy = spill_policy
+        self._spill_checked_pages = -1
+        self._spill_checked_entries = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_database is None
+
+    def spill(self) -> None:
+        with self._write_lock:
+            if self._spill_database is None:
+                return
+            if self._connection.in_transaction:
+                raise ValueError("can't spill to a database file inside a transaction")
+            connection = sqlite3.connect(self._spill_database, timeout=self._busy_timeout)
+            self._connection.backup(connection)
+            _unspilled_connections.pop(id(self._connection), None)
+            self._connection = connection
+            self._database = self._spill_database
+            self._spill_database = None
+
+    def _spill_if_needed(self) -> None:
+        if self._spill_database is None or self._connection.in_transaction:
+            return
+        cur = self._connection.cursor()
+        max_bytes, max_entries = self._spill_policy
+        if max_entries is not None and self._has_more_entries_than(cur, max_entries):
+            self.spill()
+            return
+        pages = self._driver_class.get_page_count(cur)
+        if pages == self._spill_checked_pages:
+            return
+        self._spill_checked_pages = pages
+        if max_bytes is not None and pages * self._driver_class.get_page_size(cur) > max_bytes:
+            self.spill()
+
+    def _has_more_entries_than(self, cur: sqlite3.Cursor, max_entries: int) -> bool:
+        # Every change adds at most one entry, so the last count plus the changes since then bounds the count.  The
+        # table is only counted again once that bound passes the limit and enough changes have piled up.
+        changes = self._connection.total_changes
+        if self._spill_checked_entries is not None:
+            count, checked_changes = self._spill_checked_entries
+            if count + changes - checked_changes <= max_entries or changes - checked_changes < max_entries // 16:
+                return False
+        count = self._driver_class.get_count(self.table_name, cur)
+        self._spill_checked_entries = (count, changes)
+        return count > max_entries
+
+    @property
+    def fetch_size(self) -> Optional[int]:
+        return self._fetch_size
+
+    @property
+    def prefetch(self) -> int:
+        return self._prefetch
+
+    def set_fetch_size(self, fetch_size: Optional[int], prefetch: int = 0) -> None:
+        if fetch_size is not None and fetch_size < 1:
+            raise ValueError("fetch_size must be positive")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        if prefetch > 0 and fetch_size is None:
+            raise ValueError("prefetch requires fetch_size")
+        self._fetch_size = fetch_size
+        self._prefetch = prefetch
+
+    def _iter_deserialized(self, rows: Iterable[_S], deserialize: Optional[Callable[[_S], _R]]) -> Iterator[_R]:
+        if deserialize is None:
+            yield from cast(Iterable[_R], rows)
+        elif self._fetch_size is None:
+            for d in rows:
+                yield deserialize(d)
+        elif self._prefetch == 0:
+            for chunk in iter_chunks(rows, self._fetch_size):
+                yield from [deserialize(d) for d in chunk]
+        else:
+            for deserialized in prefetch_chunks(iter_chunks(rows, self._fetch_size), deserialize, self._prefetch):
+                yield from deserialized
+
     @property
     def serializer(self) -> Callable[[T], bytes]:
         return self._serializer
@@ -238,8 +1339,13 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
         return self._deserializer
 
     def deserialize(self, blob: bytes) -> T:
+        if self._raw_values:
+            return cast(T, blob)
         return self.deserializer(blob)
 
+    def _is_raw(self, deserializer: Optional[Callable[[bytes], Any]]) -> bool:
+        return is_identity_deserializer(deserializer) and self._compression is None and not self._deduplicate
+
     @property
     def table_name(self) -> str:
         return self._table_name
@@ -256,8 +1362,111 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
 
     @property
     def connection(self) -> sqlite3.Connection:
+        if self._connection_pool is not None:
+            return self._connection_pool.connection
+        self._reconnect_after_fork()
         return self._connection
 
+    def _reconnect_after_fork(self) -> None:
+        if self._database is not None and self._pid != os.getpid():
+            self._connection = self._connect_database()
+            self._local_write_lock = threading.RLock()
+            self._pid = os.getpid()
+
+    @property
+    def connection_pool(self) -> Optional[ConnectionPool]:
+        return self._connection_pool
+
+    @property
+    def _write_lock(self) -> ContextManager[bool]:
+        if self._connection_pool is not None:
+            return self._connection_pool.write_lock
+        self._reconnect_after_fork()
+        return self._local_write_lock
+
+    def _connect_database(self) -> sqlite3.Connection:
+        if self._readonly:
+            uri = f"file:{pathname2url(os.path.abspath(cast(str, self._database)))}?mode=ro"
+            return sqlite3.connect(uri, uri=True, timeout=self._busy_timeout)
+        return sqlite3.connect(cast(str, self._database), timeout=self._busy_timeout)
+
+    def _database_path(self) -> Optional[str]:
+        if self._connection_pool is not None:
+            return self._connection_pool.database
+        cur = self.connection.cursor()
+        cur.execute("PRAGMA database_list")
+        for _, name, path in cur.fetchall():
+            if name == "main" and path:
+                return cast(str, path)
+        return None
+
+    @property
+    def readonly(self) -> bool:
+        return self._readonly
+
+    def _reference(self, readonly: bool) -> "_ContainerReference":
+        if self._temporary:
+            raise TypeError(f"cannot pickle '{self.container_type_name}' backed by a temporary table")
+        self.spill()
+        state = {k: self.__dict__[k] for k in self._reference_fields if k in self.__dict__}
+        database = self._database_path()
+        if database is None:
+            raise TypeError(f"cannot pickle '{self.container_type_name}' backed by an in-memory database")
+        return _ContainerReference(self.__class__, state, database, readonly)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_open_reference, (self._reference(self.readonly),))
+
+    def as_readonly(self: _C) -> _C:
+        return cast(_C, _open_reference(self._reference(True)))
+
+    def snapshot(self: _C, enable_wal: bool = False) -> "SnapshotContext[_C]":
+        self.spill()
+        if self._database_path() is None:
+            raise ValueError(f"snapshot of '{self.container_type_name}' requires a database file")
+        self._require_wal(enable_wal)
+        return SnapshotContext[_C](self._reference(True))
+
+    def _require_wal(self, enable_wal: bool) -> None:
+        with self._write_lock:
+            cur = self.connection.cursor()
+            if self._driver_class.get_journal_mode(cur) == "wal":
+                return
+            if not enable_wal:
+                raise ValueError("snapshot requires WAL mode, pass enable_wal=True to switch the database to it")
+            if self.readonly or self.connection.in_transaction:
+                raise ValueError("snapshot requires WAL mode, which can't be enabled in a transaction or read-only")
+            if self._driver_class.set_journal_mode(cur, "wal") != "wal":
+                raise ValueError("snapshot requires WAL mode, which the database doesn't support")
+
+    def _deserialize_partition_row(self, row: Tuple[Any, ...]) -> Any:
+        return self.deserialize(row[0])
+
+    def parallel_map(self, fn: Callable[[Any], _R], workers: Optional[int] = None) -> List[_R]:
+        return parallel_map(self, fn, workers)
+
+    def partitions(self, n: int) -> List[Partition]:
+        return partitions(self, n)
+
+    def map_reduce(
+        self,
+        mapper: Callable[[Any], _R],
+        reducer: Callable[[_R, _R], _R],
+        initial: Any = _missing,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+    ) -> _R:
+        return map_reduce(self, mapper, reducer, initial, executor, workers)
+
+    def submit(self, fn: Callable[..., _R], *args: Any, **kwargs: Any) -> "Future[_R]":
+        if self._connection_pool is None:
+            raise ValueError("submit requires the container to be created with a ConnectionPool")
+        return self._connection_pool.writer.submit(fn, *args, **kwargs)
+
+    @property
+    def _shared_connection(self) -> Union[sqlite3.Connection, ConnectionPool]:
+        return self.connection if self._connection_pool is None else self._connection_pool
+
     @property
     def container_type_name(self) -> str:
         return self.__class__.__name__
@@ -266,3 +1475,58 @@ class SqliteCollectionBase(Generic[T], metaclass=ABCMeta):
     @abstractmethod
     def schema_version(self) -> str:
         ...
+
+
+class _ContainerReference(NamedTuple):
+    container_class: Type[SqliteCollectionBase[Any]]
+    state: Dict[str, Any]
+    database: str
+    readonly: bool
+
+    def open(self) -> SqliteCollectionBase[Any]:
+        return _open_reference(self)
+
+
+def _open_reference(reference: _ContainerReference) -> SqliteCollectionBase[Any]:
+    res = reference.container_class.__new__(reference.container_class)
+    res.__dict__.update(reference.state)
+    res._persist = True
+    res._connection_pool = None
+    res._local_write_lock = threading.RLock()
+    res._database = reference.database
+    res._readonly = reference.readonly
+    res._pid = res._owner_pid = os.getpid()
+    res._spill_database = None
+    res._connection = res._connect_database()
+    if res._compression is not None:
+        res._load_compression_dictionaries(res.connection.cursor())
+    return res
+
+
+class SnapshotContext(ContextManager[_C]):
+    def __init__(self, reference: _ContainerReference) -> None:
+        self._reference = reference
+        self._container: Optional[_C] = None
+
+    def __enter__(self) -> _C:
+        container = cast(_C, _open_reference(self._reference))
+        try:
+            container.connection.execute("BEGIN")
+            container.connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        except BaseException:
+            container.connection.close()
+            raise
+        self._container = container
+        return container
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        excinst: Optional[BaseException],
+        exctb: Optional[TracebackType],
+    ) -> None:
+        if self._container is not None:
+            self._container.connection.rollback()
+            self._container.connection.close()
+            self._container = None
+        return None
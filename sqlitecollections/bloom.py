@@ -0,0 +1,58 @@
+import math
+import struct
+from hashlib import blake2b
+from typing import Iterator, Optional
+
+_HEADER = struct.Struct(">QQQI")
+_UINT64 = struct.Struct(">QQ")
+
+
+class BloomFilter:
+    def __init__(
+        self, capacity: int, error_rate: float = 0.01, bits: Optional[bytearray] = None, count: int = 0
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self._hashes = max(1, int(round(self._size / capacity * math.log(2))))
+        self._bits = bytearray((self._size + 7) // 8) if bits is None else bits
+        self._count = count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        return self._count > self._capacity
+
+    def _positions(self, blob: bytes) -> Iterator[int]:
+        h1, h2 = _UINT64.unpack(blake2b(blob, digest_size=16).digest())
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, blob: bytes) -> None:
+        for d in self._positions(blob):
+            self._bits[d >> 3] |= 1 << (d & 7)
+        self._count += 1
+
+    def __contains__(self, blob: object) -> bool:
+        if not isinstance(blob, bytes):
+            return True
+        return all(self._bits[d >> 3] & (1 << (d & 7)) for d in self._positions(blob))
+
+    def dumps(self) -> bytes:
+        return _HEADER.pack(self._capacity, self._count, self._size, self._hashes) + bytes(self._bits)
+
+    @classmethod
+    def loads(cls, blob: bytes) -> "BloomFilter":
+        capacity, count, size, hashes = _HEADER.unpack_from(blob)
+        res = cls(capacity, bits=bytearray(blob[_HEADER.size :]), count=count)
+        res._size = size
+        res._hashes = hashes
+        return res
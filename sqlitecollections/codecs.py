@@ -0,0 +1,299 @@
+import struct
+from pickle import dumps, loads
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+_INT64 = struct.Struct(">q")
+_FLOAT64 = struct.Struct(">d")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_UINT64 = struct.Struct(">Q")
+
+_TAG_NONE = b"N"
+_TAG_TRUE = b"T"
+_TAG_FALSE = b"F"
+_TAG_INT = b"i"
+_TAG_BIG_INT = b"I"
+_TAG_FLOAT = b"d"
+_TAG_STR = b"s"
+_TAG_BYTES = b"b"
+_TAG_TUPLE = b"t"
+
+
+class Codec(NamedTuple):
+    serializer: Callable[[Any], bytes]
+    deserializer: Callable[[bytes], Any]
+
+
+def dumps_str(x: str) -> bytes:
+    if not isinstance(x, str):
+        raise TypeError(f"str codec requires str, not '{type(x).__name__}'")
+    return x.encode("utf-8")
+
+
+def loads_str(blob: bytes) -> str:
+    return blob.decode("utf-8")
+
+
+def dumps_bytes(x: Union[bytes, bytearray, memoryview]) -> bytes:
+    if type(x) is bytes:
+        return x
+    if not isinstance(x, (bytes, bytearray, memoryview)):
+        raise TypeError(f"bytes codec requires bytes, not '{type(x).__name__}'")
+    return bytes(x)
+
+
+def loads_bytes(blob: bytes) -> bytes:
+    return blob
+
+
+def dumps_int(x: int) -> bytes:
+    if not isinstance(x, int) or isinstance(x, bool):
+        raise TypeError(f"int codec requires int, not '{type(x).__name__}'")
+    try:
+        return _INT64.pack(x)
+    except struct.error:
+        raise OverflowError("int codec supports signed 64-bit integers only")
+
+
+def loads_int(blob: bytes) -> int:
+    return int(_INT64.unpack(blob)[0])
+
+
+def dumps_float(x: float) -> bytes:
+    if not isinstance(x, (int, float)) or isinstance(x, bool):
+        raise TypeError(f"float codec requires float, not '{type(x).__name__}'")
+    return _FLOAT64.pack(x)
+
+
+def loads_float(blob: bytes) -> float:
+    return float(_FLOAT64.unpack(blob)[0])
+
+
+def _encode_tagged(x: Any, buf: List[bytes]) -> None:
+    t = type(x)
+    if t is str:
+        encoded = x.encode("utf-8")
+        buf.append(_TAG_STR + _UINT32.pack(len(encoded)))
+        buf.append(encoded)
+    elif t is int:
+        try:
+            buf.append(_TAG_INT + _INT64.pack(x))
+        except struct.error:
+            encoded = x.to_bytes((x.bit_length() + 8) // 8, "big", signed=True)
+            buf.append(_TAG_BIG_INT + _UINT32.pack(len(encoded)))
+            buf.append(encoded)
+    elif t is float:
+        buf.append(_TAG_FLOAT + _FLOAT64.pack(x))
+    elif t is bytes:
+        buf.append(_TAG_BYTES + _UINT32.pack(len(x)))
+        buf.append(x)
+    elif x is None:
+        buf.append(_TAG_NONE)
+    elif t is bool:
+        buf.append(_TAG_TRUE if x else _TAG_FALSE)
+    elif t is tuple:
+        buf.append(_TAG_TUPLE + _UINT32.pack(len(x)))
+        for d in x:
+            _encode_tagged(d, buf)
+    else:
+        raise TypeError(f"tuple codec does not support '{t.__name__}'")
+
+
+def _decode_tagged(blob: bytes, offset: int) -> Tuple[Any, int]:
+    tag = blob[offset : offset + 1]
+    offset += 1
+    if tag == _TAG_STR:
+        length = _UINT32.unpack_from(blob, offset)[0]
+        offset += 4
+        return (blob[offset : offset + length].decode("utf-8"), offset + length)
+    if tag == _TAG_INT:
+        return (_INT64.unpack_from(blob, offset)[0], offset + 8)
+    if tag == _TAG_FLOAT:
+        return (_FLOAT64.unpack_from(blob, offset)[0], offset + 8)
+    if tag == _TAG_BYTES:
+        length = _UINT32.unpack_from(blob, offset)[0]
+        offset += 4
+        return (blob[offset : offset + length], offset + length)
+    if tag == _TAG_NONE:
+        return (None, offset)
+    if tag == _TAG_TRUE:
+        return (True, offset)
+    if tag == _TAG_FALSE:
+        return (False, offset)
+    if tag == _TAG_BIG_INT:
+        length = _UINT32.unpack_from(blob, offset)[0]
+        offset += 4
+        return (int.from_bytes(blob[offset : offset + length], "big", signed=True), offset + length)
+    if tag == _TAG_TUPLE:
+        count = _UINT32.unpack_from(blob, offset)[0]
+        offset += 4
+        buf = []
+        for _ in range(count):
+            d, offset = _decode_tagged(blob, offset)
+            buf.append(d)
+        return (tuple(buf), offset)
+    raise ValueError(f"unknown tag {tag!r} at offset {offset - 1}")
+
+
+def dumps_tuple(x: Tuple[Any, ...]) -> bytes:
+    if not isinstance(x, tuple):
+        raise TypeError(f"tuple codec requires tuple, not '{type(x).__name__}'")
+    buf: List[bytes] = []
+    _encode_tagged(tuple(x), buf)
+    return b"".join(buf)
+
+
+def loads_tuple(blob: bytes) -> Tuple[Any, ...]:
+    res, offset = _decode_tagged(blob, 0)
+    if offset != len(blob):
+        raise ValueError("trailing bytes after tuple")
+    return res  # type: ignore
+
+
+_ORDERED_TERMINATOR = 0x00
+_ORDERED_ESCAPE = 0xFF
+_ORDERED_NONE = 0x01
+_ORDERED_FALSE = 0x02
+_ORDERED_TRUE = 0x03
+_ORDERED_NUMBER = 0x10
+_ORDERED_BYTES = 0x30
+_ORDERED_STR = 0x40
+_ORDERED_TUPLE = 0x50
+_SIGN_BIT = 1 << 63
+_MASK64 = (1 << 64) - 1
+_ROUNDING_OFFSET = 1 << 15
+
+
+def _escape_ordered(x: bytes) -> bytes:
+    return x.replace(b"\x00", b"\x00\xff")
+
+
+def _encode_ordered(x: Any, buf: bytearray, terminate: bool = True) -> None:
+    t = type(x)
+    if t is str:
+        buf.append(_ORDERED_STR)
+        buf += _escape_ordered(x.encode("utf-8"))
+        if terminate:
+            buf.append(_ORDERED_TERMINATOR)
+    elif t is int or t is float:
+        _encode_ordered_number(x, buf)
+    elif t is bytes:
+        buf.append(_ORDERED_BYTES)
+        buf += _escape_ordered(x)
+        if terminate:
+            buf.append(_ORDERED_TERMINATOR)
+    elif t is tuple:
+        buf.append(_ORDERED_TUPLE)
+        for d in x:
+            _encode_ordered(d, buf)
+        if terminate:
+            buf.append(_ORDERED_TERMINATOR)
+    elif x is None:
+        buf.append(_ORDERED_NONE)
+    elif t is bool:
+        buf.append(_ORDERED_TRUE if x else _ORDERED_FALSE)
+    else:
+        raise TypeError(f"ordered codec does not support '{t.__name__}'")
+
+
+def _encode_ordered_number(x: Union[int, float], buf: bytearray) -> None:
+    # Numbers are ordered by their nearest double and then by the rounding error of the int, so ints and floats
+    # share one total order and an integral float is encoded exactly like the equal int.
+    if type(x) is int:
+        if not -_SIGN_BIT <= x < _SIGN_BIT:
+            raise OverflowError("ordered codec supports signed 64-bit integers only")
+        approx = float(x)
+        error = x - int(approx)
+    elif x != x:
+        raise ValueError("ordered codec does not support NaN")
+    else:
+        approx = x if x != 0 else 0.0
+        error = 0
+    bits = _UINT64.unpack(_FLOAT64.pack(approx))[0]
+    buf.append(_ORDERED_NUMBER)
+    buf += _UINT64.pack((~bits & _MASK64) if bits & _SIGN_BIT else (bits | _SIGN_BIT))
+    buf += _UINT16.pack(error + _ROUNDING_OFFSET)
+
+
+def _decode_ordered_number(blob: bytes, offset: int) -> Tuple[Union[int, float], int]:
+    bits = _UINT64.unpack_from(blob, offset)[0]
+    bits = (bits & ~_SIGN_BIT) if bits & _SIGN_BIT else (~bits & _MASK64)
+    approx = _FLOAT64.unpack(_UINT64.pack(bits))[0]
+    error = _UINT16.unpack_from(blob, offset + 8)[0] - _ROUNDING_OFFSET
+    if approx.is_integer() and -_SIGN_BIT <= int(approx) + error < _SIGN_BIT:
+        return (int(approx) + error, offset + 10)
+    return (approx, offset + 10)
+
+
+def _decode_ordered_escaped(blob: bytes, offset: int) -> Tuple[bytes, int]:
+    buf = bytearray()
+    while True:
+        end = blob.index(b"\x00", offset)
+        buf += blob[offset:end]
+        if end + 1 < len(blob) and blob[end + 1] == _ORDERED_ESCAPE:
+            buf.append(0)
+            offset = end + 2
+        else:
+            return (bytes(buf), end + 1)
+
+
+def _decode_ordered(blob: bytes, offset: int) -> Tuple[Any, int]:
+    tag = blob[offset]
+    offset += 1
+    if tag == _ORDERED_STR:
+        res, offset = _decode_ordered_escaped(blob, offset)
+        return (res.decode("utf-8"), offset)
+    if tag == _ORDERED_NUMBER:
+        return _decode_ordered_number(blob, offset)
+    if tag == _ORDERED_BYTES:
+        return _decode_ordered_escaped(blob, offset)
+    if tag == _ORDERED_TUPLE:
+        buf = []
+        while blob[offset] != _ORDERED_TERMINATOR:
+            d, offset = _decode_ordered(blob, offset)
+            buf.append(d)
+        return (tuple(buf), offset + 1)
+    if tag == _ORDERED_NONE:
+        return (None, offset)
+    if tag == _ORDERED_FALSE:
+        return (False, offset)
+    if tag == _ORDERED_TRUE:
+        return (True, offset)
+    raise ValueError(f"unknown tag {tag:#x} at offset {offset - 1}")
+
+
+def dumps_ordered(x: Any) -> bytes:
+    buf = bytearray()
+    _encode_ordered(x, buf)
+    return bytes(buf)
+
+
+def loads_ordered(blob: bytes) -> Any:
+    res, offset = _decode_ordered(blob, 0)
+    if offset != len(blob):
+        raise ValueError("trailing bytes after value")
+    return res
+
+
+def dumps_ordered_prefix(x: Any) -> bytes:
+    if not isinstance(x, (str, bytes, tuple)):
+        raise TypeError(f"prefix must be str, bytes or tuple, not '{type(x).__name__}'")
+    buf = bytearray()
+    _encode_ordered(x, buf, terminate=False)
+    return bytes(buf)
+
+
+def next_prefix(prefix: bytes) -> Optional[bytes]:
+    stripped = prefix.rstrip(b"\xff")
+    if len(stripped) == 0:
+        return None
+    return stripped[:-1] + bytes((stripped[-1] + 1,))
+
+
+PICKLE = Codec(dumps, loads)
+STR = Codec(dumps_str, loads_str)
+BYTES = Codec(dumps_bytes, loads_bytes)
+INT = Codec(dumps_int, loads_int)
+FLOAT = Codec(dumps_float, loads_float)
+TUPLE = Codec(dumps_tuple, loads_tuple)
+ORDERED = Codec(dumps_ordered, loads_ordered)
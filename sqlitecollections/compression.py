@@ -0,0 +1,127 @@
+import bz2
+import json
+import lzma
+import struct
+import sys
+import zlib
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable, Mapping
+else:
+    from typing import Iterable, Mapping
+
+_RAW = 0
+_ZLIB = 1
+_LZMA = 2
+_BZ2 = 3
+_ZLIB_DICT = 4
+
+_FLAGS = {"zlib": _ZLIB, "lzma": _LZMA, "bz2": _BZ2, "zlib_dict": _ZLIB}
+_UINT32 = struct.Struct(">I")
+DICTIONARY_FLAG = bytes((_ZLIB_DICT,))
+DICTIONARY_HEADER_SIZE = 1 + _UINT32.size
+_MAX_DICTIONARY_SIZE = 32768
+
+
+def _compress_zlib(blob: bytes, level: Optional[int]) -> bytes:
+    return zlib.compress(blob, -1 if level is None else level)
+
+
+def _compress_lzma(blob: bytes, level: Optional[int]) -> bytes:
+    return lzma.compress(blob, preset=level)
+
+
+def _compress_bz2(blob: bytes, level: Optional[int]) -> bytes:
+    return bz2.compress(blob, 9 if level is None else level)
+
+
+_COMPRESSORS: Dict[int, Callable[[bytes, Optional[int]], bytes]] = {
+    _ZLIB: _compress_zlib,
+    _LZMA: _compress_lzma,
+    _BZ2: _compress_bz2,
+}
+_DECOMPRESSORS: Dict[int, Callable[[bytes], bytes]] = {
+    _ZLIB: zlib.decompress,
+    _LZMA: lzma.decompress,
+    _BZ2: bz2.decompress,
+}
+
+
+class Compression(NamedTuple):
+    algorithm: str = "zlib"
+    level: Optional[int] = None
+    threshold: int = 1024
+    dictionary_size: int = _MAX_DICTIONARY_SIZE
+    sample_size: int = 1000
+
+    @property
+    def uses_dictionary(self) -> bool:
+        return self.algorithm == "zlib_dict"
+
+    def validate(self) -> "Compression":
+        if self.algorithm not in _FLAGS:
+            raise ValueError(f"unsupported compression algorithm: {self.algorithm!r}")
+        if self.threshold < 0:
+            raise ValueError("threshold must not be negative")
+        if not 0 < self.dictionary_size <= _MAX_DICTIONARY_SIZE:
+            raise ValueError(f"dictionary_size must be between 1 and {_MAX_DICTIONARY_SIZE}")
+        if self.sample_size < 1:
+            raise ValueError("sample_size must be positive")
+        try:
+            _COMPRESSORS[_FLAGS[self.algorithm]](b"", self.level)
+        except Exception:
+            raise ValueError(f"invalid {self.algorithm} compression level: {self.level}")
+        return self
+
+    def compress(self, blob: bytes, dictionary: Optional[Tuple[int, bytes]] = None) -> bytes:
+        if self.uses_dictionary and dictionary is not None:
+            compressor = zlib.compressobj(-1 if self.level is None else self.level, zdict=dictionary[1])
+            compressed = _UINT32.pack(dictionary[0]) + compressor.compress(blob) + compressor.flush()
+            if len(compressed) < len(blob):
+                return bytes((_ZLIB_DICT,)) + compressed
+        elif len(blob) >= self.threshold:
+            flag = _FLAGS[self.algorithm]
+            compressed = _COMPRESSORS[flag](blob, self.level)
+            if len(compressed) < len(blob):
+                return bytes((flag,)) + compressed
+        return bytes((_RAW,)) + blob
+
+    def dumps(self) -> str:
+        return json.dumps(self._asdict(), sort_keys=True)
+
+    @classmethod
+    def loads(cls, options: str) -> "Compression":
+        return cls(**json.loads(options))
+
+
+def dictionary_version(blob: bytes) -> Optional[int]:
+    if blob[0] != _ZLIB_DICT:
+        return None
+    return int(_UINT32.unpack_from(blob, 1)[0])
+
+
+def decompress(blob: bytes, dictionaries: Optional[Mapping[int, bytes]] = None) -> bytes:
+    flag = blob[0]
+    if flag == _RAW:
+        return blob[1:]
+    if flag == _ZLIB_DICT:
+        version = int(_UINT32.unpack_from(blob, 1)[0])
+        if dictionaries is None or version not in dictionaries:
+            raise ValueError(f"unknown compression dictionary version: {version}")
+        decompressor = zlib.decompressobj(zdict=dictionaries[version])
+        return decompressor.decompress(blob[1 + _UINT32.size :]) + decompressor.flush()
+    if flag not in _DECOMPRESSORS:
+        raise ValueError(f"unknown compression flag: {flag}")
+    return _DECOMPRESSORS[flag](blob[1:])
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = _MAX_DICTIONARY_SIZE) -> bytes:
+    unique: List[bytes] = []
+    seen = set()
+    for d in samples:
+        if d not in seen:
+            seen.add(d)
+            unique.append(d)
+    res = b"".join(unique)
+    return res[len(res) - size :] if len(res) > size else res
@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import sys
+import threading
+from typing import Any, List, Optional, Tuple, Type
+
+if sys.version_info >= (3, 9):
+    from contextlib import AbstractContextManager
+
+    ContextManager = AbstractContextManager
+else:
+    from typing import ContextManager
+
+from .writer import GroupCommitWriter
+
+
+class ConnectionPool:
+    def __init__(self, database: str, timeout: float = 5.0, wal: bool = True) -> None:
+        if database == ":memory:" or database == "":
+            raise ValueError("ConnectionPool requires a database file shared by all connections")
+        self._database = database
+        self._timeout = timeout
+        self._wal = wal
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._writer: Optional[GroupCommitWriter] = None
+        self._pid = os.getpid()
+
+    @property
+    def database(self) -> str:
+        return self._database
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def wal(self) -> bool:
+        return self._wal
+
+    @property
+    def write_lock(self) -> ContextManager[bool]:
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        return self._write_lock
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.connection = conn
+        return conn
+
+    @property
+    def writer(self) -> GroupCommitWriter:
+        with self._lock:
+            if self._writer is None:
+                self._writer = GroupCommitWriter(self)
+            return self._writer
+
+    def _connect(self, factory: Type[sqlite3.Connection] = sqlite3.Connection, **kwargs: Any) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False, factory=factory, **kwargs)
+        if self.wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            # Connections of threads that have exited are closed here, so that a thread per task doesn't leak them.
+            closed = [d[1] for d in self._connections if not d[0].is_alive()]
+            self._connections = [d for d in self._connections if d[0].is_alive()]
+            self._connections.append((threading.current_thread(), conn))
+        for d in closed:
+            d.close()
+        return conn
+
+    def _reset_after_fork(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._connections = []
+        self._writer = None
+        self._pid = os.getpid()
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            conn.close()
+        self._local = threading.local()
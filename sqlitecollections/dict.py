@@ -1,14 +1,41 @@
+import io
 import sqlite3
 import sys
 import warnings
 from itertools import chain
 from pickle import dumps, loads
-from typing import Callable, Generic, Optional, Tuple, Union, cast, overload
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
 
 if sys.version_info >= (3, 9):
-    from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Reversible
+    from collections.abc import (
+        ItemsView,
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        Reversible,
+        ValuesView,
+    )
 else:
-    from typing import Iterable, Iterator, Mapping, MutableMapping
+    from typing import (
+        ItemsView,
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        ValuesView,
+    )
 if sys.version_info >= (3, 8):
     from typing import Reversible
 
@@ -16,20 +43,34 @@ from . import RebuildStrategy
 from .base import (
     KT,
     VT,
+    ColumnType,
     SqliteCollectionBase,
     T,
     _SqliteCollectionBaseDatabaseDriver,
+    hash_serialized_key,
     is_hashable,
+    is_identity_deserializer,
+    materialize_iterators,
+    resolve_column_type,
+    serialize_lookup_value,
+    serialized_write,
 )
+from .compression import Compression
+from .connection import ConnectionPool
+from .large_value import DEFAULT_CHUNK_SIZE, LargeValueReader, LargeValueWriter
 
 
 class _DictDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
+    partition_column = "item_order"
+    key_column = "serialized_key"
+    partition_value_columns = "serialized_key, serialized_value"
+
     @classmethod
     def do_create_table(
-        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
     ) -> None:
         cur.execute(
-            f"CREATE TABLE {table_name} ("
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
             "serialized_key BLOB NOT NULL UNIQUE, "
             "serialized_value BLOB NOT NULL, "
             "item_order INTEGER PRIMARY KEY)"
@@ -63,6 +104,12 @@ class _DictDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
             return None
         return cast(bytes, res[0])
 
+    @classmethod
+    def get_serialized_items(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Tuple[bytes, Any]]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY item_order")
+        for res in cur:
+            yield cast(Tuple[bytes, Any], res)
+
     @classmethod
     def get_next_order(cls, table_name: str, cur: sqlite3.Cursor) -> int:
         cur.execute(f"SELECT MAX(item_order) FROM {table_name}")
@@ -120,6 +167,114 @@ class _DictDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
         cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY item_order DESC LIMIT 1")
         return cast(Tuple[bytes, bytes], cur.fetchone())
 
+    @classmethod
+    def get_rebuild_row_ids(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Any]:
+        last_order = -1
+        while True:
+            cur.execute(
+                f"SELECT item_order FROM {table_name} WHERE item_order > ? ORDER BY item_order LIMIT 1",
+                (last_order,),
+            )
+            res = cur.fetchone()
+            if res is None:
+                break
+            last_order = res[0]
+            yield last_order
+
+    @classmethod
+    def get_serialized_item_by_row_id(cls, table_name: str, cur: sqlite3.Cursor, row_id: Any) -> Tuple[bytes, Any]:
+        cur.execute(
+            f"SELECT serialized_key, serialized_value FROM {table_name} WHERE {cls.partition_column}=?", (row_id,)
+        )
+        return cast(Tuple[bytes, Any], cur.fetchone())
+
+    @classmethod
+    def update_serialized_item(
+        cls, table_name: str, cur: sqlite3.Cursor, row_id: Any, serialized_key: bytes, serialized_value: Any
+    ) -> None:
+        cur.execute(
+            f"UPDATE {table_name} SET serialized_key=?, serialized_value=? WHERE {cls.partition_column}=?",
+            (serialized_key, serialized_value, row_id),
+        )
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        cur.execute(
+            f"INSERT INTO {new_table_name} (serialized_key, serialized_value) "
+            f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY {order_column}"
+        )
+
+    @classmethod
+    def has_row_triggers(cls, table_name: str, cur: sqlite3.Cursor, schema: str = "main") -> bool:
+        return super(_DictDatabaseDriver, cls).has_row_triggers(table_name, cur, schema) or (
+            cls.get_option(table_name, cur, "large_values", schema) is not None
+        )
+
+    @classmethod
+    def rename_row_triggers(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_DictDatabaseDriver, cls).rename_row_triggers(table_name, new_table_name, cur)
+        if cls.get_option(new_table_name, cur, "large_values") is not None:
+            cls.drop_chunk_triggers(table_name, cur)
+            cls.create_chunk_triggers(new_table_name, cur)
+
+    @classmethod
+    def initialize_chunk_table(cls, cur: sqlite3.Cursor) -> None:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS metadata_chunks ("
+            "value_id INTEGER NOT NULL, chunk_index INTEGER NOT NULL, data BLOB NOT NULL, "
+            "PRIMARY KEY (value_id, chunk_index))"
+        )
+
+    @classmethod
+    def create_chunk_triggers(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        delete_chunks = "DELETE FROM metadata_chunks WHERE value_id=OLD.serialized_value;"
+        cur.execute(
+            f"CREATE TRIGGER {table_name}_chunks_delete AFTER DELETE ON {table_name} "
+            f"WHEN typeof(OLD.serialized_value)='integer' BEGIN {delete_chunks} END"
+        )
+        cur.execute(
+            f"CREATE TRIGGER {table_name}_chunks_update AFTER UPDATE OF serialized_value ON {table_name} "
+            "WHEN typeof(OLD.serialized_value)='integer' AND NEW.serialized_value IS NOT OLD.serialized_value "
+            f"BEGIN {delete_chunks} END"
+        )
+
+    @classmethod
+    def drop_chunk_triggers(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        for event in ("delete", "update"):
+            cur.execute(f"DROP TRIGGER IF EXISTS {table_name}_chunks_{event}")
+
+    @classmethod
+    def allocate_large_value(cls, cur: sqlite3.Cursor) -> int:
+        cur.execute(
+            "INSERT INTO metadata_chunks (value_id, chunk_index, data) "
+            "SELECT COALESCE(MAX(value_id), 0) + 1, 0, x'' FROM metadata_chunks"
+        )
+        cur.execute("SELECT value_id FROM metadata_chunks WHERE rowid=?", (cur.lastrowid,))
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def set_chunk(cls, cur: sqlite3.Cursor, value_id: int, chunk_index: int, data: bytes) -> None:
+        cur.execute(
+            "INSERT OR REPLACE INTO metadata_chunks (value_id, chunk_index, data) VALUES (?, ?, ?)",
+            (value_id, chunk_index, data),
+        )
+
+    @classmethod
+    def delete_chunks(cls, cur: sqlite3.Cursor, value_id: int) -> None:
+        cur.execute("DELETE FROM metadata_chunks WHERE value_id=?", (value_id,))
+
+    @classmethod
+    def get_chunk_rows(cls, cur: sqlite3.Cursor, value_id: int) -> List[Tuple[int, int]]:
+        cur.execute(
+            "SELECT rowid, length(data) FROM metadata_chunks WHERE value_id=? ORDER BY chunk_index", (value_id,)
+        )
+        return cast(List[Tuple[int, int]], cur.fetchall())
+
+    @classmethod
+    def get_large_value(cls, cur: sqlite3.Cursor, value_id: int) -> bytes:
+        cur.execute("SELECT data FROM metadata_chunks WHERE value_id=? ORDER BY chunk_index", (value_id,))
+        return b"".join(cast(bytes, d[0]) for d in cur)
+
     @classmethod
     def get_reversed_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
         cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY item_order DESC")
@@ -127,12 +282,189 @@ class _DictDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
             yield cast(bytes, res[0])
 
 
+class _HashedDictDatabaseDriver(_DictDatabaseDriver):
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_key BLOB NOT NULL, "
+            "serialized_value BLOB NOT NULL, "
+            "item_order INTEGER PRIMARY KEY, "
+            "key_hash INTEGER NOT NULL)"
+        )
+        cls.create_key_hash_index(table_name, cur)
+
+    @classmethod
+    def create_key_hash_index(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"CREATE INDEX {table_name}_key_hash ON {table_name} (key_hash)")
+
+    @classmethod
+    def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_HashedDictDatabaseDriver, cls).alter_table_name(table_name, new_table_name, cur)
+        cur.execute(f"DROP INDEX {table_name}_key_hash")
+        cls.create_key_hash_index(new_table_name, cur)
+
+    @classmethod
+    def delete_single_record_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes
+    ) -> None:
+        cur.execute(
+            f"DELETE FROM {table_name} WHERE key_hash=? AND serialized_key=?",
+            (hash_serialized_key(serialized_key), serialized_key),
+        )
+
+    @classmethod
+    def is_serialized_key_in(cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes) -> bool:
+        cur.execute(
+            f"SELECT 1 FROM {table_name} WHERE key_hash=? AND serialized_key=?",
+            (hash_serialized_key(serialized_key), serialized_key),
+        )
+        return len(list(cur)) > 0
+
+    @classmethod
+    def get_serialized_value_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes
+    ) -> Union[None, bytes]:
+        cur.execute(
+            f"SELECT serialized_value FROM {table_name} WHERE key_hash=? AND serialized_key=?",
+            (hash_serialized_key(serialized_key), serialized_key),
+        )
+        res = cur.fetchone()
+        if res is None:
+            return None
+        return cast(bytes, res[0])
+
+    @classmethod
+    def insert_serialized_value_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes, serialized_value: bytes
+    ) -> None:
+        item_order = cls.get_next_order(table_name, cur)
+        cur.execute(
+            f"INSERT INTO {table_name} (serialized_key, serialized_value, item_order, key_hash) VALUES (?, ?, ?, ?)",
+            (serialized_key, serialized_value, item_order, hash_serialized_key(serialized_key)),
+        )
+
+    @classmethod
+    def update_serialized_value_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes, serialized_value: bytes
+    ) -> None:
+        cur.execute(
+            f"UPDATE {table_name} SET serialized_value=? WHERE key_hash=? AND serialized_key=?",
+            (serialized_value, hash_serialized_key(serialized_key), serialized_key),
+        )
+
+    @classmethod
+    def update_serialized_item(
+        cls, table_name: str, cur: sqlite3.Cursor, row_id: Any, serialized_key: bytes, serialized_value: Any
+    ) -> None:
+        cur.execute(
+            f"UPDATE {table_name} SET serialized_key=?, serialized_value=?, key_hash=? WHERE item_order=?",
+            (serialized_key, serialized_value, hash_serialized_key(serialized_key), row_id),
+        )
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        for rows in cls.get_row_batches(table_name, cur, "serialized_key, serialized_value", order_column):
+            cur.executemany(
+                f"INSERT INTO {new_table_name} (serialized_key, serialized_value, key_hash) VALUES (?, ?, ?)",
+                ((d[1], d[2], hash_serialized_key(d[1])) for d in rows),
+            )
+
+
+class _UnorderedDictDatabaseDriver(_DictDatabaseDriver):
+    partition_column = "serialized_key"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_key BLOB PRIMARY KEY, serialized_value BLOB NOT NULL) WITHOUT ROWID"
+        )
+
+    @classmethod
+    def get_serialized_items(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Tuple[bytes, Any]]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(Tuple[bytes, Any], res)
+
+    @classmethod
+    def get_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_reversed_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key DESC")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def insert_serialized_value_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes, serialized_value: bytes
+    ) -> None:
+        cur.execute(
+            f"INSERT INTO {table_name} (serialized_key, serialized_value) VALUES (?, ?)",
+            (serialized_key, serialized_value),
+        )
+
+    @classmethod
+    def get_last_serialized_item(cls, table_name: str, cur: sqlite3.Cursor) -> Tuple[bytes, bytes]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key DESC LIMIT 1")
+        return cast(Tuple[bytes, bytes], cur.fetchone())
+
+    @classmethod
+    def get_rebuild_row_ids(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Any]:
+        cur.execute(f"SELECT serialized_key FROM {table_name}")
+        return [d[0] for d in cur.fetchall()]
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        cur.execute(
+            f"INSERT INTO {new_table_name} (serialized_key, serialized_value) "
+            f"SELECT serialized_key, serialized_value FROM {table_name}"
+        )
+
+
+_DICT_DRIVERS = {
+    "0": _DictDatabaseDriver,
+    "0_key_hash": _HashedDictDatabaseDriver,
+    "0_unordered": _UnorderedDictDatabaseDriver,
+}
+
+
+class _DictItemsView(ItemsView[KT, VT]):
+    _mapping: "_Dict[KT, VT]"
+
+    def __iter__(self) -> Iterator[Tuple[KT, VT]]:
+        yield from self._mapping._iter_items()
+
+
+class _DictValuesView(ValuesView[VT]):
+    _mapping: "_Dict[Any, VT]"
+
+    def __iter__(self) -> Iterator[VT]:
+        yield from self._mapping._iter_values()
+
+
 class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
     _driver_class = _DictDatabaseDriver
+    _raw_keys = False
+    _reference_fields: Tuple[str, ...] = SqliteCollectionBase._reference_fields + (
+        "_value_serializer",
+        "_value_deserializer",
+        "_raw_keys",
+        "_key_column_type",
+        "_value_column_type",
+    )
 
     def __init__(
         self,
-        connection: Optional[Union[str, sqlite3.Connection]] = None,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
         table_name: Optional[str] = None,
         key_serializer: Optional[Callable[[KT], bytes]] = None,
         key_deserializer: Optional[Callable[[bytes], KT]] = None,
@@ -143,7 +475,41 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
         persist: bool = True,
         rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
         data: Optional[Union[Iterable[Tuple[KT, VT]], Mapping[KT, VT]]] = None,
+        key_column_type: Optional[ColumnType] = None,
+        value_column_type: Optional[ColumnType] = None,
+        compression: Optional[Compression] = None,
+        deduplicate: bool = False,
+        bloom_filter: bool = False,
+        key_hash: Optional[bool] = None,
+        ordered: Optional[bool] = None,
+        temporary: bool = False,
     ) -> None:
+        if bloom_filter and key_column_type is not None:
+            raise ValueError("bloom_filter can't be combined with key_column_type")
+        if key_hash and key_column_type is not None:
+            raise ValueError("key_hash can't be combined with key_column_type")
+        if key_hash and ordered is False:
+            raise ValueError("key_hash can't be combined with ordered=False")
+        if compression is not None and value_column_type is not None:
+            raise ValueError("compression can't be combined with value_column_type")
+        if deduplicate and value_column_type is not None:
+            raise ValueError("deduplicate can't be combined with value_column_type")
+        if deduplicate and compression is not None:
+            raise ValueError("deduplicate can't be combined with compression")
+        self._compression = None if compression is None else compression.validate()
+        self._deduplicate = deduplicate
+        self._bloom_filter_enabled = bloom_filter
+        self._schema_request = (key_hash, ordered)
+        self._temporary = temporary
+        if key_hash:
+            self._driver_class = _HashedDictDatabaseDriver
+        elif ordered is False:
+            self._driver_class = _UnorderedDictDatabaseDriver
+        self._key_column_type = key_column_type
+        self._value_column_type = value_column_type
+        value_serializer, value_deserializer = resolve_column_type(
+            value_column_type, value_serializer, value_deserializer
+        )
         if serializer is not None:
             warnings.warn(
                 "serializer argument is deprecated. use key_serializer or value_serializer instead",
@@ -170,6 +536,7 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
             if deserializer is not None
             else cast(Callable[[bytes], VT], loads if key_deserializer is None else key_deserializer)
         )
+        key_serializer, key_deserializer = resolve_column_type(key_column_type, key_serializer, key_deserializer)
         super(_Dict, self).__init__(
             connection=connection,
             table_name=table_name,
@@ -178,6 +545,8 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
             persist=persist,
             rebuild_strategy=rebuild_strategy,
         )
+        self._raw_keys = is_identity_deserializer(key_deserializer)
+        self._raw_values = self._is_raw(self._value_deserializer)
         if data is not None:
             self.clear()
             self.update(data)
@@ -198,13 +567,56 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
     def value_deserializer(self) -> Callable[[bytes], VT]:
         return self._value_deserializer
 
+    @property
+    def key_column_type(self) -> Optional[ColumnType]:
+        return self._key_column_type
+
+    @property
+    def value_column_type(self) -> Optional[ColumnType]:
+        return self._value_column_type
+
+    @property
+    def key_hash(self) -> bool:
+        return self._driver_class is _HashedDictDatabaseDriver
+
+    @property
+    def ordered(self) -> bool:
+        return self._driver_class is not _UnorderedDictDatabaseDriver
+
     @property
     def schema_version(self) -> str:
-        return "0"
+        if self.key_hash:
+            return "0_key_hash"
+        return "0" if self.ordered else "0_unordered"
+
+    def _migrate_schema(self, cur: sqlite3.Cursor) -> None:
+        if self._driver_class not in _DICT_DRIVERS.values():
+            return
+        stored = self._driver_class.get_schema_version(self.table_name, self.container_type_name, cur)
+        if stored is None:
+            return
+        key_hash, ordered = self._schema_request
+        if key_hash is None:
+            key_hash = stored == "0_key_hash" and ordered is not False
+        if ordered is None:
+            ordered = stored != "0_unordered" or key_hash
+        if key_hash and self.key_column_type is not None:
+            raise ValueError("key_hash can't be combined with key_column_type")
+        self._driver_class = _DICT_DRIVERS["0_key_hash" if key_hash else "0" if ordered else "0_unordered"]
+        if stored != self.schema_version:
+            self._driver_class.migrate_table(
+                self.table_name,
+                self.container_type_name,
+                self.schema_version,
+                cur,
+                _DICT_DRIVERS.get(stored, _DictDatabaseDriver).partition_column,
+            )
 
     def _rebuild_check_with_first_element(self) -> bool:
         cur = self.connection.cursor()
-        cur.execute(f"SELECT serialized_key FROM {self.table_name} ORDER BY item_order LIMIT 1")
+        cur.execute(
+            f"SELECT serialized_key FROM {self.table_name} ORDER BY {self._driver_class.partition_column} LIMIT 1"
+        )
         res = cur.fetchone()
         if res is None:
             return False
@@ -214,55 +626,129 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
 
     def _do_rebuild(self) -> None:
         cur = self.connection.cursor()
-        last_order = -1
-        while last_order is not None:
-            cur.execute(
-                f"SELECT item_order FROM {self.table_name} WHERE item_order > ? ORDER BY item_order LIMIT 1",
-                (last_order,),
+        for row_id in self._driver_class.get_rebuild_row_ids(self.table_name, self.connection.cursor()):
+            serialized_key, serialized_value = self._driver_class.get_serialized_item_by_row_id(
+                self.table_name, cur, row_id
             )
-            res = cur.fetchone()
-            if res is None:
-                break
-            i = res[0]
-            cur.execute(
-                f"SELECT serialized_key, serialized_value FROM {self.table_name} WHERE item_order=?",
-                (i,),
+            self._driver_class.update_serialized_item(
+                self.table_name,
+                cur,
+                row_id,
+                self.serialize_key(self.deserialize_key(serialized_key)),
+                serialized_value
+                if self._is_large_value(serialized_value)
+                else self.serialize_value(self.deserialize_value(serialized_value)),
             )
-            serialized_key, serialized_value = cur.fetchone()
-            cur.execute(
-                f"UPDATE {self.table_name} SET serialized_key=?, serialized_value=? WHERE item_order=?",
-                (
-                    self.serialize_key(self.deserialize_key(serialized_key)),
-                    self.serialize_value(self.deserialize_value(serialized_value)),
-                    i,
-                ),
-            )
-            last_order = i
 
     def serialize_key(self, key: KT) -> bytes:
         if not is_hashable(key):
             raise TypeError(f"unhashable type: '{type(key).__name__}'")
         return self.key_serializer(key)
 
+    def _serialize_lookup_key(self, key: object) -> Optional[bytes]:
+        return serialize_lookup_value(self.serialize_key, key)
+
     def deserialize_key(self, serialized_key: bytes) -> KT:
+        if self._raw_keys:
+            return cast(KT, serialized_key)
         return self.key_deserializer(serialized_key)
 
     def serialize_value(self, value: VT) -> bytes:
-        return self.value_serializer(value)
+        return self._encode_value(self.value_serializer(value))
 
     def deserialize_value(self, value: bytes) -> VT:
-        return self.value_deserializer(value)
+        if self._raw_values and type(value) is bytes:
+            return cast(VT, value)
+        if self._is_large_value(value):
+            return self.value_deserializer(
+                self._driver_class.get_large_value(self.connection.cursor(), cast(int, value))
+            )
+        return self.value_deserializer(self._decode_value(value))
 
-    def __delitem__(self, key: KT) -> None:
+    def _is_large_value(self, serialized_value: Any) -> bool:
+        return self.value_column_type is None and isinstance(serialized_value, int)
+
+    def open_value(self, key: KT, mode: str = "rb", chunk_size: int = DEFAULT_CHUNK_SIZE) -> BinaryIO:
+        if self.value_column_type is not None:
+            raise ValueError("open_value can't be used with value_column_type")
         serialized_key = self.serialize_key(key)
+        if mode == "wb":
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be positive")
+            return cast(BinaryIO, LargeValueWriter(self, serialized_key, chunk_size))
+        if mode != "rb":
+            raise ValueError(f"invalid mode: {mode!r}")
+        cur = self.connection.cursor()
+        serialized_value = self._driver_class.get_serialized_value_by_serialized_key(
+            self.table_name, cur, serialized_key
+        )
+        if serialized_value is None:
+            raise KeyError(key)
+        if not self._is_large_value(serialized_value):
+            return io.BytesIO(self._decode_value(serialized_value))
+        chunks = self._driver_class.get_chunk_rows(cur, cast(int, serialized_value))
+        return io.BufferedReader(LargeValueReader(self.connection, chunks))
+
+    def _raw_value(self, serialized_value: Any) -> Any:
+        if self._is_large_value(serialized_value):
+            return self._driver_class.get_large_value(self.connection.cursor(), cast(int, serialized_value))
+        return self._decode_value(serialized_value)
+
+    def get_raw(self, key: KT) -> Any:
+        cur = self.connection.cursor()
+        serialized_value = self._driver_class.get_serialized_value_by_serialized_key(
+            self.table_name, cur, self.serialize_key(key)
+        )
+        if serialized_value is None:
+            raise KeyError(key)
+        return self._raw_value(serialized_value)
+
+    def iter_raw_items(self) -> Iterator[Tuple[bytes, Any]]:
+        cur = self.connection.cursor()
+        for serialized_key, serialized_value in self._driver_class.get_serialized_items(self.table_name, cur):
+            yield (serialized_key, self._raw_value(serialized_value))
+
+    @serialized_write
+    def _begin_large_value(self) -> int:
+        cur = self.connection.cursor()
+        if self._driver_class.get_option(self.table_name, cur, "large_values", self._metadata_schema) is None:
+            self._driver_class.initialize_chunk_table(cur)
+            self._driver_class.create_chunk_triggers(self.table_name, cur)
+            self._driver_class.set_option(self.table_name, cur, "large_values", "1", self._metadata_schema)
+        value_id = self._driver_class.allocate_large_value(cur)
+        return value_id
+
+    @serialized_write
+    def _write_large_value_chunk(self, value_id: int, chunk_index: int, data: bytes) -> None:
+        self._driver_class.set_chunk(self.connection.cursor(), value_id, chunk_index, data)
+
+    @serialized_write
+    def _commit_large_value(self, serialized_key: bytes, value_id: int) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.upsert(
+            self.table_name, cur, self._add_to_bloom_filter(serialized_key), cast(bytes, value_id)
+        )
+        self._invalidate_saved_bloom_filter(cur)
+
+    @serialized_write
+    def _discard_large_value(self, value_id: int) -> None:
+        self._driver_class.delete_chunks(self.connection.cursor(), value_id)
+
+    def _deserialize_partition_row(self, row: Tuple[Any, ...]) -> Tuple[KT, VT]:
+        return (self.deserialize_key(row[0]), self.deserialize_value(row[1]))
+
+    @serialized_write
+    def __delitem__(self, key: KT) -> None:
+        serialized_key = self._serialize_lookup_key(key)
         cur = self.connection.cursor()
-        if not self._driver_class.is_serialized_key_in(self.table_name, cur, serialized_key):
+        if serialized_key is None or not self._driver_class.is_serialized_key_in(self.table_name, cur, serialized_key):
             raise KeyError(key)
         self._driver_class.delete_single_record_by_serialized_key(self.table_name, cur, serialized_key)
-        self.connection.commit()
 
     def __getitem__(self, key: KT) -> VT:
-        serialized_key = self.serialize_key(key)
+        serialized_key = self._serialize_lookup_key(key)
+        if serialized_key is None or not self._might_contain(serialized_key):
+            raise KeyError(key)
         cur = self.connection.cursor()
         serialized_value = self._driver_class.get_serialized_value_by_serialized_key(
             self.table_name, cur, serialized_key
@@ -273,19 +759,40 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
 
     def __iter__(self) -> Iterator[KT]:
         cur = self.connection.cursor()
-        for serialized_key in self._driver_class.get_serialized_keys(self.table_name, cur):
-            yield self.deserialize_key(serialized_key)
+        yield from self._iter_deserialized(
+            self._driver_class.get_serialized_keys(self.table_name, cur),
+            None if self._raw_keys else self.deserialize_key,
+        )
 
     def __len__(self) -> int:
         cur = self.connection.cursor()
         return self._driver_class.get_count(self.table_name, cur)
 
+    def items(self) -> ItemsView[KT, VT]:
+        return _DictItemsView(self)
+
+    def values(self) -> ValuesView[VT]:
+        return _DictValuesView(self)
+
+    def _iter_items(self) -> Iterator[Tuple[KT, VT]]:
+        # Stored values are read and decoded by the scan, only the deserializers run on the prefetch thread.
+        yield from self._iter_deserialized(self.iter_raw_items(), self._deserialize_raw_item)
+
+    def _iter_values(self) -> Iterator[VT]:
+        yield from self._iter_deserialized(
+            (d[1] for d in self.iter_raw_items()), None if self._raw_values else self.value_deserializer
+        )
+
+    def _deserialize_raw_item(self, item: Tuple[bytes, Any]) -> Tuple[KT, VT]:
+        return (self.deserialize_key(item[0]), self.value_deserializer(item[1]))
+
+    @serialized_write
     def __setitem__(self, key: KT, value: VT) -> None:
         serialized_key = self.serialize_key(key)
         cur = self.connection.cursor()
         serialized_value = self.serialize_value(value)
-        self._driver_class.upsert(self.table_name, cur, serialized_key, serialized_value)
-        self.connection.commit()
+        self._driver_class.upsert(self.table_name, cur, self._add_to_bloom_filter(serialized_key), serialized_value)
+        self._invalidate_saved_bloom_filter(cur)
 
     def _create_volatile_copy(
         self,
@@ -293,14 +800,21 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
     ) -> "Dict[KT, VT]":
 
         return Dict[KT, VT](
-            connection=self.connection,
-            key_serializer=self.key_serializer,
-            key_deserializer=self.key_deserializer,
-            value_serializer=self.value_serializer,
-            value_deserializer=self.value_deserializer,
+            connection=self._shared_connection,
+            key_serializer=self.key_serializer if self.key_column_type is None else None,
+            key_deserializer=self.key_deserializer if self.key_column_type is None else None,
+            value_serializer=self.value_serializer if self.value_column_type is None else None,
+            value_deserializer=self.value_deserializer if self.value_column_type is None else None,
             rebuild_strategy=RebuildStrategy.SKIP,
             persist=False,
             data=(self if data is None else data),
+            key_column_type=self.key_column_type,
+            value_column_type=self.value_column_type,
+            compression=self.compression,
+            deduplicate=self.deduplicate,
+            key_hash=self.key_hash,
+            ordered=self.ordered,
+            temporary=self._connection_pool is None,
         )
 
     def copy(self) -> "Dict[KT, VT]":
@@ -318,31 +832,35 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
     def pop(self, k: KT, default: Union[VT, T] = ...) -> Union[VT, T]:
         ...
 
+    @serialized_write
     def pop(self, k: KT, default: Optional[Union[VT, object]] = None) -> Union[VT, object]:
         cur = self.connection.cursor()
-        serialized_key = self.serialize_key(k)
-        serialized_value = self._driver_class.get_serialized_value_by_serialized_key(
-            self.table_name, cur, serialized_key
+        serialized_key = self._serialize_lookup_key(k)
+        serialized_value = (
+            None
+            if serialized_key is None
+            else self._driver_class.get_serialized_value_by_serialized_key(self.table_name, cur, serialized_key)
         )
         if serialized_value is None:
             if default is None:
                 raise KeyError(k)
             return default
-        self._driver_class.delete_single_record_by_serialized_key(self.table_name, cur, serialized_key)
-        self.connection.commit()
-        return self.deserialize_value(serialized_value)
+        value = self.deserialize_value(serialized_value)
+        self._driver_class.delete_single_record_by_serialized_key(self.table_name, cur, cast(bytes, serialized_key))
+        return value
 
+    @serialized_write
     def popitem(self) -> Tuple[KT, VT]:
         cur = self.connection.cursor()
         serialized_item = self._driver_class.get_last_serialized_item(self.table_name, cur)
         if serialized_item is None:
             raise KeyError("popitem(): dictionary is empty")
-        self._driver_class.delete_single_record_by_serialized_key(self.table_name, cur, serialized_item[0])
-        self.connection.commit()
-        return (
+        item = (
             self.deserialize_key(serialized_item[0]),
             self.deserialize_value(serialized_item[1]),
         )
+        self._driver_class.delete_single_record_by_serialized_key(self.table_name, cur, serialized_item[0])
+        return item
 
     @overload
     def update(self, __other: Mapping[KT, VT], **kwargs: VT) -> None:
@@ -356,24 +874,29 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
     def update(self, **kwargs: VT) -> None:
         ...
 
+    @materialize_iterators
+    @serialized_write
     def update(self, __other: Optional[Union[Iterable[Tuple[KT, VT]], Mapping[KT, VT]]] = None, **kwargs: VT) -> None:
         cur = self.connection.cursor()
         for k, v in chain(
             tuple() if __other is None else __other.items() if isinstance(__other, Mapping) else __other,
             cast(Mapping[KT, VT], kwargs).items(),
         ):
-            self._driver_class.upsert(self.table_name, cur, self.serialize_key(k), self.serialize_value(v))
-        self.connection.commit()
+            self._driver_class.upsert(
+                self.table_name, cur, self._add_to_bloom_filter(self.serialize_key(k)), self.serialize_value(v)
+            )
+        self._invalidate_saved_bloom_filter(cur)
 
+    @serialized_write
     def clear(self) -> None:
         cur = self.connection.cursor()
         self._driver_class.delete_all_records(self.table_name, cur)
-        self.connection.commit()
 
     def __contains__(self, o: object) -> bool:
-        return self._driver_class.is_serialized_key_in(
-            self.table_name, self.connection.cursor(), self.serialize_key(cast(KT, o))
-        )
+        serialized_key = self._serialize_lookup_key(o)
+        if serialized_key is None or not self._might_contain(serialized_key):
+            return False
+        return self._driver_class.is_serialized_key_in(self.table_name, self.connection.cursor(), serialized_key)
 
     @overload
     def get(self, key: KT) -> Union[VT, None]:
@@ -384,7 +907,9 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
         ...
 
     def get(self, key: KT, default_value: Optional[Union[VT, object]] = None) -> Union[VT, None, object]:
-        serialized_key = self.serialize_key(key)
+        serialized_key = self._serialize_lookup_key(key)
+        if serialized_key is None or not self._might_contain(serialized_key):
+            return default_value
         cur = self.connection.cursor()
         serialized_value = self._driver_class.get_serialized_value_by_serialized_key(
             self.table_name, cur, serialized_key
@@ -393,6 +918,7 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
             return default_value
         return self.deserialize_value(serialized_value)
 
+    @serialized_write
     def setdefault(self, key: KT, default: VT = None) -> VT:  # type: ignore
         serialized_key = self.serialize_key(key)
         cur = self.connection.cursor()
@@ -401,8 +927,9 @@ class _Dict(Generic[KT, VT], SqliteCollectionBase[KT], MutableMapping[KT, VT]):
         )
         if serialized_value is None:
             self._driver_class.insert_serialized_value_by_serialized_key(
-                self.table_name, cur, serialized_key, self.serialize_value(default)
+                self.table_name, cur, self._add_to_bloom_filter(serialized_key), self.serialize_value(default)
             )
+            self._invalidate_saved_bloom_filter(cur)
             return default
         return self.deserialize_value(serialized_value)
 
@@ -412,8 +939,9 @@ if sys.version_info >= (3, 8):
     class _ReversibleDict(_Dict[KT, VT], Reversible[KT]):
         def __reversed__(self) -> Iterator[KT]:
             cur = self.connection.cursor()
-            for serialized_key in self._driver_class.get_reversed_serialized_keys(self.table_name, cur):
-                yield self.deserialize_key(serialized_key)
+            yield from self._iter_deserialized(
+                self._driver_class.get_reversed_serialized_keys(self.table_name, cur), self.deserialize_key
+            )
 
 
 if sys.version_info >= (3, 9):
@@ -421,13 +949,19 @@ if sys.version_info >= (3, 9):
     class Dict(_ReversibleDict[KT, VT]):
         def __or__(self, other: Mapping[KT, VT]) -> "Dict[KT, VT]":
             tmp = Dict(
-                connection=self.connection,
-                key_serializer=self.key_serializer,
-                key_deserializer=self.key_deserializer,
-                value_serializer=self.value_serializer,
-                value_deserializer=self.value_deserializer,
+                connection=self._shared_connection,
+                key_serializer=self.key_serializer if self.key_column_type is None else None,
+                key_deserializer=self.key_deserializer if self.key_column_type is None else None,
+                value_serializer=self.value_serializer if self.value_column_type is None else None,
+                value_deserializer=self.value_deserializer if self.value_column_type is None else None,
                 persist=self.persist,
                 data=self,
+                key_column_type=self.key_column_type,
+                value_column_type=self.value_column_type,
+                compression=self.compression,
+                deduplicate=self.deduplicate,
+                key_hash=self.key_hash,
+                ordered=self.ordered,
             )
             tmp |= other
             return tmp
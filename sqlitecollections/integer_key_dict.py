@@ -0,0 +1,260 @@
+import sqlite3
+import sys
+from itertools import count
+from pickle import dumps, loads
+from typing import Any, Callable, Optional, Tuple, Union, cast
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable, Iterator, Mapping
+else:
+    from typing import Iterable, Iterator, Mapping
+
+from .base import VT, RebuildStrategy
+from .compression import Compression
+from .connection import ConnectionPool
+from .dict import Dict, _DictDatabaseDriver
+
+
+def _serialize_integer_key(key: Union[int, float]) -> int:
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if not isinstance(key, int):
+        raise TypeError(f"IntegerKeyDict keys must be int, not '{type(key).__name__}'")
+    if not -(2**63) <= key < 2**63:
+        raise OverflowError("IntegerKeyDict keys must fit in a signed 64-bit integer")
+    return int(key)
+
+
+def _deserialize_integer_key(serialized_key: int) -> int:
+    return serialized_key
+
+
+class _IntegerKeyDictDatabaseDriver(_DictDatabaseDriver):
+    partition_column = "serialized_key"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_key INTEGER PRIMARY KEY, serialized_value BLOB NOT NULL)"
+        )
+
+    @classmethod
+    def get_serialized_items(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Tuple[bytes, Any]]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(Tuple[bytes, Any], res)
+
+    @classmethod
+    def get_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def insert_serialized_value_by_serialized_key(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes, serialized_value: bytes
+    ) -> None:
+        cur.execute(
+            f"INSERT INTO {table_name} (serialized_key, serialized_value) VALUES (?, ?)",
+            (serialized_key, serialized_value),
+        )
+
+    @classmethod
+    def get_last_serialized_item(cls, table_name: str, cur: sqlite3.Cursor) -> Tuple[bytes, bytes]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key DESC LIMIT 1")
+        return cast(Tuple[bytes, bytes], cur.fetchone())
+
+    @classmethod
+    def get_reversed_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key DESC")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_serialized_keys_in_range(
+        cls,
+        table_name: str,
+        cur: sqlite3.Cursor,
+        minimum: Optional[int],
+        maximum: Optional[int],
+        inclusive: Tuple[bool, bool],
+        reverse: bool,
+    ) -> Iterable[int]:
+        conditions = []
+        params = []
+        if minimum is not None:
+            conditions.append("serialized_key >= ?" if inclusive[0] else "serialized_key > ?")
+            params.append(minimum)
+        if maximum is not None:
+            conditions.append("serialized_key <= ?" if inclusive[1] else "serialized_key < ?")
+            params.append(maximum)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        cur.execute(
+            f"SELECT serialized_key FROM {table_name} {where}ORDER BY serialized_key{' DESC' if reverse else ''}",
+            params,
+        )
+        for res in cur:
+            yield cast(int, res[0])
+
+
+class _OrderedIntegerKeyDictDatabaseDriver(_DictDatabaseDriver):
+    partition_column = "item_order"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_key INTEGER PRIMARY KEY, "
+            "serialized_value BLOB NOT NULL, "
+            "item_order INTEGER NOT NULL UNIQUE)"
+        )
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        orders = count()
+        for rows in cls.get_row_batches(table_name, cur, "serialized_key, serialized_value", order_column):
+            cur.executemany(
+                f"INSERT INTO {new_table_name} (serialized_key, serialized_value, item_order) VALUES (?, ?, ?)",
+                ((d[1], d[2], i) for d, i in zip(rows, orders)),
+            )
+
+
+_INTEGER_KEY_DICT_DRIVERS = {
+    "0": _IntegerKeyDictDatabaseDriver,
+    "0_ordered": _OrderedIntegerKeyDictDatabaseDriver,
+}
+
+
+class IntegerKeyDict(Dict[int, VT]):
+    _reference_fields = Dict._reference_fields + ("_ordered",)
+
+    def __init__(
+        self,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
+        table_name: Optional[str] = None,
+        value_serializer: Optional[Callable[[VT], bytes]] = None,
+        value_deserializer: Optional[Callable[[bytes], VT]] = None,
+        persist: bool = True,
+        rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
+        ordered: Optional[bool] = None,
+        data: Optional[Union[Iterable[Tuple[int, VT]], Mapping[int, VT]]] = None,
+        compression: Optional[Compression] = None,
+        temporary: bool = False,
+    ) -> None:
+        self._ordered = bool(ordered)
+        self._ordered_request = ordered
+        self._driver_class = _INTEGER_KEY_DICT_DRIVERS["0_ordered" if ordered else "0"]
+        super(IntegerKeyDict, self).__init__(
+            connection=connection,
+            table_name=table_name,
+            key_serializer=cast(Callable[[int], bytes], _serialize_integer_key),
+            key_deserializer=cast(Callable[[bytes], int], _deserialize_integer_key),
+            value_serializer=cast(Callable[[VT], bytes], dumps) if value_serializer is None else value_serializer,
+            value_deserializer=cast(Callable[[bytes], VT], loads) if value_deserializer is None else value_deserializer,
+            persist=persist,
+            rebuild_strategy=rebuild_strategy,
+            data=data,
+            compression=compression,
+            temporary=temporary,
+        )
+
+    @property
+    def ordered(self) -> bool:
+        return self._ordered
+
+    @property
+    def schema_version(self) -> str:
+        return "0_ordered" if self.ordered else "0"
+
+    def serialize_key(self, key: int) -> bytes:
+        return cast(bytes, _serialize_integer_key(key))
+
+    def _serialize_lookup_key(self, key: object) -> Optional[bytes]:
+        try:
+            return self.serialize_key(cast(int, key))
+        except (TypeError, OverflowError):
+            return None
+
+    def _migrate_schema(self, cur: sqlite3.Cursor) -> None:
+        stored = self._driver_class.get_schema_version(self.table_name, self.container_type_name, cur)
+        if stored is None:
+            return
+        self._ordered = stored == "0_ordered" if self._ordered_request is None else self._ordered_request
+        self._driver_class = _INTEGER_KEY_DICT_DRIVERS[self.schema_version]
+        if stored != self.schema_version:
+            self._driver_class.migrate_table(
+                self.table_name,
+                self.container_type_name,
+                self.schema_version,
+                cur,
+                _INTEGER_KEY_DICT_DRIVERS.get(stored, _IntegerKeyDictDatabaseDriver).partition_column,
+            )
+
+    def _rebuild_check_with_first_element(self) -> bool:
+        cur = self.connection.cursor()
+        cur.execute(f"SELECT serialized_value FROM {self.table_name} ORDER BY serialized_key")
+        for (serialized_value,) in cur:
+            if not self._is_large_value(serialized_value):
+                return cast(bool, serialized_value != self.serialize_value(self.deserialize_value(serialized_value)))
+        return False
+
+    def _do_rebuild(self) -> None:
+        cur = self.connection.cursor()
+        cur2 = self.connection.cursor()
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {self.table_name} ORDER BY serialized_key")
+        for serialized_key, serialized_value in cur:
+            if self._is_large_value(serialized_value):
+                continue
+            cur2.execute(
+                f"UPDATE {self.table_name} SET serialized_value=? WHERE serialized_key=?",
+                (self.serialize_value(self.deserialize_value(serialized_value)), serialized_key),
+            )
+
+    def _create_volatile_copy(
+        self,
+        data: Optional[Mapping[int, VT]] = None,
+    ) -> "IntegerKeyDict[VT]":
+        return IntegerKeyDict[VT](
+            connection=self._shared_connection,
+            value_serializer=self.value_serializer,
+            value_deserializer=self.value_deserializer,
+            rebuild_strategy=RebuildStrategy.SKIP,
+            persist=False,
+            ordered=self.ordered,
+            data=(self if data is None else data),
+            compression=self.compression,
+            temporary=self._connection_pool is None,
+        )
+
+    def irange(
+        self,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[int]:
+        cur = self.connection.cursor()
+        # Both layouts key the table by the integer itself, so the range query doesn't depend on the driver.
+        yield from _IntegerKeyDictDatabaseDriver.get_serialized_keys_in_range(
+            self.table_name, cur, minimum, maximum, inclusive, reverse
+        )
+
+    if sys.version_info >= (3, 9):
+
+        def __or__(self, other: Mapping[int, VT]) -> "IntegerKeyDict[VT]":
+            tmp = IntegerKeyDict[VT](
+                connection=self._shared_connection,
+                value_serializer=self.value_serializer,
+                value_deserializer=self.value_deserializer,
+                persist=self.persist,
+                ordered=self.ordered,
+                data=self,
+                compression=self.compression,
+            )
+            tmp.update(other)
+            return tmp
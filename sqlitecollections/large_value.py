@@ -0,0 +1,107 @@
+import io
+import sqlite3
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from .dict import _Dict
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class LargeValueReader(io.RawIOBase):
+    def __init__(self, connection: sqlite3.Connection, chunks: List[Tuple[int, int]]) -> None:
+        super(LargeValueReader, self).__init__()
+        self._connection = connection
+        self._chunks = chunks
+        self._chunk_index = 0
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_chunk(self, rowid: int, offset: int, size: int) -> bytes:
+        if hasattr(self._connection, "blobopen"):
+            with self._connection.blobopen("metadata_chunks", "data", rowid, readonly=True) as blob:
+                blob.seek(offset)
+                return blob.read(size)
+        cur = self._connection.cursor()
+        cur.execute("SELECT substr(data, ?, ?) FROM metadata_chunks WHERE rowid=?", (offset + 1, size, rowid))
+        return bytes(cur.fetchone()[0])
+
+    def readinto(self, buffer: Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        while self._chunk_index < len(self._chunks) and self._offset >= self._chunks[self._chunk_index][1]:
+            self._chunk_index += 1
+            self._offset = 0
+        if self._chunk_index >= len(self._chunks):
+            return 0
+        rowid, length = self._chunks[self._chunk_index]
+        view = memoryview(buffer).cast("B")
+        data = self._read_chunk(rowid, self._offset, min(len(view), length - self._offset))
+        view[: len(data)] = data
+        self._offset += len(data)
+        return len(data)
+
+
+class LargeValueWriter(io.RawIOBase):
+    def __init__(self, container: "_Dict[Any, Any]", serialized_key: bytes, chunk_size: int) -> None:
+        super(LargeValueWriter, self).__init__()
+        self._container = container
+        self._serialized_key = serialized_key
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._chunk_index = 0
+        self._value_id = container._begin_large_value()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        view = memoryview(data).cast("B")
+        self._buffer += view
+        while len(self._buffer) >= self._chunk_size:
+            self._write_chunk(bytes(self._buffer[: self._chunk_size]))
+            del self._buffer[: self._chunk_size]
+        return len(view)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self._container._write_large_value_chunk(self._value_id, self._chunk_index, data)
+        self._chunk_index += 1
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if len(self._buffer) > 0:
+                self._write_chunk(bytes(self._buffer))
+            self._container._commit_large_value(self._serialized_key, self._value_id)
+        finally:
+            super(LargeValueWriter, self).close()
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._container._discard_large_value(self._value_id)
+        finally:
+            super(LargeValueWriter, self).close()
+
+    def __del__(self) -> None:
+        # IOBase finalizes a file by closing it, which would store a partially written value as if it were complete.
+        if not self.closed and hasattr(self, "_value_id"):
+            self.abort()
+
+    def __exit__(
+        self,
+        exctype: Optional[Type[BaseException]],
+        excinst: Optional[BaseException],
+        exctb: Optional[TracebackType],
+    ) -> None:
+        if exctype is None:
+            self.close()
+        else:
+            self.abort()
@@ -9,7 +9,18 @@ else:
     from typing import Callable, Iterable, MutableSequence, Iterator
 
 from . import RebuildStrategy
-from .base import SqliteCollectionBase, T, _SqliteCollectionBaseDatabaseDriver
+from .base import (
+    ColumnType,
+    SqliteCollectionBase,
+    T,
+    _SqliteCollectionBaseDatabaseDriver,
+    materialize_iterators,
+    resolve_column_type,
+    serialize_lookup_value,
+    serialized_write,
+)
+from .compression import Compression
+from .connection import ConnectionPool
 
 
 def _generate_indices_from_slice(l: int, s: slice) -> Iterator[int]:
@@ -70,11 +81,16 @@ def _strict_zip(iter1: Iterable[Any], iter2: Iterable[Any]) -> Iterable[Tuple[An
 
 
 class _ListDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
+    partition_column = "item_index"
+
     @classmethod
     def do_create_table(
-        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
     ) -> None:
-        cur.execute(f"CREATE TABLE {table_name} (serialized_value BLOB, item_index INTEGER PRIMARY KEY)")
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} "
+            "(serialized_value BLOB, item_index INTEGER PRIMARY KEY)"
+        )
 
     @classmethod
     def get_max_index_plus_one(cls, table_name: str, cur: sqlite3.Cursor) -> int:
@@ -166,6 +182,19 @@ class _ListDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
         for d in cur:
             yield cast(bytes, d[0])
 
+    @classmethod
+    def is_all_native(cls, table_name: str, cur: sqlite3.Cursor) -> bool:
+        cur.execute(f"SELECT 1 FROM {table_name} WHERE typeof(serialized_value) IN ('blob', 'null') LIMIT 1")
+        return cur.fetchone() is None
+
+    @classmethod
+    def iter_indices_sorted_by_value(cls, table_name: str, cur: sqlite3.Cursor, reverse: bool) -> Iterable[int]:
+        cur.execute(
+            f"SELECT item_index FROM {table_name} ORDER BY serialized_value{' DESC' if reverse else ''}, item_index"
+        )
+        for d in cur:
+            yield cast(int, d[0])
+
     @classmethod
     def get_index_by_serialized_value_in_range(
         cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes, normalized_start: int, normalized_stop: int
@@ -204,17 +233,33 @@ class _ListDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
 
 class List(SqliteCollectionBase[T], MutableSequence[T]):
     _driver_class = _ListDatabaseDriver
+    _reference_fields = SqliteCollectionBase._reference_fields + ("_column_type",)
 
     def __init__(
         self,
-        connection: Optional[Union[str, sqlite3.Connection]] = None,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
         table_name: Optional[str] = None,
         serializer: Optional[Callable[[T], bytes]] = None,
         deserializer: Optional[Callable[[bytes], T]] = None,
         persist: bool = True,
         rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
         data: Optional[Iterable[T]] = None,
+        column_type: Optional[ColumnType] = None,
+        compression: Optional[Compression] = None,
+        deduplicate: bool = False,
+        temporary: bool = False,
     ) -> None:
+        if compression is not None and column_type is not None:
+            raise ValueError("compression can't be combined with column_type")
+        if deduplicate and column_type is not None:
+            raise ValueError("deduplicate can't be combined with column_type")
+        if deduplicate and compression is not None:
+            raise ValueError("deduplicate can't be combined with compression")
+        self._compression = None if compression is None else compression.validate()
+        self._deduplicate = deduplicate
+        self._temporary = temporary
+        self._column_type = column_type
+        serializer, deserializer = resolve_column_type(column_type, serializer, deserializer)
         super(List, self).__init__(
             connection=connection,
             table_name=table_name,
@@ -223,6 +268,7 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
             persist=persist,
             rebuild_strategy=rebuild_strategy,
         )
+        self._raw_values = self._is_raw(deserializer)
         if data is not None:
             self.clear()
             self.extend(data)
@@ -258,6 +304,25 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
     def schema_version(self) -> str:
         return "0"
 
+    @property
+    def column_type(self) -> Optional[ColumnType]:
+        return self._column_type
+
+    def serialize(self, x: T) -> bytes:
+        return self._encode_value(self.serializer(x))
+
+    def _serialize_lookup(self, x: object) -> Tuple[bytes, ...]:
+        serialized_value = serialize_lookup_value(self.serializer, x)
+        if serialized_value is None:
+            return ()
+        return self._encode_lookup_values(serialized_value)
+
+    def deserialize(self, blob: bytes) -> T:
+        if self._raw_values:
+            return cast(T, blob)
+        return self.deserializer(self._decode_value(blob))
+
+    @serialized_write
     def __delitem__(self, i: Union[int, slice]) -> None:
         cur = self.connection.cursor()
         cur2 = self.connection.cursor()
@@ -266,7 +331,6 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
             if deleted_index is None:
                 raise IndexError("list assignment index out of range")
             self._driver_class.tidy_indices(self.table_name, cur, cur2, deleted_index)
-            self.connection.commit()
             return
         reindexing_offset = None
         l = self._driver_class.get_max_index_plus_one(self.table_name, cur)
@@ -276,7 +340,6 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
                 reindexing_offset = idx
         if reindexing_offset is not None:
             self._driver_class.tidy_indices(self.table_name, cur, cur2, reindexing_offset)
-        self.connection.commit()
 
     @overload
     def __getitem__(self, i: int) -> T:
@@ -308,25 +371,32 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
 
     def _create_volatile_copy(self, data: Optional[Iterable[T]] = None) -> "List[T]":
         return List[T](
-            connection=self.connection,
-            serializer=self.serializer,
-            deserializer=self.deserializer,
+            connection=self._shared_connection,
+            serializer=self.serializer if self.column_type is None else None,
+            deserializer=self.deserializer if self.column_type is None else None,
             rebuild_strategy=RebuildStrategy.SKIP,
             persist=False,
             data=(self if data is None else data),
+            column_type=self.column_type,
+            compression=self.compression,
+            deduplicate=self.deduplicate,
+            temporary=self._connection_pool is None,
         )
 
     def copy(self) -> "List[T]":
         return self._create_volatile_copy()
 
     def __setitem__(self, i: Union[int, slice], v: Union[T, Iterable[T]]) -> None:
+        self._setitem(i, list(v) if isinstance(i, slice) and isinstance(v, Iterator) else v)
+
+    @serialized_write
+    def _setitem(self, i: Union[int, slice], v: Union[T, Iterable[T]]) -> None:
         cur = self.connection.cursor()
         if isinstance(i, int):
             if not self._driver_class.set_serialized_value_by_index(
                 self.table_name, cur, self.serialize(cast(T, v)), i
             ):
                 raise IndexError("list assignment index out of range")
-            self.connection.commit()
             return
         if not isinstance(v, Iterable):
             raise TypeError("must assign iterable to extended slice")
@@ -336,22 +406,28 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
             del self[i]
             for idx, d in enumerate(v):
                 self.insert(offset + idx, d)
-            self.connection.commit()
         else:
             try:
-                for idx, d in _strict_zip(_generate_indices_from_slice(l, i), v):
+                for idx, d in _strict_zip(_generate_indices_from_slice(l, i), iter(v)):
                     self._driver_class.set_serialized_value_by_index(self.table_name, cur, self.serialize(d), idx)
             except DifferentLengthDetected as e:
                 raise ValueError(
                     f"attempt to assign sequence of size {e.length2} to extended slice of size {e.length1}"
                 )
-            self.connection.commit()
         return
 
+    def __iter__(self) -> Iterator[T]:
+        cur = self.connection.cursor()
+        yield from self._iter_deserialized(
+            (self._decode_value(d) for d in self._driver_class.iter_serialized_value(self.table_name, cur)),
+            None if self._raw_values else self.deserializer,
+        )
+
     def __len__(self) -> int:
         cur = self.connection.cursor()
         return self._driver_class.get_max_index_plus_one(self.table_name, cur)
 
+    @serialized_write
     def insert(self, i: int, v: T) -> None:
         cur = self.connection.cursor()
         index_ = i
@@ -361,32 +437,33 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
         index_ = max(0, min(length, index_))
         self._driver_class.increment_indices(self.table_name, cur, index_)
         self._driver_class.add_record_by_serialized_value_and_index(self.table_name, cur, self.serialize(v), index_)
-        self.connection.commit()
 
     def __contains__(self, x: object) -> bool:
         cur = self.connection.cursor()
-        serialized_value = self.serialize(cast(T, x))
-        index = self._driver_class.get_index_by_serialized_value(self.table_name, cur, serialized_value)
-        return index != -1
+        return any(
+            self._driver_class.get_index_by_serialized_value(self.table_name, cur, d) != -1
+            for d in self._serialize_lookup(x)
+        )
 
+    @serialized_write
     def append(self, value: T) -> None:
         cur = self.connection.cursor()
         length = self._driver_class.get_max_index_plus_one(self.table_name, cur)
         self._driver_class.add_record_by_serialized_value_and_index(self.table_name, cur, self.serialize(value), length)
-        self.connection.commit()
 
+    @serialized_write
     def clear(self) -> None:
         cur = self.connection.cursor()
         self._driver_class.delete_all(self.table_name, cur)
-        self.connection.commit()
 
+    @materialize_iterators
+    @serialized_write
     def extend(self, values: Iterable[T]) -> None:
         cur = self.connection.cursor()
         idx = self._driver_class.get_max_index_plus_one(self.table_name, cur)
         for v in values:
             self._driver_class.add_record_by_serialized_value_and_index(self.table_name, cur, self.serialize(v), idx)
             idx += 1
-        self.connection.commit()
 
     def __iadd__(self, x: Iterable[T]) -> "List[T]":
         self.extend(x)
@@ -397,6 +474,7 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
         res += x
         return res
 
+    @serialized_write
     def __imul__(self, i: int) -> "List[T]":
         if not isinstance(i, int):
             raise TypeError(f"can't multiply sequence by non-int of type '{type(i).__name__}'")
@@ -415,7 +493,6 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
                 self._driver_class.add_record_by_serialized_value_and_index(
                     self.table_name, cur, serialized_value, m * original_length + j
                 )
-        self.connection.commit()
         return self
 
     def __mul__(self, i: int) -> "List[T]":
@@ -435,18 +512,22 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
             if length is None:
                 length = self._driver_class.get_max_index_plus_one(self.table_name, cur)
             stop_ = length + stop_
-        serialized_value = self.serialize(cast(T, value))
-        res = self._driver_class.get_index_by_serialized_value_in_range(
-            self.table_name, cur, serialized_value, start_, stop_
-        )
-        if res is None:
+        indices = [
+            self._driver_class.get_index_by_serialized_value_in_range(self.table_name, cur, d, start_, stop_)
+            for d in self._serialize_lookup(value)
+        ]
+        res = [d for d in indices if d is not None]
+        if len(res) == 0:
             raise ValueError(f"'{value}' is not in list")
-        return res
+        return min(res)
 
     def count(self, value: Any) -> int:
         cur = self.connection.cursor()
-        return self._driver_class.count_serialized_value(self.table_name, cur, self.serialize(cast(T, value)))
+        return sum(
+            self._driver_class.count_serialized_value(self.table_name, cur, d) for d in self._serialize_lookup(value)
+        )
 
+    @serialized_write
     def pop(self, index: int = -1) -> T:
         cur = self.connection.cursor()
         cur2 = self.connection.cursor()
@@ -459,34 +540,46 @@ class List(SqliteCollectionBase[T], MutableSequence[T]):
         if index_ < 0 or length <= index_:
             raise IndexError("pop index out of range")
         serialized_value = cast(bytes, self._driver_class.get_serialized_value_by_index(self.table_name, cur, index_))
+        value = self.deserialize(serialized_value)
         self._driver_class.delete_record_by_index(self.table_name, cur, index_)
         self._driver_class.tidy_indices(self.table_name, cur, cur2, index_)
-        self.connection.commit()
-        return self.deserialize(serialized_value)
+        return value
 
+    @serialized_write
     def sort(self, reverse: bool = False, key: Optional[Callable[[T], Any]] = None) -> None:
-        key_ = (lambda x: x) if key is None else key
         cur = self.connection.cursor()
+        if (
+            key is None
+            and self.column_type in (ColumnType.INTEGER, ColumnType.REAL, ColumnType.TEXT)
+            and self._driver_class.is_all_native(self.table_name, cur)
+        ):
+            indices_map = list(self._driver_class.iter_indices_sorted_by_value(self.table_name, cur, reverse))
+            self._driver_class.remap_index(self.table_name, cur, indices_map)
+            return
+        key_ = (lambda x: x) if key is None else key
         buf = [
             (key_(self.deserialize(v)), i)
             for i, v in enumerate(self._driver_class.iter_serialized_value(self.table_name, cur))
         ]
         buf.sort(key=lambda x: x[0], reverse=reverse)  # type: ignore
         self._driver_class.remap_index(self.table_name, cur, [i[1] for i in buf])
-        self.connection.commit()
 
+    @serialized_write
     def reverse(self) -> None:
         cur = self.connection.cursor()
         self._driver_class.reverse_indices(self.table_name, cur)
-        self.connection.commit()
 
+    @serialized_write
     def remove(self, value: T) -> None:
         cur = self.connection.cursor()
         cur2 = self.connection.cursor()
-        index = self._driver_class.get_index_by_serialized_value(self.table_name, cur, self.serialize(value))
+        indices = [
+            self._driver_class.get_index_by_serialized_value(self.table_name, cur, d)
+            for d in self._serialize_lookup(value)
+        ]
+        index = min((d for d in indices if d != -1), default=-1)
         if index == -1:
             raise ValueError(f"'{value}' is not in list")
         self._driver_class.delete_record_by_index(self.table_name, cur, index)
         self._driver_class.tidy_indices(self.table_name, cur, cur2, index)
-        self.connection.commit()
         return None
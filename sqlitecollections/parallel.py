@@ -0,0 +1,110 @@
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import reduce
+from typing import Any, Callable, List, Optional, Tuple, TypeVar, cast
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterator
+else:
+    from typing import Iterator
+
+_R = TypeVar("_R")
+_missing = object()
+
+
+class Partition:
+    def __init__(self, reference: Any, lower: Any, upper: Any) -> None:
+        self._reference = reference
+        self._lower = lower
+        self._upper = upper
+
+    @property
+    def lower(self) -> Any:
+        return self._lower
+
+    @property
+    def upper(self) -> Any:
+        return self._upper
+
+    def batches(self, batch_size: int = 1000) -> Iterator[List[Any]]:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        container = self._reference.open()
+        try:
+            cur = container.connection.cursor()
+            rows = container._driver_class.get_partition_rows(container.table_name, cur, self._lower, self._upper)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield [container._deserialize_partition_row(d) for d in batch]
+                    batch = []
+            if len(batch) > 0:
+                yield [container._deserialize_partition_row(d) for d in batch]
+        finally:
+            container.connection.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        for batch in self.batches():
+            yield from batch
+
+
+def partitions(container: Any, n: int) -> List[Partition]:
+    if n < 1:
+        raise ValueError("n must be positive")
+    reference = container._reference(True)
+    bounds = container._driver_class.get_partition_bounds(container.table_name, container.connection.cursor(), n)
+    return [Partition(reference, lower, upper) for lower, upper in zip([None] + bounds, bounds + [None])]
+
+
+def _map_partition(partition: Partition, fn: Callable[[Any], _R]) -> List[_R]:
+    return [fn(d) for batch in partition.batches() for d in batch]
+
+
+def _map_reduce_partition(
+    partition: Partition, mapper: Callable[[Any], _R], reducer: Callable[[_R, _R], _R]
+) -> Tuple[bool, Any]:
+    res: Any = _missing
+    for batch in partition.batches():
+        mapped = [mapper(d) for d in batch]
+        res = reduce(reducer, mapped) if res is _missing else reduce(reducer, mapped, res)
+    return (res is not _missing, res)
+
+
+def _default_workers(workers: Optional[int]) -> int:
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    return workers
+
+
+def parallel_map(container: Any, fn: Callable[[Any], _R], workers: Optional[int] = None) -> List[_R]:
+    workers = _default_workers(workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_map_partition, d, fn) for d in partitions(container, workers)]
+        return [d for future in futures for d in future.result()]
+
+
+def map_reduce(
+    container: Any,
+    mapper: Callable[[Any], _R],
+    reducer: Callable[[_R, _R], _R],
+    initial: Any = _missing,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> _R:
+    workers = _default_workers(workers)
+    owned = executor is None
+    pool = ProcessPoolExecutor(max_workers=workers) if executor is None else executor
+    try:
+        futures = [pool.submit(_map_reduce_partition, d, mapper, reducer) for d in partitions(container, workers)]
+        results: List[_R] = [res for ok, res in (future.result() for future in futures) if ok]
+    finally:
+        if owned:
+            pool.shutdown()
+    if initial is not _missing:
+        return reduce(reducer, results, cast(_R, initial))
+    if len(results) == 0:
+        raise TypeError("map_reduce() of empty container with no initial value")
+    return reduce(reducer, results)
@@ -0,0 +1,216 @@
+import math
+import sqlite3
+import sys
+from typing import Callable, List, Optional, Tuple, Union, cast
+from uuid import uuid4
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Collection, Iterable, Iterator
+else:
+    from typing import Collection, Iterable, Iterator
+
+from .base import (
+    RebuildStrategy,
+    SqliteCollectionBase,
+    T,
+    _SqliteCollectionBaseDatabaseDriver,
+    materialize_iterators,
+    serialized_write,
+)
+from .connection import ConnectionPool
+
+
+class _PriorityQueueDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
+    partition_column = "sequence"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "sequence INTEGER PRIMARY KEY, priority REAL NOT NULL, serialized_value BLOB NOT NULL)"
+        )
+        cls.create_priority_index(table_name, cur)
+
+    @classmethod
+    def create_priority_index(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"CREATE INDEX {table_name}_priority ON {table_name} (priority, sequence)")
+
+    @classmethod
+    def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_PriorityQueueDatabaseDriver, cls).alter_table_name(table_name, new_table_name, cur)
+        cur.execute(f"DROP INDEX {table_name}_priority")
+        cls.create_priority_index(new_table_name, cur)
+
+    @classmethod
+    def delete_all(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"DELETE FROM {table_name}")
+
+    @classmethod
+    def insert(cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes, priority: float) -> None:
+        cur.execute(
+            f"INSERT INTO {table_name} (priority, serialized_value) VALUES (?, ?)", (priority, serialized_value)
+        )
+
+    @classmethod
+    def insert_many(cls, table_name: str, cur: sqlite3.Cursor, data: Iterable[Tuple[float, bytes]]) -> None:
+        cur.executemany(f"INSERT INTO {table_name} (priority, serialized_value) VALUES (?, ?)", data)
+
+    @classmethod
+    def delete_by_sequence(cls, table_name: str, cur: sqlite3.Cursor, sequence: int) -> None:
+        cur.execute(f"DELETE FROM {table_name} WHERE sequence=?", (sequence,))
+
+    @classmethod
+    def get_count(cls, table_name: str, cur: sqlite3.Cursor) -> int:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def is_serialized_value_in(cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes) -> bool:
+        cur.execute(f"SELECT 1 FROM {table_name} WHERE serialized_value=? LIMIT 1", (serialized_value,))
+        return cur.fetchone() is not None
+
+    @classmethod
+    def get_first(cls, table_name: str, cur: sqlite3.Cursor) -> Union[None, Tuple[int, float, bytes]]:
+        cur.execute(
+            f"SELECT sequence, priority, serialized_value FROM {table_name} ORDER BY priority, sequence LIMIT 1"
+        )
+        return cast(Union[None, Tuple[int, float, bytes]], cur.fetchone())
+
+    @classmethod
+    def get_serialized_values(
+        cls, table_name: str, cur: sqlite3.Cursor, limit: Optional[int] = None
+    ) -> Iterable[bytes]:
+        if limit is None:
+            cur.execute(f"SELECT serialized_value FROM {table_name} ORDER BY priority, sequence")
+        else:
+            cur.execute(f"SELECT serialized_value FROM {table_name} ORDER BY priority, sequence LIMIT ?", (limit,))
+        for res in cur:
+            yield cast(bytes, res[0])
+
+
+class PriorityQueue(SqliteCollectionBase[T], Collection[T]):
+    _driver_class = _PriorityQueueDatabaseDriver
+
+    def __init__(
+        self,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
+        table_name: Optional[str] = None,
+        serializer: Optional[Callable[[T], bytes]] = None,
+        deserializer: Optional[Callable[[bytes], T]] = None,
+        persist: bool = True,
+        rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
+        data: Optional[Iterable[Tuple[T, float]]] = None,
+    ) -> None:
+        super(PriorityQueue, self).__init__(
+            connection=connection,
+            table_name=table_name,
+            serializer=serializer,
+            deserializer=deserializer,
+            persist=persist,
+            rebuild_strategy=rebuild_strategy,
+        )
+        if data is not None:
+            self.clear()
+            self.push_many(data)
+
+    @property
+    def schema_version(self) -> str:
+        return "0"
+
+    def _rebuild_check_with_first_element(self) -> bool:
+        cur = self.connection.cursor()
+        cur.execute(f"SELECT serialized_value FROM {self.table_name} LIMIT 1")
+        res = cur.fetchone()
+        if res is None:
+            return False
+        serialized_value = cast(bytes, res[0])
+        return serialized_value != self.serialize(self.deserialize(serialized_value))
+
+    def _do_rebuild(self) -> None:
+        cur = self.connection.cursor()
+        backup_table_name = f'bk_{self.container_type_name}_{str(uuid4()).replace("-", "")}'
+        cur.execute(f"CREATE TABLE {backup_table_name} AS SELECT * FROM {self.table_name}")
+        cur.execute(f"DELETE FROM {self.table_name}")
+        iter_old_records = self.connection.cursor()
+        iter_old_records.execute(f"SELECT sequence, priority, serialized_value FROM {backup_table_name}")
+        insert_new_records = self.connection.cursor()
+        for d in iter_old_records:
+            insert_new_records.execute(
+                f"INSERT INTO {self.table_name} (sequence, priority, serialized_value) VALUES (?, ?, ?)",
+                (d[0], d[1], self.serialize(self.deserialize(d[2]))),
+            )
+        cur.execute(f"DROP TABLE {backup_table_name}")
+
+    def _validate_priority(self, priority: float) -> float:
+        if not isinstance(priority, (int, float)) or isinstance(priority, bool):
+            raise TypeError(f"priority must be a real number, not '{type(priority).__name__}'")
+        if math.isnan(priority):
+            raise ValueError("priority must not be nan")
+        return float(priority)
+
+    def __contains__(self, value: object) -> bool:
+        cur = self.connection.cursor()
+        return self._driver_class.is_serialized_value_in(self.table_name, cur, self.serialize(cast(T, value)))
+
+    def __iter__(self) -> Iterator[T]:
+        cur = self.connection.cursor()
+        for d in self._driver_class.get_serialized_values(self.table_name, cur):
+            yield self.deserialize(d)
+
+    def __len__(self) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.get_count(self.table_name, cur)
+
+    @serialized_write
+    def push(self, item: T, priority: float = 0.0) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.insert(self.table_name, cur, self.serialize(item), self._validate_priority(priority))
+
+    @materialize_iterators
+    @serialized_write
+    def push_many(self, data: Iterable[Tuple[T, float]]) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.insert_many(
+            self.table_name, cur, ((self._validate_priority(p), self.serialize(d)) for d, p in data)
+        )
+
+    def peek(self) -> T:
+        cur = self.connection.cursor()
+        res = self._driver_class.get_first(self.table_name, cur)
+        if res is None:
+            raise IndexError("peek from an empty priority queue")
+        return self.deserialize(res[2])
+
+    @serialized_write
+    def pop(self) -> T:
+        cur = self.connection.cursor()
+        res = self._driver_class.get_first(self.table_name, cur)
+        if res is None:
+            raise IndexError("pop from an empty priority queue")
+        self._driver_class.delete_by_sequence(self.table_name, cur, res[0])
+        return self.deserialize(res[2])
+
+    @serialized_write
+    def pushpop(self, item: T, priority: float = 0.0) -> T:
+        priority = self._validate_priority(priority)
+        serialized_item = self.serialize(item)
+        cur = self.connection.cursor()
+        res = self._driver_class.get_first(self.table_name, cur)
+        if res is None or priority < res[1]:
+            return item
+        self._driver_class.delete_by_sequence(self.table_name, cur, res[0])
+        self._driver_class.insert(self.table_name, cur, serialized_item, priority)
+        return self.deserialize(res[2])
+
+    def nsmallest(self, k: int) -> List[T]:
+        if k <= 0:
+            return []
+        cur = self.connection.cursor()
+        return [self.deserialize(d) for d in self._driver_class.get_serialized_values(self.table_name, cur, k)]
+
+    @serialized_write
+    def clear(self) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.delete_all(self.table_name, cur)
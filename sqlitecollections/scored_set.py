@@ -0,0 +1,308 @@
+import math
+import sqlite3
+import sys
+from typing import Any, Callable, Optional, Tuple, Union, cast
+from uuid import uuid4
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Collection, Iterable, Iterator, Mapping
+else:
+    from typing import Collection, Iterable, Iterator, Mapping
+
+from .base import (
+    RebuildStrategy,
+    SqliteCollectionBase,
+    T,
+    _SqliteCollectionBaseDatabaseDriver,
+    is_hashable,
+    materialize_iterators,
+    serialized_write,
+)
+from .connection import ConnectionPool
+
+
+class _ScoredSetDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
+    partition_value_columns = "serialized_member"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_member BLOB NOT NULL UNIQUE, score REAL NOT NULL)"
+        )
+        cls.create_score_index(table_name, cur)
+
+    @classmethod
+    def create_score_index(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"CREATE INDEX {table_name}_score ON {table_name} (score, serialized_member)")
+
+    @classmethod
+    def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_ScoredSetDatabaseDriver, cls).alter_table_name(table_name, new_table_name, cur)
+        cur.execute(f"DROP INDEX {table_name}_score")
+        cls.create_score_index(new_table_name, cur)
+
+    @classmethod
+    def delete_all(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"DELETE FROM {table_name}")
+
+    @classmethod
+    def get_score(cls, table_name: str, cur: sqlite3.Cursor, serialized_member: bytes) -> Union[None, float]:
+        cur.execute(f"SELECT score FROM {table_name} WHERE serialized_member=?", (serialized_member,))
+        res = cur.fetchone()
+        if res is None:
+            return None
+        return cast(float, res[0])
+
+    @classmethod
+    def upsert(cls, table_name: str, cur: sqlite3.Cursor, serialized_member: bytes, score: float) -> None:
+        cur.execute(f"UPDATE {table_name} SET score=? WHERE serialized_member=?", (score, serialized_member))
+        if cur.rowcount == 0:
+            cur.execute(
+                f"INSERT INTO {table_name} (serialized_member, score) VALUES (?, ?)", (serialized_member, score)
+            )
+
+    @classmethod
+    def delete_by_serialized_member(cls, table_name: str, cur: sqlite3.Cursor, serialized_member: bytes) -> int:
+        cur.execute(f"DELETE FROM {table_name} WHERE serialized_member=?", (serialized_member,))
+        return cur.rowcount
+
+    @classmethod
+    def get_count(cls, table_name: str, cur: sqlite3.Cursor) -> int:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def count_before(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_member: bytes, score: float, reverse: bool
+    ) -> int:
+        op = ">" if reverse else "<"
+        cur.execute(
+            f"SELECT COUNT(*) FROM {table_name} WHERE score {op} ? OR (score = ? AND serialized_member {op} ?)",
+            (score, score, serialized_member),
+        )
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_serialized_members_and_scores(
+        cls,
+        table_name: str,
+        cur: sqlite3.Cursor,
+        minimum: Optional[float],
+        maximum: Optional[float],
+        inclusive: Tuple[bool, bool],
+        reverse: bool,
+    ) -> Iterable[Tuple[bytes, float]]:
+        conditions = []
+        params = []
+        if minimum is not None:
+            conditions.append("score >= ?" if inclusive[0] else "score > ?")
+            params.append(minimum)
+        if maximum is not None:
+            conditions.append("score <= ?" if inclusive[1] else "score < ?")
+            params.append(maximum)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        direction = " DESC" if reverse else ""
+        cur.execute(
+            f"SELECT serialized_member, score FROM {table_name} {where}"
+            f"ORDER BY score{direction}, serialized_member{direction}",
+            params,
+        )
+        for res in cur:
+            yield cast(Tuple[bytes, float], res)
+
+    @classmethod
+    def get_first_serialized_member_and_score(
+        cls, table_name: str, cur: sqlite3.Cursor, reverse: bool
+    ) -> Union[None, Tuple[bytes, float]]:
+        direction = " DESC" if reverse else ""
+        cur.execute(
+            f"SELECT serialized_member, score FROM {table_name} "
+            f"ORDER BY score{direction}, serialized_member{direction} LIMIT 1"
+        )
+        return cast(Union[None, Tuple[bytes, float]], cur.fetchone())
+
+
+class ScoredSet(SqliteCollectionBase[T], Collection[T]):
+    _driver_class = _ScoredSetDatabaseDriver
+
+    def __init__(
+        self,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
+        table_name: Optional[str] = None,
+        serializer: Optional[Callable[[T], bytes]] = None,
+        deserializer: Optional[Callable[[bytes], T]] = None,
+        persist: bool = True,
+        rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
+        data: Optional[Union[Iterable[Tuple[T, float]], Mapping[T, float]]] = None,
+        temporary: bool = False,
+    ) -> None:
+        self._temporary = temporary
+        super(ScoredSet, self).__init__(
+            connection=connection,
+            table_name=table_name,
+            serializer=serializer,
+            deserializer=deserializer,
+            persist=persist,
+            rebuild_strategy=rebuild_strategy,
+        )
+        if data is not None:
+            self.clear()
+            self.update(data)
+
+    @property
+    def schema_version(self) -> str:
+        return "0"
+
+    def _rebuild_check_with_first_element(self) -> bool:
+        cur = self.connection.cursor()
+        cur.execute(f"SELECT serialized_member FROM {self.table_name} LIMIT 1")
+        res = cur.fetchone()
+        if res is None:
+            return False
+        serialized_member = cast(bytes, res[0])
+        return serialized_member != self.serialize(self.deserialize(serialized_member))
+
+    def _do_rebuild(self) -> None:
+        cur = self.connection.cursor()
+        backup_table_name = f'bk_{self.container_type_name}_{str(uuid4()).replace("-", "")}'
+        cur.execute(f"CREATE TABLE {backup_table_name} AS SELECT * FROM {self.table_name}")
+        cur.execute(f"DELETE FROM {self.table_name}")
+        iter_old_records = self.connection.cursor()
+        iter_old_records.execute(f"SELECT serialized_member, score FROM {backup_table_name}")
+        insert_new_records = self.connection.cursor()
+        for d in iter_old_records:
+            insert_new_records.execute(
+                f"INSERT INTO {self.table_name} (serialized_member, score) VALUES (?, ?)",
+                (self.serialize(self.deserialize(d[0])), d[1]),
+            )
+        cur.execute(f"DROP TABLE {backup_table_name}")
+
+    def serialize(self, value: T) -> bytes:
+        if not is_hashable(value):
+            raise TypeError(f"unhashable type: '{type(value).__name__}'")
+        return self.serializer(value)
+
+    def _validate_score(self, score: float) -> float:
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            raise TypeError(f"score must be a real number, not '{type(score).__name__}'")
+        if math.isnan(score):
+            raise ValueError("score must not be nan")
+        return float(score)
+
+    def __contains__(self, value: object) -> bool:
+        cur = self.connection.cursor()
+        return self._driver_class.get_score(self.table_name, cur, self.serialize(cast(T, value))) is not None
+
+    def __iter__(self) -> Iterator[T]:
+        for d, _ in self.range_by_score(with_scores=True):
+            yield d
+
+    def __len__(self) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.get_count(self.table_name, cur)
+
+    @serialized_write
+    def add(self, member: T, score: float) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.upsert(self.table_name, cur, self.serialize(member), self._validate_score(score))
+
+    @materialize_iterators
+    @serialized_write
+    def update(self, data: Union[Iterable[Tuple[T, float]], Mapping[T, float]]) -> None:
+        cur = self.connection.cursor()
+        items = data.items() if isinstance(data, Mapping) else data
+        for member, score in items:
+            self._driver_class.upsert(self.table_name, cur, self.serialize(member), self._validate_score(score))
+
+    def score(self, member: T) -> float:
+        cur = self.connection.cursor()
+        res = self._driver_class.get_score(self.table_name, cur, self.serialize(member))
+        if res is None:
+            raise KeyError(member)
+        return res
+
+    @serialized_write
+    def incr_score(self, member: T, amount: float = 1.0) -> float:
+        amount = self._validate_score(amount)
+        serialized_member = self.serialize(member)
+        cur = self.connection.cursor()
+        current = self._driver_class.get_score(self.table_name, cur, serialized_member)
+        score = self._validate_score(amount if current is None else current + amount)
+        self._driver_class.upsert(self.table_name, cur, serialized_member, score)
+        return score
+
+    def rank(self, member: T, reverse: bool = False) -> int:
+        serialized_member = self.serialize(member)
+        cur = self.connection.cursor()
+        score = self._driver_class.get_score(self.table_name, cur, serialized_member)
+        if score is None:
+            raise KeyError(member)
+        return self._driver_class.count_before(self.table_name, cur, serialized_member, score, reverse)
+
+    def range_by_score(
+        self,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+        with_scores: bool = False,
+    ) -> Iterator[Any]:
+        cur = self.connection.cursor()
+        for serialized_member, score in self._driver_class.get_serialized_members_and_scores(
+            self.table_name, cur, minimum, maximum, inclusive, reverse
+        ):
+            if with_scores:
+                yield (self.deserialize(serialized_member), score)
+            else:
+                yield self.deserialize(serialized_member)
+
+    def items(self) -> Iterator[Tuple[T, float]]:
+        return cast(Iterator[Tuple[T, float]], self.range_by_score(with_scores=True))
+
+    @serialized_write
+    def _pop(self, reverse: bool) -> Tuple[T, float]:
+        cur = self.connection.cursor()
+        res = self._driver_class.get_first_serialized_member_and_score(self.table_name, cur, reverse)
+        if res is None:
+            raise KeyError("'pop from an empty set'")
+        self._driver_class.delete_by_serialized_member(self.table_name, cur, res[0])
+        return (self.deserialize(res[0]), res[1])
+
+    def pop_min(self) -> Tuple[T, float]:
+        return self._pop(reverse=False)
+
+    def pop_max(self) -> Tuple[T, float]:
+        return self._pop(reverse=True)
+
+    @serialized_write
+    def discard(self, member: T) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.delete_by_serialized_member(self.table_name, cur, self.serialize(member))
+
+    @serialized_write
+    def remove(self, member: T) -> None:
+        cur = self.connection.cursor()
+        if self._driver_class.delete_by_serialized_member(self.table_name, cur, self.serialize(member)) == 0:
+            raise KeyError(member)
+
+    @serialized_write
+    def clear(self) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.delete_all(self.table_name, cur)
+
+    def _create_volatile_copy(self) -> "ScoredSet[T]":
+        return ScoredSet[T](
+            connection=self._shared_connection,
+            serializer=self.serializer,
+            deserializer=self.deserializer,
+            rebuild_strategy=RebuildStrategy.SKIP,
+            persist=False,
+            data=self.items(),
+            temporary=self._connection_pool is None,
+        )
+
+    def copy(self) -> "ScoredSet[T]":
+        return self._create_volatile_copy()
@@ -12,20 +12,27 @@ from . import RebuildStrategy
 from .base import (
     _S,
     _T,
+    ColumnType,
     SqliteCollectionBase,
     T,
     TemporaryTableContext,
     _SqliteCollectionBaseDatabaseDriver,
+    hash_serialized_key,
     is_hashable,
+    materialize_iterators,
+    resolve_column_type,
+    serialize_lookup_value,
+    serialized_write,
 )
+from .connection import ConnectionPool
 
 
 class _SetDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
     @classmethod
     def do_create_table(
-        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
     ) -> None:
-        cur.execute(f"CREATE TABLE {table_name} (serialized_value BLOB PRIMARY KEY)")
+        cur.execute(f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} (serialized_value BLOB PRIMARY KEY)")
 
     @classmethod
     def delete_all(cls, table_name: str, cur: sqlite3.Cursor) -> None:
@@ -104,6 +111,10 @@ class _SetDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
                 else:
                     cls.insert(table_name, cur, serialized_value)
 
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        cur.execute(f"INSERT INTO {new_table_name} (serialized_value) SELECT serialized_value FROM {table_name}")
+
     @classmethod
     def is_proper_superset(
         cls, table_name: str, cur: sqlite3.Cursor, cur2: sqlite3.Cursor, data: Iterable[bytes]
@@ -129,19 +140,124 @@ class _SetDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
             return is_proper and cls.get_count(temp_table_name, cur2) == cls.get_count(table_name, cur2)
 
 
+class _HashedSetDatabaseDriver(_SetDatabaseDriver):
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "serialized_value BLOB NOT NULL, "
+            "item_id INTEGER PRIMARY KEY, "
+            "key_hash INTEGER NOT NULL)"
+        )
+        cls.create_key_hash_index(table_name, cur)
+
+    @classmethod
+    def create_key_hash_index(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"CREATE INDEX {table_name}_key_hash ON {table_name} (key_hash)")
+
+    @classmethod
+    def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_HashedSetDatabaseDriver, cls).alter_table_name(table_name, new_table_name, cur)
+        cur.execute(f"DROP INDEX {table_name}_key_hash")
+        cls.create_key_hash_index(new_table_name, cur)
+
+    @classmethod
+    def insert(cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes) -> None:
+        cur.execute(
+            f"INSERT INTO {table_name} (serialized_value, key_hash) VALUES (?, ?)",
+            (serialized_value, hash_serialized_key(serialized_value)),
+        )
+
+    @classmethod
+    def delete_by_serialized_value(cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes) -> None:
+        cur.execute(
+            f"DELETE FROM {table_name} WHERE key_hash=? AND serialized_value=?",
+            (hash_serialized_key(serialized_value), serialized_value),
+        )
+
+    @classmethod
+    def is_serialized_value_in(cls, table_name: str, cur: sqlite3.Cursor, serialized_value: bytes) -> bool:
+        cur.execute(
+            f"SELECT 1 FROM {table_name} WHERE key_hash=? AND serialized_value=?",
+            (hash_serialized_key(serialized_value), serialized_value),
+        )
+        return len(list(cur)) > 0
+
+    @classmethod
+    def intersection_update_single(cls, table_name: str, cur: sqlite3.Cursor, data: Iterable[bytes]) -> None:
+        with TemporaryTableContext(cur, table_name) as temp_table_name:
+            for d in data:
+                cls.upsert(temp_table_name, cur, d)
+            cur.execute(
+                f"DELETE FROM {table_name} WHERE NOT EXISTS (SELECT 1 FROM {temp_table_name} "
+                f"WHERE {table_name}.key_hash = {temp_table_name}.key_hash "
+                f"AND {table_name}.serialized_value = {temp_table_name}.serialized_value)"
+            )
+
+    @classmethod
+    def copy_rows(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor, order_column: str) -> None:
+        for rows in cls.get_row_batches(table_name, cur, "serialized_value", order_column):
+            cur.executemany(
+                f"INSERT INTO {new_table_name} (serialized_value, key_hash) VALUES (?, ?)",
+                ((d[1], hash_serialized_key(d[1])) for d in rows),
+            )
+
+
+class _WithoutRowidSetDatabaseDriver(_SetDatabaseDriver):
+    partition_column = "serialized_value"
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} (serialized_value BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+
+
+_SET_DRIVERS = {
+    "0": _SetDatabaseDriver,
+    "0_key_hash": _HashedSetDatabaseDriver,
+    "0_without_rowid": _WithoutRowidSetDatabaseDriver,
+}
+
+
 class Set(SqliteCollectionBase[T], MutableSet[T]):
     _driver_class = _SetDatabaseDriver
+    _reference_fields = SqliteCollectionBase._reference_fields + ("_column_type",)
 
     def __init__(
         self,
-        connection: Optional[Union[str, sqlite3.Connection]] = None,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
         table_name: Optional[str] = None,
         serializer: Optional[Callable[[T], bytes]] = None,
         deserializer: Optional[Callable[[bytes], T]] = None,
         persist: bool = True,
         rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
         data: Optional[Iterable[T]] = None,
+        column_type: Optional[ColumnType] = None,
+        bloom_filter: bool = False,
+        key_hash: Optional[bool] = None,
+        without_rowid: Optional[bool] = None,
+        temporary: bool = False,
     ) -> None:
+        if bloom_filter and column_type is not None:
+            raise ValueError("bloom_filter can't be combined with column_type")
+        if key_hash and column_type is not None:
+            raise ValueError("key_hash can't be combined with column_type")
+        if key_hash and without_rowid:
+            raise ValueError("key_hash can't be combined with without_rowid")
+        self._bloom_filter_enabled = bloom_filter
+        self._schema_request = (key_hash, without_rowid)
+        self._temporary = temporary
+        if key_hash:
+            self._driver_class = _HashedSetDatabaseDriver
+        elif without_rowid:
+            self._driver_class = _WithoutRowidSetDatabaseDriver
+        self._column_type = column_type
+        serializer, deserializer = resolve_column_type(column_type, serializer, deserializer)
         super(Set, self).__init__(
             connection=connection,
             table_name=table_name,
@@ -150,19 +266,24 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
             persist=persist,
             rebuild_strategy=rebuild_strategy,
         )
+        self._raw_values = self._is_raw(deserializer)
         if data is not None:
             self.clear()
             self.update(data)
 
     def __contains__(self, value: object) -> bool:
         cur = self.connection.cursor()
-        serialized_value = self.serialize(cast(T, value))
+        serialized_value = self._serialize_lookup(value)
+        if serialized_value is None or not self._might_contain(serialized_value):
+            return False
         return self._driver_class.is_serialized_value_in(self.table_name, cur, serialized_value)
 
     def __iter__(self) -> Iterator[T]:
         cur = self.connection.cursor()
-        for d in self._driver_class.get_serialized_values(self.table_name, cur):
-            yield self.deserialize(d)
+        yield from self._iter_deserialized(
+            self._driver_class.get_serialized_values(self.table_name, cur),
+            None if self._raw_values else self.deserialize,
+        )
 
     def __len__(self) -> int:
         cur = self.connection.cursor()
@@ -178,10 +299,7 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
         delete_old_records = self.connection.cursor()
         insert_new_records = self.connection.cursor()
         for d in iter_old_records:
-            insert_new_records.execute(
-                f"INSERT INTO {self.table_name} (serialized_value) VALUES (?)",
-                (self.serialize(self.deserialize(d[0])),),
-            )
+            self._driver_class.insert(self.table_name, insert_new_records, self.serialize(self.deserialize(d[0])))
             delete_old_records.execute(f"DELETE FROM {backup_table_name} WHERE serialized_value = ?", d)
         cur.execute(f"DROP TABLE {backup_table_name}")
 
@@ -200,42 +318,86 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
             raise TypeError(f"unhashable type: '{type(value).__name__}'")
         return self.serializer(value)
 
+    def _serialize_lookup(self, value: object) -> Optional[bytes]:
+        return serialize_lookup_value(self.serialize, value)
+
+    @serialized_write
     def add(self, value: T) -> None:
         serialized_value = self.serialize(value)
         cur = self.connection.cursor()
-        self._driver_class.upsert(self.table_name, cur, serialized_value)
-        self.connection.commit()
+        self._driver_class.upsert(self.table_name, cur, self._add_to_bloom_filter(serialized_value))
+        self._invalidate_saved_bloom_filter(cur)
 
+    @serialized_write
     def clear(self) -> None:
         cur = self.connection.cursor()
         self._driver_class.delete_all(self.table_name, cur)
-        self.connection.commit()
 
+    @serialized_write
     def discard(self, value: T) -> None:
+        serialized_value = self._serialize_lookup(value)
+        if serialized_value is None:
+            return
         cur = self.connection.cursor()
-        self._driver_class.delete_by_serialized_value(self.table_name, cur, self.serialize(value))
-        self.connection.commit()
+        self._driver_class.delete_by_serialized_value(self.table_name, cur, serialized_value)
 
+    @serialized_write
     def remove(self, value: T) -> None:
         cur = self.connection.cursor()
-        serialized_value = self.serialize(value)
-        if not self._driver_class.is_serialized_value_in(self.table_name, cur, serialized_value):
+        serialized_value = self._serialize_lookup(value)
+        if serialized_value is None or not self._driver_class.is_serialized_value_in(
+            self.table_name, cur, serialized_value
+        ):
             raise KeyError(value)
         self._driver_class.delete_by_serialized_value(self.table_name, cur, serialized_value)
-        self.connection.commit()
 
+    @serialized_write
     def pop(self) -> T:
         cur = self.connection.cursor()
         serialized_value = self._driver_class.get_one_serialized_value(self.table_name, cur)
         if serialized_value is None:
             raise KeyError("'pop from an empty set'")
         self._driver_class.delete_by_serialized_value(self.table_name, cur, serialized_value)
-        self.connection.commit()
         return self.deserialize(serialized_value)
 
+    @property
+    def key_hash(self) -> bool:
+        return self._driver_class is _HashedSetDatabaseDriver
+
+    @property
+    def without_rowid(self) -> bool:
+        return self._driver_class is _WithoutRowidSetDatabaseDriver
+
     @property
     def schema_version(self) -> str:
-        return "0"
+        if self.key_hash:
+            return "0_key_hash"
+        return "0_without_rowid" if self.without_rowid else "0"
+
+    def _migrate_schema(self, cur: sqlite3.Cursor) -> None:
+        stored = self._driver_class.get_schema_version(self.table_name, self.container_type_name, cur)
+        if stored is None:
+            return
+        key_hash, without_rowid = self._schema_request
+        if key_hash is None:
+            key_hash = stored == "0_key_hash" and not without_rowid
+        if without_rowid is None:
+            without_rowid = stored == "0_without_rowid" and not key_hash
+        if key_hash and self.column_type is not None:
+            raise ValueError("key_hash can't be combined with column_type")
+        self._driver_class = _SET_DRIVERS["0_key_hash" if key_hash else "0_without_rowid" if without_rowid else "0"]
+        if stored != self.schema_version:
+            self._driver_class.migrate_table(
+                self.table_name,
+                self.container_type_name,
+                self.schema_version,
+                cur,
+                _SET_DRIVERS.get(stored, _SetDatabaseDriver).partition_column,
+            )
+
+    @property
+    def column_type(self) -> Optional[ColumnType]:
+        return self._column_type
 
     def issubset(self, other: Iterable[T]) -> bool:
         return len(self) == len(self.intersection(other))
@@ -259,16 +421,19 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
         res.intersection_update(*others)
         return res
 
+    @materialize_iterators
+    @serialized_write
     def intersection_update(self, *others: Iterable[T]) -> None:
         cur = self.connection.cursor()
         for other in others:
-            self._driver_class.intersection_update_single(self.table_name, cur, (self.serialize(d) for d in other))
-        self.connection.commit()
+            self._driver_class.intersection_update_single(
+                self.table_name, cur, (d for d in map(self._serialize_lookup, other) if d is not None)
+            )
 
     def issuperset(self, other: Iterable[T]) -> bool:
         cur = self.connection.cursor()
-        for d in other:
-            if not self._driver_class.is_serialized_value_in(self.table_name, cur, self.serialize(d)):
+        for d in map(self._serialize_lookup, other):
+            if d is None or not self._driver_class.is_serialized_value_in(self.table_name, cur, d):
                 return False
         return True
 
@@ -285,16 +450,20 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
         res.update(*others)
         return res
 
+    @materialize_iterators
+    @serialized_write
     def update(self, *others: Iterable[T]) -> None:
         cur = self.connection.cursor()
         for other in others:
-            self._driver_class.union_update_single(self.table_name, cur, (self.serialize(d) for d in other))
-        self.connection.commit()
+            self._driver_class.union_update_single(
+                self.table_name, cur, (self._add_to_bloom_filter(self.serialize(d)) for d in other)
+            )
+        self._invalidate_saved_bloom_filter(cur)
 
     def isdisjoint(self, other: Iterable[T]) -> bool:
         cur = self.connection.cursor()
-        for d in other:
-            if self._driver_class.is_serialized_value_in(self.table_name, cur, self.serialize(d)):
+        for d in map(self._serialize_lookup, other):
+            if d is not None and self._driver_class.is_serialized_value_in(self.table_name, cur, d):
                 return False
         return True
 
@@ -313,20 +482,27 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
         res.difference_update(*others)
         return res
 
+    @materialize_iterators
+    @serialized_write
     def difference_update(self, *others: Iterable[T]) -> None:
         cur = self.connection.cursor()
         for other in others:
-            self._driver_class.difference_update_single(self.table_name, cur, (self.serialize(d) for d in other))
-        self.connection.commit()
+            self._driver_class.difference_update_single(
+                self.table_name, cur, (d for d in map(self._serialize_lookup, other) if d is not None)
+            )
 
     def _create_volatile_copy(self, data: Optional[Iterable[T]] = None) -> "Set[T]":
         return Set[T](
-            connection=self.connection,
-            serializer=self.serializer,
-            deserializer=self.deserializer,
+            connection=self._shared_connection,
+            serializer=self.serializer if self.column_type is None else None,
+            deserializer=self.deserializer if self.column_type is None else None,
             rebuild_strategy=RebuildStrategy.SKIP,
             persist=False,
             data=data if data is not None else self,
+            column_type=self.column_type,
+            key_hash=self.key_hash,
+            without_rowid=self.without_rowid,
+            temporary=self._connection_pool is None,
         )
 
     def copy(self) -> "Set[T]":
@@ -340,14 +516,16 @@ class Set(SqliteCollectionBase[T], MutableSet[T]):
         res.symmetric_difference_update(*others)
         return res
 
+    @materialize_iterators
+    @serialized_write
     def symmetric_difference_update(self, *others: Iterable[T]) -> None:
         cur = self.connection.cursor()
         cur2 = self.connection.cursor()
         for other in others:
             self._driver_class.symmetric_difference_update_single(
-                self.table_name, cur, cur2, (self.serialize(d) for d in other)
+                self.table_name, cur, cur2, (self._add_to_bloom_filter(self.serialize(d)) for d in other)
             )
-        self.connection.commit()
+        self._invalidate_saved_bloom_filter(cur)
 
     def __xor__(self, s: AbstractSet[_T]) -> "Set[T]":
         return self.symmetric_difference(cast(Iterable[T], s))
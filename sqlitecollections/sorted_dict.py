@@ -0,0 +1,197 @@
+import sqlite3
+import sys
+from pickle import dumps, loads
+from typing import Any, Callable, Optional, Tuple, Union, cast
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable, Iterator, Mapping
+else:
+    from typing import Iterable, Iterator, Mapping
+
+from .base import KT, VT, RebuildStrategy
+from .codecs import dumps_ordered, dumps_ordered_prefix, loads_ordered, next_prefix
+from .compression import Compression
+from .connection import ConnectionPool
+from .dict import Dict, _DictDatabaseDriver
+
+
+class _SortedDictDatabaseDriver(_DictDatabaseDriver):
+    partition_column = "serialized_key"
+
+    @classmethod
+    def get_serialized_items(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[Tuple[bytes, Any]]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(Tuple[bytes, Any], res)
+
+    @classmethod
+    def get_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_last_serialized_item(cls, table_name: str, cur: sqlite3.Cursor) -> Tuple[bytes, bytes]:
+        cur.execute(f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key DESC LIMIT 1")
+        return cast(Tuple[bytes, bytes], cur.fetchone())
+
+    @classmethod
+    def get_reversed_serialized_keys(cls, table_name: str, cur: sqlite3.Cursor) -> Iterable[bytes]:
+        cur.execute(f"SELECT serialized_key FROM {table_name} ORDER BY serialized_key DESC")
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_serialized_keys_in_range(
+        cls,
+        table_name: str,
+        cur: sqlite3.Cursor,
+        lower: Optional[bytes],
+        upper: Optional[bytes],
+        inclusive: Tuple[bool, bool],
+        reverse: bool,
+    ) -> Iterable[bytes]:
+        conditions = []
+        params = []
+        if lower is not None:
+            conditions.append("serialized_key >= ?" if inclusive[0] else "serialized_key > ?")
+            params.append(lower)
+        if upper is not None:
+            conditions.append("serialized_key <= ?" if inclusive[1] else "serialized_key < ?")
+            params.append(upper)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        cur.execute(
+            f"SELECT serialized_key FROM {table_name} {where}ORDER BY serialized_key{' DESC' if reverse else ''}",
+            params,
+        )
+        for res in cur:
+            yield cast(bytes, res[0])
+
+    @classmethod
+    def get_serialized_item_by_position(
+        cls, table_name: str, cur: sqlite3.Cursor, index: int
+    ) -> Union[None, Tuple[bytes, bytes]]:
+        if index < 0:
+            cur.execute(
+                f"SELECT serialized_key, serialized_value FROM {table_name} "
+                "ORDER BY serialized_key DESC LIMIT 1 OFFSET ?",
+                (-index - 1,),
+            )
+        else:
+            cur.execute(
+                f"SELECT serialized_key, serialized_value FROM {table_name} ORDER BY serialized_key LIMIT 1 OFFSET ?",
+                (index,),
+            )
+        return cast(Union[None, Tuple[bytes, bytes]], cur.fetchone())
+
+    @classmethod
+    def count_serialized_keys_before(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_key: bytes, inclusive: bool
+    ) -> int:
+        cur.execute(
+            f"SELECT COUNT(*) FROM {table_name} WHERE serialized_key {'<=' if inclusive else '<'} ?",
+            (serialized_key,),
+        )
+        return cast(int, cur.fetchone()[0])
+
+
+class SortedDict(Dict[KT, VT]):
+    _driver_class = _SortedDictDatabaseDriver
+
+    def __init__(
+        self,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
+        table_name: Optional[str] = None,
+        value_serializer: Optional[Callable[[VT], bytes]] = None,
+        value_deserializer: Optional[Callable[[bytes], VT]] = None,
+        persist: bool = True,
+        rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
+        data: Optional[Union[Iterable[Tuple[KT, VT]], Mapping[KT, VT]]] = None,
+        compression: Optional[Compression] = None,
+        temporary: bool = False,
+    ) -> None:
+        super(SortedDict, self).__init__(
+            connection=connection,
+            table_name=table_name,
+            key_serializer=cast(Callable[[KT], bytes], dumps_ordered),
+            key_deserializer=cast(Callable[[bytes], KT], loads_ordered),
+            value_serializer=cast(Callable[[VT], bytes], dumps) if value_serializer is None else value_serializer,
+            value_deserializer=cast(Callable[[bytes], VT], loads) if value_deserializer is None else value_deserializer,
+            persist=persist,
+            rebuild_strategy=rebuild_strategy,
+            data=data,
+            compression=compression,
+            temporary=temporary,
+        )
+
+    def _create_volatile_copy(
+        self,
+        data: Optional[Mapping[KT, VT]] = None,
+    ) -> "SortedDict[KT, VT]":
+        return SortedDict[KT, VT](
+            connection=self._shared_connection,
+            value_serializer=self.value_serializer,
+            value_deserializer=self.value_deserializer,
+            rebuild_strategy=RebuildStrategy.SKIP,
+            persist=False,
+            data=(self if data is None else data),
+            compression=self.compression,
+            temporary=self._connection_pool is None,
+        )
+
+    def irange(
+        self,
+        minimum: Optional[KT] = None,
+        maximum: Optional[KT] = None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[KT]:
+        cur = self.connection.cursor()
+        serialized_keys = self._driver_class.get_serialized_keys_in_range(
+            self.table_name,
+            cur,
+            None if minimum is None else self.serialize_key(minimum),
+            None if maximum is None else self.serialize_key(maximum),
+            inclusive,
+            reverse,
+        )
+        yield from self._iter_deserialized(serialized_keys, self.deserialize_key)
+
+    def prefix(self, prefix: Any, reverse: bool = False) -> Iterator[KT]:
+        serialized_prefix = dumps_ordered_prefix(prefix)
+        cur = self.connection.cursor()
+        serialized_keys = self._driver_class.get_serialized_keys_in_range(
+            self.table_name, cur, serialized_prefix, next_prefix(serialized_prefix), (True, False), reverse
+        )
+        yield from self._iter_deserialized(serialized_keys, self.deserialize_key)
+
+    def peekitem(self, index: int = -1) -> Tuple[KT, VT]:
+        cur = self.connection.cursor()
+        serialized_item = self._driver_class.get_serialized_item_by_position(self.table_name, cur, index)
+        if serialized_item is None:
+            raise IndexError("list index out of range")
+        return (self.deserialize_key(serialized_item[0]), self.deserialize_value(serialized_item[1]))
+
+    def bisect_left(self, key: KT) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.count_serialized_keys_before(self.table_name, cur, self.serialize_key(key), False)
+
+    def bisect_right(self, key: KT) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.count_serialized_keys_before(self.table_name, cur, self.serialize_key(key), True)
+
+    bisect = bisect_right
+
+    if sys.version_info >= (3, 9):
+
+        def __or__(self, other: Mapping[KT, VT]) -> "SortedDict[KT, VT]":
+            tmp = SortedDict[KT, VT](
+                connection=self._shared_connection,
+                value_serializer=self.value_serializer,
+                value_deserializer=self.value_deserializer,
+                persist=self.persist,
+                data=self,
+                compression=self.compression,
+            )
+            tmp.update(other)
+            return tmp
@@ -0,0 +1,255 @@
+import sqlite3
+import sys
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union, cast
+from uuid import uuid4
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable, Sized
+else:
+    from typing import Iterable, Sized
+
+from .base import (
+    RebuildStrategy,
+    SqliteCollectionBase,
+    T,
+    _SqliteCollectionBaseDatabaseDriver,
+    materialize_iterators,
+    serialized_write,
+)
+from .connection import ConnectionPool
+
+_READY = 0
+_CLAIMED = 1
+
+
+class Job(NamedTuple):
+    job_id: int
+    payload: Any
+    lease: str
+    attempts: int
+
+
+class _WorkQueueDatabaseDriver(_SqliteCollectionBaseDatabaseDriver):
+    partition_column = "job_id"
+    partition_value_columns = "serialized_payload"
+
+    supports_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+    @classmethod
+    def do_create_table(
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
+    ) -> None:
+        cur.execute(
+            f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} ("
+            "job_id INTEGER PRIMARY KEY, "
+            "serialized_payload BLOB NOT NULL, "
+            "state INTEGER NOT NULL, "
+            "available_at REAL NOT NULL, "
+            "lease TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        cls.create_state_index(table_name, cur)
+
+    @classmethod
+    def create_state_index(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"CREATE INDEX {table_name}_state ON {table_name} (state, available_at)")
+
+    @classmethod
+    def alter_table_name(cls, table_name: str, new_table_name: str, cur: sqlite3.Cursor) -> None:
+        super(_WorkQueueDatabaseDriver, cls).alter_table_name(table_name, new_table_name, cur)
+        cur.execute(f"DROP INDEX {table_name}_state")
+        cls.create_state_index(new_table_name, cur)
+
+    @classmethod
+    def delete_all(cls, table_name: str, cur: sqlite3.Cursor) -> None:
+        cur.execute(f"DELETE FROM {table_name}")
+
+    @classmethod
+    def get_count(cls, table_name: str, cur: sqlite3.Cursor) -> int:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def get_count_by_state(cls, table_name: str, cur: sqlite3.Cursor, state: int) -> int:
+        cur.execute(f"SELECT COUNT(*) FROM {table_name} WHERE state=?", (state,))
+        return cast(int, cur.fetchone()[0])
+
+    @classmethod
+    def insert(cls, table_name: str, cur: sqlite3.Cursor, serialized_payload: bytes, available_at: float) -> int:
+        cur.execute(
+            f"INSERT INTO {table_name} (serialized_payload, state, available_at) VALUES (?, ?, ?)",
+            (serialized_payload, _READY, available_at),
+        )
+        return cast(int, cur.lastrowid)
+
+    @classmethod
+    def insert_many(
+        cls, table_name: str, cur: sqlite3.Cursor, serialized_payloads: Iterable[bytes], available_at: float
+    ) -> None:
+        cur.executemany(
+            f"INSERT INTO {table_name} (serialized_payload, state, available_at) VALUES (?, {_READY}, ?)",
+            ((d, available_at) for d in serialized_payloads),
+        )
+
+    @classmethod
+    def requeue_expired(cls, table_name: str, cur: sqlite3.Cursor, now: float) -> int:
+        cur.execute(
+            f"UPDATE {table_name} SET state=?, lease=NULL WHERE state=? AND available_at<=?",
+            (_READY, _CLAIMED, now),
+        )
+        return cur.rowcount
+
+    @classmethod
+    def claim(
+        cls, table_name: str, cur: sqlite3.Cursor, n: int, now: float, lease: str, lease_until: float
+    ) -> List[Tuple[int, bytes, int]]:
+        cls.requeue_expired(table_name, cur, now)
+        if cls.supports_returning:
+            cur.execute(
+                f"UPDATE {table_name} SET state=?, lease=?, available_at=?, attempts=attempts+1 "
+                f"WHERE job_id IN (SELECT job_id FROM {table_name} WHERE state=? AND available_at<=? "
+                "ORDER BY available_at, job_id LIMIT ?) "
+                "RETURNING job_id, serialized_payload, attempts",
+                (_CLAIMED, lease, lease_until, _READY, now, n),
+            )
+            return sorted(cast(List[Tuple[int, bytes, int]], cur.fetchall()))
+        cur.execute(
+            f"SELECT job_id FROM {table_name} WHERE state=? AND available_at<=? "
+            "ORDER BY available_at, job_id LIMIT ?",
+            (_READY, now, n),
+        )
+        job_ids = [cast(int, d[0]) for d in cur.fetchall()]
+        cur.executemany(
+            f"UPDATE {table_name} SET state=?, lease=?, available_at=?, attempts=attempts+1 WHERE job_id=?",
+            ((_CLAIMED, lease, lease_until, d) for d in job_ids),
+        )
+        if len(job_ids) == 0:
+            return []
+        cur.execute(
+            f"SELECT job_id, serialized_payload, attempts FROM {table_name} "
+            f"WHERE job_id IN ({', '.join('?' * len(job_ids))}) ORDER BY job_id",
+            job_ids,
+        )
+        return cast(List[Tuple[int, bytes, int]], cur.fetchall())
+
+    @classmethod
+    def delete_leased(cls, table_name: str, cur: sqlite3.Cursor, job_id: int, lease: str) -> bool:
+        cur.execute(f"DELETE FROM {table_name} WHERE job_id=? AND state=? AND lease=?", (job_id, _CLAIMED, lease))
+        return cur.rowcount > 0
+
+    @classmethod
+    def release_leased(cls, table_name: str, cur: sqlite3.Cursor, job_id: int, lease: str, available_at: float) -> bool:
+        cur.execute(
+            f"UPDATE {table_name} SET state=?, lease=NULL, available_at=? WHERE job_id=? AND state=? AND lease=?",
+            (_READY, available_at, job_id, _CLAIMED, lease),
+        )
+        return cur.rowcount > 0
+
+
+class WorkQueue(SqliteCollectionBase[T], Sized):
+    _driver_class = _WorkQueueDatabaseDriver
+
+    def __init__(
+        self,
+        connection: Optional[Union[str, sqlite3.Connection, ConnectionPool]] = None,
+        table_name: Optional[str] = None,
+        serializer: Optional[Callable[[T], bytes]] = None,
+        deserializer: Optional[Callable[[bytes], T]] = None,
+        persist: bool = True,
+        rebuild_strategy: RebuildStrategy = RebuildStrategy.CHECK_WITH_FIRST_ELEMENT,
+        data: Optional[Iterable[T]] = None,
+    ) -> None:
+        super(WorkQueue, self).__init__(
+            connection=connection,
+            table_name=table_name,
+            serializer=serializer,
+            deserializer=deserializer,
+            persist=persist,
+            rebuild_strategy=rebuild_strategy,
+        )
+        if data is not None:
+            self.clear()
+            self.put_many(data)
+
+    @property
+    def schema_version(self) -> str:
+        return "0"
+
+    def _rebuild_check_with_first_element(self) -> bool:
+        cur = self.connection.cursor()
+        cur.execute(f"SELECT serialized_payload FROM {self.table_name} LIMIT 1")
+        res = cur.fetchone()
+        if res is None:
+            return False
+        serialized_payload = cast(bytes, res[0])
+        return serialized_payload != self.serialize(self.deserialize(serialized_payload))
+
+    def _do_rebuild(self) -> None:
+        cur = self.connection.cursor()
+        iter_old_records = self.connection.cursor()
+        iter_old_records.execute(f"SELECT job_id, serialized_payload FROM {self.table_name}")
+        for d in iter_old_records.fetchall():
+            cur.execute(
+                f"UPDATE {self.table_name} SET serialized_payload=? WHERE job_id=?",
+                (self.serialize(self.deserialize(d[1])), d[0]),
+            )
+
+    def __len__(self) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.get_count(self.table_name, cur)
+
+    @property
+    def ready_count(self) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.get_count_by_state(self.table_name, cur, _READY)
+
+    @property
+    def claimed_count(self) -> int:
+        cur = self.connection.cursor()
+        return self._driver_class.get_count_by_state(self.table_name, cur, _CLAIMED)
+
+    @serialized_write
+    def put(self, payload: T, delay: float = 0.0) -> int:
+        cur = self.connection.cursor()
+        job_id = self._driver_class.insert(self.table_name, cur, self.serialize(payload), time.time() + delay)
+        return job_id
+
+    @materialize_iterators
+    @serialized_write
+    def put_many(self, payloads: Iterable[T], delay: float = 0.0) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.insert_many(self.table_name, cur, (self.serialize(d) for d in payloads), time.time() + delay)
+
+    @serialized_write
+    def claim(self, n: int = 1, lease_seconds: float = 30.0) -> List[Job]:
+        if n <= 0:
+            return []
+        now = time.time()
+        lease = uuid4().hex
+        cur = self.connection.cursor()
+        claimed = self._driver_class.claim(self.table_name, cur, n, now, lease, now + lease_seconds)
+        return [Job(job_id, self.deserialize(d), lease, attempts) for job_id, d, attempts in claimed]
+
+    @serialized_write
+    def ack(self, job: Job) -> bool:
+        cur = self.connection.cursor()
+        res = self._driver_class.delete_leased(self.table_name, cur, job.job_id, job.lease)
+        return res
+
+    @serialized_write
+    def nack(self, job: Job, delay: float = 0.0) -> bool:
+        cur = self.connection.cursor()
+        res = self._driver_class.release_leased(self.table_name, cur, job.job_id, job.lease, time.time() + delay)
+        return res
+
+    @serialized_write
+    def requeue_expired(self) -> int:
+        cur = self.connection.cursor()
+        res = self._driver_class.requeue_expired(self.table_name, cur, time.time())
+        return res
+
+    @serialized_write
+    def clear(self) -> None:
+        cur = self.connection.cursor()
+        self._driver_class.delete_all(self.table_name, cur)
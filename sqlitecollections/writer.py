@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+from concurrent.futures import Future
+from queue import Empty, Queue
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from .connection import ConnectionPool
+
+_R = TypeVar("_R")
+_SAVEPOINT = "sc_group_commit"
+
+
+class _GroupCommitConnection(sqlite3.Connection):
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class _Operation(NamedTuple):
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    future: "Future[Any]"
+
+
+class GroupCommitWriter:
+    def __init__(self, pool: "ConnectionPool", max_batch_size: int = 1000) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self._pool = pool
+        self._max_batch_size = max_batch_size
+        self._queue: "Queue[Optional[_Operation]]" = Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batch_count = 0
+        self._thread = threading.Thread(target=self._run, name="sqlitecollections-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    @property
+    def batch_count(self) -> int:
+        return self._batch_count
+
+    @property
+    def thread(self) -> threading.Thread:
+        return self._thread
+
+    def submit(self, fn: Callable[..., _R], *args: Any, **kwargs: Any) -> "Future[_R]":
+        future: "Future[_R]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit to a closed writer")
+            self._queue.put(_Operation(fn, args, kwargs, future))
+        return future
+
+    def flush(self) -> None:
+        self.submit(lambda: None).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _next_batch(self) -> Tuple[List[_Operation], bool]:
+        batch: List[_Operation] = []
+        op = self._queue.get()
+        while op is not None:
+            batch.append(op)
+            if len(batch) >= self._max_batch_size:
+                return (batch, False)
+            try:
+                op = self._queue.get_nowait()
+            except Empty:
+                return (batch, False)
+        return (batch, True)
+
+    def _run(self) -> None:
+        conn = self._pool._connect(factory=_GroupCommitConnection, isolation_level=None)
+        self._pool._local.connection = conn
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if len(batch) > 0:
+                self._apply(conn, batch)
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[_Operation]) -> None:
+        results: List[Tuple["Future[Any]", Any, bool]] = []
+        with self._pool.write_lock:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for op in batch:
+                    if not op.future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+                    try:
+                        res = op.fn(*op.args, **op.kwargs)
+                    except BaseException as e:
+                        conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+                        conn.execute(f"RELEASE {_SAVEPOINT}")
+                        results.append((op.future, e, False))
+                    else:
+                        conn.execute(f"RELEASE {_SAVEPOINT}")
+                        results.append((op.future, res, True))
+                conn.execute("COMMIT")
+            except BaseException as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                finished = {id(d[0]) for d in results}
+                results = [(d[0], e, False) for d in results]
+                results.extend((op.future, e, False) for op in batch if id(op.future) not in finished)
+            self._batch_count += 1
+        for future, res, ok in results:
+            if future.done():
+                continue
+            if not future.running():
+                future.set_running_or_notify_cancel()
+            if ok:
+                future.set_result(res)
+            else:
+                future.set_exception(res)
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Awaitable, List, TypeVar
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+_R = TypeVar("_R")
+
+
+class AsyncContainerTestCase(DatabaseFileTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pool = sc.ConnectionPool(self.path)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        super().tearDown()
+
+    def run_async(self, coroutine: Awaitable[_R]) -> _R:
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_init_without_pool(self) -> None:
+        with self.assertRaisesRegex(ValueError, "AsyncDict requires a container created with a ConnectionPool"):
+            sc.AsyncDict(sc.Dict[str, int]())
+
+    def test_dict(self) -> None:
+        container = sc.Dict[str, int](connection=self.pool, table_name="items")
+        sut = sc.AsyncDict(container)
+        self.assertIs(sut.container, container)
+
+        async def scenario() -> Any:
+            await sut.set("a", 1)
+            await sut.update_many({"b": 2, "c": 3})
+            res = [await sut.get("a"), await sut.get("z", -1), await sut.contains("b"), await sut.len()]
+            await sut.delete("a")
+            res.append(await sut.pop("b"))
+            res.append(await sut.pop("b", -1))
+            res.append([d async for d in sut.items()])
+            try:
+                await sut.delete("a")
+            except KeyError as e:
+                res.append(e)
+            return res
+
+        res = self.run_async(scenario())
+        self.assertEqual(res[:7], [1, -1, True, 3, 2, -1, [("c", 3)]])
+        self.assertIsInstance(res[7], KeyError)
+        self.assertEqual(dict(container), {"c": 3})
+
+    def test_chunked_iteration(self) -> None:
+        data = {f"k{i}": i for i in range(25)}
+        sut = sc.AsyncDict(sc.Dict[str, int](connection=self.pool, table_name="items", data=data))
+
+        async def scenario() -> Any:
+            return (
+                [d async for d in sut.items(chunk_size=4)],
+                [d async for d in sut.keys(chunk_size=5)],
+                [d async for d in sut.values(chunk_size=100)],
+                [d async for d in sut],
+            )
+
+        items, keys, values, default = self.run_async(scenario())
+        self.assertEqual(items, list(data.items()))
+        self.assertEqual(keys, list(data.keys()))
+        self.assertEqual(values, list(data.values()))
+        self.assertEqual(default, list(data.keys()))
+
+    def test_list_and_set(self) -> None:
+        async_list = sc.AsyncList(sc.List[int](connection=self.pool, table_name="l"))
+        async_set = sc.AsyncSet(sc.Set[int](connection=self.pool, table_name="s"))
+
+        async def scenario() -> Any:
+            await async_list.update_many(range(5))
+            await async_list.append(5)
+            await async_list.insert(0, -1)
+            await async_list.set(1, 100)
+            await async_list.delete(2)
+            popped = await async_list.pop()
+            await async_set.update_many([1, 2, 3])
+            await async_set.add(4)
+            await async_set.discard(1)
+            await async_set.remove(2)
+            return (
+                popped,
+                await async_list.get(0),
+                [d async for d in async_list.values(chunk_size=2)],
+                sorted([d async for d in async_set]),
+            )
+
+        self.assertEqual(self.run_async(scenario()), (5, -1, [-1, 100, 2, 3, 4], [3, 4]))
+
+    def test_concurrent_operations_share_transactions(self) -> None:
+        sut = sc.AsyncList(sc.List[int](connection=self.pool, table_name="items"))
+        batch_count = self.pool.writer.batch_count
+
+        async def scenario() -> List[None]:
+            return await asyncio.gather(*(sut.append(i) for i in range(100)))
+
+        self.run_async(scenario())
+        self.assertEqual(sorted(sut.container), list(range(100)))
+        self.assertLess(self.pool.writer.batch_count - batch_count, 100)
@@ -1,7 +1,11 @@
+import multiprocessing
 import os
 import re
 import sqlite3
 import sys
+import tempfile
+import threading
+import unittest
 import uuid
 from collections.abc import Hashable
 from typing import Any
@@ -13,6 +17,7 @@ if sys.version_info > (3, 9):
 else:
     from typing import Callable
 
+import sqlitecollections as sc
 from sqlitecollections import base
 
 
@@ -51,12 +56,21 @@ class SqlTestCase(TestCase):
         self.assert_sql_result_equals(conn, "SELECT table_name, schema_version, container_type FROM metadata", expected)
 
 
+class DatabaseFileTestCase(SqlTestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "db.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+
 class ConcreteSqliteCollectionDatabaseDriver(base._SqliteCollectionBaseDatabaseDriver):
     @classmethod
     def do_create_table(
-        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor
+        cls, table_name: str, container_type_nam: str, schema_version: str, cur: sqlite3.Cursor, temporary: bool = False
     ) -> None:
-        cur.execute(f"CREATE TABLE {table_name} (idx INTEGER AUTO INCREMENT, value BLOB)")
+        cur.execute(f"CREATE {'TEMP ' if temporary else ''}TABLE {table_name} (idx INTEGER AUTO INCREMENT, value BLOB)")
 
     @classmethod
     def add(cls, table_name: str, value: bytes, cur: sqlite3.Cursor) -> None:
@@ -76,6 +90,7 @@ class ConcreteSqliteCollectionClass(base.SqliteCollectionBase[Any]):
     def _do_rebuild(self) -> None:
         ...
 
+    @base.serialized_write
     def add(self, value: bytes) -> None:
         cur = self.connection.cursor()
         self._driver_class.add(self.table_name, value, cur)
@@ -103,7 +118,8 @@ class SqliteCollectionsBaseTestCase(SqlTestCase):
         NamedTemporaryFile.return_value.name = "tempfilename"
         sqlite3_connect.return_value = memory_db
         sut = ConcreteSqliteCollectionClass()
-        sqlite3_connect.assert_called_once_with("tempfilename")
+        sqlite3_connect.assert_called_once_with(":memory:")
+        self.assertFalse(sut.spilled)
         self.assertEqual(sut.connection, memory_db)
         self.assertEqual(sut.serializer, dumps)
         self.assertEqual(sut.deserializer, loads)
@@ -464,3 +480,216 @@ class SqliteCollectionsBaseTestCase(SqlTestCase):
         )
         _rebuild_check_with_first_element.assert_not_called()
         _do_rebuild.assert_not_called()
+
+
+def append_from_process(path: str, n: int) -> None:
+    d = sc.Dict[str, int](connection=path, table_name="d")
+    l = sc.List[str](connection=path, table_name="l")
+    for i in range(n):
+        d[f"{os.getpid()}-{i}"] = i
+        l.append(f"{os.getpid()}-{i}")
+
+
+class RetryAndForkTestCase(DatabaseFileTestCase):
+    def test_retry_policy(self) -> None:
+        sut = base.RetryPolicy()
+        self.assertEqual(sut, base.RetryPolicy(max_retries=5, base_delay=0.01, max_delay=1.0))
+        for attempt in range(10):
+            self.assertTrue(0 <= sut.delay(attempt) <= min(1.0, 0.01 * 2**attempt))
+        self.assertTrue(base.is_busy_error(sqlite3.OperationalError("database is locked")))
+        self.assertFalse(base.is_busy_error(sqlite3.OperationalError("no such table: x")))
+        self.assertFalse(base.is_busy_error(ValueError("database is locked")))
+
+    def test_write_is_retried_while_database_is_locked(self) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=sqlite3.connect(self.path, timeout=0), table_name="items")
+        sut.set_retry_policy(base.RetryPolicy(max_retries=100, base_delay=0.001, max_delay=0.01))
+        self.assertEqual(sut.retry_policy.max_retries, 100)
+        blocker = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        blocker.execute("BEGIN EXCLUSIVE")
+        timer = threading.Timer(0.1, lambda: blocker.execute("COMMIT"))
+        timer.start()
+        sut.add(b"a")
+        timer.join()
+        self.assert_sql_result_equals(sut.connection, "SELECT value FROM items", [(b"a",)])
+        self.assertFalse(sut.connection.in_transaction)
+
+    def test_retried_write_keeps_iterator_arguments(self) -> None:
+        connection = sqlite3.connect(self.path, timeout=0)
+        l = sc.List[int](connection=connection, table_name="l")
+        d = sc.Dict[str, int](connection=connection, table_name="d")
+        s = sc.Set[int](connection=connection, table_name="s")
+        for sut in (l, d, s):
+            sut.set_retry_policy(base.RetryPolicy(max_retries=100, base_delay=0.001, max_delay=0.01))
+        blocker = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        write: Callable[[], None]
+        for write in (
+            lambda: l.extend(x for x in range(5)),
+            lambda: l.__setitem__(slice(1, 3), (x for x in range(10, 13))),
+            lambda: d.update((str(x), x) for x in range(5)),
+            lambda: s.update((x for x in range(5)), iter([5])),
+        ):
+            blocker.execute("BEGIN EXCLUSIVE")
+            timer = threading.Timer(0.1, lambda: blocker.execute("COMMIT"))
+            timer.start()
+            write()
+            timer.join()
+        self.assertEqual(list(l), [0, 10, 11, 12, 3, 4])
+        self.assertEqual(dict(d.items()), {str(x): x for x in range(5)})
+        self.assertEqual(sorted(s), [0, 1, 2, 3, 4, 5])
+
+    def test_busy_timeout(self) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=self.path, table_name="items")
+        self.assertEqual(sut.busy_timeout, 5.0)
+        sut.set_busy_timeout(0.25)
+        self.assertEqual(sut.busy_timeout, 0.25)
+        self.assertEqual(sut._connect_database().execute("PRAGMA busy_timeout").fetchone(), (250,))
+        pool = sc.ConnectionPool(self.path)
+        with self.assertRaisesRegex(ValueError, "ConnectionPool"):
+            ConcreteSqliteCollectionClass(connection=pool, table_name="items").set_busy_timeout(1.0)
+        pool.close()
+
+    @patch("sqlitecollections.base.time.sleep")
+    def test_write_gives_up_after_max_retries(self, sleep: MagicMock) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=sqlite3.connect(self.path, timeout=0), table_name="items")
+        sut.set_retry_policy(base.RetryPolicy(max_retries=3))
+        blocker = sqlite3.connect(self.path, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        with self.assertRaisesRegex(sqlite3.OperationalError, "database is locked"):
+            sut.add(b"a")
+        self.assertEqual(sleep.call_count, 3)
+        blocker.execute("ROLLBACK")
+
+    @patch("sqlitecollections.base.time.sleep")
+    def test_other_errors_are_not_retried(self, sleep: MagicMock) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=sqlite3.connect(self.path), table_name="items")
+        sut.connection.execute("DROP TABLE items")
+        with self.assertRaisesRegex(sqlite3.OperationalError, "no such table: items"):
+            sut.add(b"a")
+        sleep.assert_not_called()
+
+    def test_failed_write_keeps_open_transaction(self) -> None:
+        connection = sqlite3.connect(self.path)
+        d = sc.Dict[str, int](connection=connection, table_name="d")
+        connection.execute("CREATE TABLE other (x INTEGER)")
+        connection.commit()
+        connection.execute("INSERT INTO other VALUES (1)")
+        with self.assertRaises(KeyError):
+            d.pop("missing")
+        with self.assertRaises(ValueError):
+            d.update([("a", 1), ("b",)])  # type: ignore
+        self.assertTrue(connection.in_transaction)
+        self.assert_sql_result_equals(connection, "SELECT x FROM other", [(1,)])
+        self.assertEqual(dict(d.items()), {})
+        d["a"] = 1
+        self.assertFalse(connection.in_transaction)
+        self.assert_sql_result_equals(sqlite3.connect(self.path), "SELECT x FROM other", [(1,)])
+
+    @patch("sqlitecollections.base.time.sleep")
+    def test_retried_write_sees_no_nested_commits(self, sleep: MagicMock) -> None:
+        sut = sc.List[Any](connection=self.path, table_name="l", data=list(range(6)))
+        increment_indices = sut._driver_class.increment_indices
+        calls = []
+
+        def fail_once(*args: Any) -> None:
+            calls.append(args)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            increment_indices(*args)
+
+        with patch.object(sut._driver_class, "increment_indices", fail_once):
+            sut[1:3] = ["a", "b"]
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(list(sut), [0, "a", "b", 3, 4, 5])
+
+    def test_nested_write_does_not_commit(self) -> None:
+        sut = sc.List[int](connection=self.path, table_name="l", data=[0, 1, 2])
+        with patch.object(
+            sut._driver_class, "add_record_by_serialized_value_and_index", side_effect=[None, ValueError]
+        ):
+            with self.assertRaises(ValueError):
+                sut[0:1] = [10, 11]
+        self.assertEqual(list(sut), [0, 1, 2])
+
+    def test_concurrent_writes_from_processes(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=append_from_process, args=(self.path, 20)) for _ in range(6)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        self.assertEqual([p.exitcode for p in processes], [0] * 6)
+        self.assertEqual(len(sc.Dict[str, int](connection=self.path, table_name="d")), 120)
+        self.assertEqual(len(set(sc.List[str](connection=self.path, table_name="l"))), 120)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_reconnect_after_fork(self) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=self.path, table_name="items")
+        volatile = ConcreteSqliteCollectionClass(connection=self.path, table_name="volatile", persist=False)
+        parent_connection = sut.connection
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = sut.connection is not parent_connection
+                sut.add(b"child")
+                del volatile
+                os._exit(0 if ok else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        self.assertIs(sut.connection, parent_connection)
+        self.assert_sql_result_equals(parent_connection, "SELECT value FROM items", [(b"child",)])
+        self.assert_sql_result_equals(
+            parent_connection, "SELECT table_name FROM metadata WHERE table_name='volatile'", [("volatile",)]
+        )
+
+
+class SnapshotTestCase(DatabaseFileTestCase):
+    def test_snapshot(self) -> None:
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        sut = ConcreteSqliteCollectionClass(connection=connection, table_name="items")
+        sut.add(b"first")
+        with sut.snapshot() as snapshot:
+            self.assertIsInstance(snapshot, ConcreteSqliteCollectionClass)
+            self.assertIsNot(snapshot.connection, connection)
+            self.assertTrue(snapshot.readonly)
+            sut.add(b"second")
+            self.assert_sql_result_equals(snapshot.connection, "SELECT value FROM items", [(b"first",)])
+            with self.assertRaisesRegex(sqlite3.OperationalError, "readonly database"):
+                snapshot.add(b"third")
+        with self.assertRaisesRegex(sqlite3.ProgrammingError, "closed database"):
+            snapshot.connection.cursor()
+        self.assert_sql_result_equals(connection, "SELECT value FROM items", [(b"first",), (b"second",)])
+        self.assert_sql_result_equals(
+            connection, "SELECT table_name FROM metadata WHERE table_name='items'", [("items",)]
+        )
+
+    def test_snapshot_switches_to_wal(self) -> None:
+        connection = sqlite3.connect(self.path)
+        sut = ConcreteSqliteCollectionClass(connection=connection, table_name="items")
+        sut.add(b"first")
+        with self.assertRaisesRegex(ValueError, "snapshot requires WAL mode, pass enable_wal=True"):
+            sut.snapshot()
+        self.assert_sql_result_equals(connection, "PRAGMA journal_mode", [("delete",)])
+        with sut.snapshot(enable_wal=True) as snapshot:
+            self.assert_sql_result_equals(connection, "PRAGMA journal_mode", [("wal",)])
+            sut.add(b"second")
+            self.assert_sql_result_equals(snapshot.connection, "SELECT value FROM items", [(b"first",)])
+        self.assert_sql_result_equals(connection, "SELECT value FROM items", [(b"first",), (b"second",)])
+
+    def test_snapshot_without_wal(self) -> None:
+        connection = sqlite3.connect(self.path)
+        sut = ConcreteSqliteCollectionClass(connection=connection, table_name="items")
+        with self.assertRaisesRegex(ValueError, "snapshot requires WAL mode, which can't be enabled"):
+            sut.as_readonly().snapshot(enable_wal=True)
+        connection.execute("BEGIN")
+        with self.assertRaisesRegex(ValueError, "snapshot requires WAL mode, which can't be enabled"):
+            sut.snapshot(enable_wal=True)
+        connection.rollback()
+        self.assert_sql_result_equals(connection, "PRAGMA journal_mode", [("delete",)])
+
+    def test_snapshot_of_in_memory_database(self) -> None:
+        sut = ConcreteSqliteCollectionClass(connection=":memory:", table_name="items")
+        with self.assertRaisesRegex(ValueError, "snapshot of 'ConcreteSqliteCollectionClass' requires a database file"):
+            sut.snapshot()
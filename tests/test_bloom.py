@@ -0,0 +1,137 @@
+import sqlite3
+from unittest import TestCase
+from unittest.mock import patch
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.bloom import BloomFilter
+
+
+class BloomFilterTestCase(TestCase):
+    def test_add_and_contains(self) -> None:
+        sut = BloomFilter(1000)
+        for i in range(1000):
+            sut.add(str(i).encode())
+        self.assertTrue(all(str(i).encode() in sut for i in range(1000)))
+        false_positives = sum(str(i).encode() in sut for i in range(1000, 11000))
+        self.assertLess(false_positives, 300)
+        self.assertFalse(sut.is_full)
+        sut.add(b"x")
+        self.assertTrue(sut.is_full)
+
+    def test_dumps_and_loads(self) -> None:
+        sut = BloomFilter(100, error_rate=0.001)
+        sut.add(b"a")
+        loaded = BloomFilter.loads(sut.dumps())
+        self.assertEqual((loaded.capacity, loaded.count), (100, 1))
+        self.assertIn(b"a", loaded)
+        self.assertEqual(loaded.dumps(), sut.dumps())
+        with self.assertRaisesRegex(ValueError, "capacity must be positive"):
+            BloomFilter(0)
+
+
+class BloomFilterContainerTestCase(DatabaseFileTestCase):
+    def count_saved(self, conn: sqlite3.Connection) -> int:
+        return int(conn.execute("SELECT COUNT(*) FROM metadata_options WHERE name='bloom_filter.bits'").fetchone()[0])
+
+    def test_set(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Set[str](connection=conn, table_name="items", data=["a", "b"], bloom_filter=True)
+        self.assertTrue(sut.bloom_filter)
+        self.assertEqual(self.count_saved(conn), 0)
+        self.assertIn("a", sut)
+        self.assertEqual(self.count_saved(conn), 1)
+        with patch.object(sut._driver_class, "is_serialized_value_in") as is_serialized_value_in:
+            self.assertNotIn("zzz", sut)
+            is_serialized_value_in.assert_not_called()
+        sut.add("c")
+        self.assertEqual(self.count_saved(conn), 0)
+        sut.update(["d"])
+        sut ^= {"e"}
+        self.assertTrue(all(d in sut for d in "abcde"))
+        sut.discard("a")
+        self.assertNotIn("a", sut)
+
+    def test_dict_and_reopen(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, int](connection=conn, table_name="items", data={"a": 1}, bloom_filter=True)
+        self.assertEqual(sut.get("a"), 1)
+        self.assertEqual(self.count_saved(conn), 1)
+        self.assert_sql_result_equals(
+            conn, "SELECT typeof(value) FROM metadata_options WHERE name='bloom_filter.bits'", [("blob",)]
+        )
+        reopened = sc.Dict[str, int](connection=sqlite3.connect(self.path), table_name="items")
+        self.assertTrue(reopened.bloom_filter)
+        with patch.object(reopened._driver_class, "get_serialized_key_column") as get_serialized_key_column:
+            self.assertEqual(reopened.get("missing", -1), -1)
+            get_serialized_key_column.assert_not_called()
+        sut["b"] = 2
+        sut.update({"c": 3})
+        self.assertEqual(reopened["c"], 3)
+        self.assertIn("b", reopened)
+        sut.setdefault("d", 4)
+        self.assertEqual([sut["b"], sut["c"], sut["d"]], [2, 3, 4])
+        with self.assertRaises(KeyError):
+            sut["missing"]
+
+    def test_other_writer_triggers_rebuild(self) -> None:
+        sut = sc.Set[int](connection=self.path, table_name="items", data=range(10), bloom_filter=True)
+        self.assertNotIn(100, sut)
+        other = sc.Set[int](connection=self.path, table_name="items")
+        other.update(range(100, 3000))
+        self.assertIn(100, sut)
+        self.assertEqual(sum(d in sut for d in range(3000)), 2910)
+        self.assertGreater(cast_filter(sut).capacity, 3000)
+
+    def test_other_container_on_the_same_connection(self) -> None:
+        conn = sqlite3.connect(self.path)
+        d1 = sc.Dict[str, int](connection=conn, table_name="items", bloom_filter=True)
+        self.assertNotIn("a", d1)
+        d2 = sc.Dict[str, int](connection=conn, table_name="items")
+        d2["a"] = 1
+        self.assertIn("a", d1)
+        self.assertEqual(d1.get("a"), 1)
+        s1 = sc.Set[str](connection=conn, table_name="elements", bloom_filter=True)
+        self.assertNotIn("a", s1)
+        s2 = sc.Set[str](connection=conn, table_name="elements")
+        s2.add("a")
+        self.assertIn("a", s1)
+        d2["b"] = 2
+        d1["c"] = 3
+        self.assert_sql_result_equals(
+            conn, "SELECT COUNT(*) FROM metadata_options WHERE table_name='items' AND name='bloom_filter.bits'", [(0,)]
+        )
+        self.assertEqual([d1.get("b"), d2.get("c")], [2, 3])
+
+    def test_own_writes_keep_the_filter(self) -> None:
+        sut = sc.Dict[int, int](connection=self.path, table_name="items", data={0: 0}, bloom_filter=True)
+        self.assertIn(0, sut)
+        with patch.object(sut._driver_class, "get_serialized_key_column") as get_serialized_key_column:
+            for i in range(1, 10):
+                sut[i] = i
+                self.assertIn(i, sut)
+                del sut[i - 1]
+                self.assertNotIn(i - 1, sut)
+            get_serialized_key_column.assert_not_called()
+
+    def test_save_is_skipped_while_database_is_locked(self) -> None:
+        sc.Set[str](connection=self.path, table_name="items", data=["a"], bloom_filter=True)
+        sut = sc.Set[str](connection=self.path, table_name="items")
+        locker = sqlite3.connect(self.path)
+        locker.execute("BEGIN IMMEDIATE")
+        self.assertIn("a", sut)
+        self.assertNotIn("b", sut)
+        locker.rollback()
+        self.assertEqual(self.count_saved(locker), 0)
+
+    def test_invalid_combinations(self) -> None:
+        with self.assertRaisesRegex(ValueError, "bloom_filter can't be combined with column_type"):
+            sc.Set[int](column_type=sc.ColumnType.INTEGER, bloom_filter=True)
+        with self.assertRaisesRegex(ValueError, "bloom_filter can't be combined with key_column_type"):
+            sc.Dict[int, int](key_column_type=sc.ColumnType.INTEGER, bloom_filter=True)
+
+
+def cast_filter(container: sc.Set[int]) -> BloomFilter:
+    assert container._bloom_filter is not None
+    return container._bloom_filter
@@ -0,0 +1,161 @@
+import sqlite3
+import struct
+from typing import Any
+from unittest import TestCase
+
+import sqlitecollections as sc
+from sqlitecollections import codecs
+
+
+class CodecsTestCase(TestCase):
+    def test_str(self) -> None:
+        self.assertEqual(codecs.dumps_str("あa"), "あa".encode("utf-8"))
+        self.assertEqual(codecs.loads_str(codecs.dumps_str("あa")), "あa")
+        with self.assertRaisesRegex(TypeError, "str codec requires str, not 'int'"):
+            codecs.dumps_str(1)  # type: ignore
+
+    def test_bytes(self) -> None:
+        value = b"\x00\x01"
+        self.assertIs(codecs.dumps_bytes(value), value)
+        self.assertEqual(codecs.dumps_bytes(bytearray(value)), value)
+        self.assertIs(codecs.loads_bytes(value), value)
+        with self.assertRaisesRegex(TypeError, "bytes codec requires bytes, not 'str'"):
+            codecs.dumps_bytes("a")  # type: ignore
+
+    def test_int(self) -> None:
+        self.assertEqual(codecs.dumps_int(1), struct.pack(">q", 1))
+        for d in (0, -1, 2**63 - 1, -(2**63)):
+            self.assertEqual(codecs.loads_int(codecs.dumps_int(d)), d)
+        with self.assertRaises(OverflowError):
+            codecs.dumps_int(2**63)
+        with self.assertRaisesRegex(TypeError, "int codec requires int, not 'bool'"):
+            codecs.dumps_int(True)
+
+    def test_float(self) -> None:
+        self.assertEqual(codecs.dumps_float(0.5), struct.pack(">d", 0.5))
+        self.assertEqual(codecs.loads_float(codecs.dumps_float(-1.25)), -1.25)
+        self.assertEqual(codecs.loads_float(codecs.dumps_float(3)), 3.0)
+
+    def test_tuple(self) -> None:
+        value = (1, -2.5, "a", b"b", None, True, False, 2**80, (), ("nested", (1,)))
+        actual = codecs.loads_tuple(codecs.dumps_tuple(value))
+        self.assertEqual(actual, value)
+        self.assertEqual([type(d) for d in actual], [type(d) for d in value])
+        self.assertEqual(codecs.dumps_tuple((1, "a")), codecs.dumps_tuple((1, "a")))
+        self.assertNotEqual(codecs.dumps_tuple((1,)), codecs.dumps_tuple((1.0,)))
+        with self.assertRaisesRegex(TypeError, "tuple codec does not support 'list'"):
+            codecs.dumps_tuple(([1],))
+        with self.assertRaises(ValueError):
+            codecs.loads_tuple(codecs.dumps_tuple((1,)) + b"x")
+
+    def test_ordered(self) -> None:
+        values = [
+            None,
+            False,
+            True,
+            float("-inf"),
+            -1e300,
+            -(2**63),
+            -1.5,
+            -1,
+            0,
+            0.5,
+            1,
+            2**53,
+            2**53 + 1,
+            2**63 - 1,
+            2.0**63,
+            float("inf"),
+            b"",
+            b"\x00",
+            b"\x00\x00",
+            b"\x01",
+            "",
+            "a",
+            "a\x00",
+            "ab",
+            "b",
+            (),
+            (1,),
+            (1, "a"),
+            (1, "b"),
+            (2,),
+        ]
+        encoded = [codecs.dumps_ordered(d) for d in values]
+        self.assertEqual(sorted(encoded), encoded)
+        self.assertEqual([codecs.loads_ordered(d) for d in encoded], values)
+        self.assertEqual(codecs.dumps_ordered(1.0), codecs.dumps_ordered(1))
+        self.assertEqual(codecs.dumps_ordered(-0.0), codecs.dumps_ordered(0))
+        self.assertIs(type(codecs.loads_ordered(codecs.dumps_ordered(2.0))), int)
+        self.assertLess(codecs.dumps_ordered(2**53 + 1), codecs.dumps_ordered(2.0**53 + 2))
+        with self.assertRaises(OverflowError):
+            codecs.dumps_ordered(2**63)
+        with self.assertRaisesRegex(ValueError, "ordered codec does not support NaN"):
+            codecs.dumps_ordered(float("nan"))
+        with self.assertRaisesRegex(TypeError, "ordered codec does not support 'list'"):
+            codecs.dumps_ordered([1])
+
+    def test_ordered_prefix(self) -> None:
+        prefix = codecs.dumps_ordered_prefix("ab")
+        upper = codecs.next_prefix(prefix)
+        assert upper is not None
+        for d in ("ab", "abc", "ab\x00", "ab\uffff"):
+            self.assertTrue(prefix <= codecs.dumps_ordered(d) < upper)
+        for other in ("a", "ac", "b", b"ab"):
+            self.assertFalse(prefix <= codecs.dumps_ordered(other) < upper)
+        self.assertEqual(codecs.next_prefix(b"a\xff\xff"), b"b")
+        self.assertIsNone(codecs.next_prefix(b"\xff"))
+        with self.assertRaisesRegex(TypeError, "prefix must be str, bytes or tuple, not 'int'"):
+            codecs.dumps_ordered_prefix(1)
+
+    def test_codecs_with_containers(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        d = sc.Dict[str, Any](
+            connection=memory_db,
+            key_serializer=codecs.STR.serializer,
+            key_deserializer=codecs.STR.deserializer,
+            value_serializer=codecs.TUPLE.serializer,
+            value_deserializer=codecs.TUPLE.deserializer,
+            data={"a": (1, "x")},
+        )
+        self.assertEqual(d["a"], (1, "x"))
+        l = sc.List[int](connection=memory_db, serializer=codecs.dumps_int, deserializer=codecs.loads_int, data=[3, 1])
+        self.assertEqual(list(l), [3, 1])
+        s = sc.Set[bytes](connection=memory_db, serializer=codecs.dumps_bytes, deserializer=codecs.loads_bytes)
+        s.add(b"a")
+        self.assertTrue(b"a" in s)
+
+    def test_identity_codec_is_short_circuited(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        d = sc.Dict[bytes, bytes](
+            connection=memory_db,
+            key_serializer=codecs.BYTES.serializer,
+            key_deserializer=codecs.BYTES.deserializer,
+            value_serializer=codecs.BYTES.serializer,
+            value_deserializer=codecs.BYTES.deserializer,
+            data={b"a": b"x", b"b": b"y"},
+        )
+        self.assertTrue(d._raw_keys)
+        self.assertTrue(d._raw_values)
+        self.assertEqual(list(d), [b"a", b"b"])
+        self.assertEqual(d[b"b"], b"y")
+        with d.open_value(b"c", "wb") as f:
+            f.write(b"z")
+        self.assertEqual(d[b"c"], b"z")
+        l = sc.List[bytes](connection=memory_db, column_type=sc.ColumnType.BLOB, data=[b"x"])
+        self.assertTrue(l._raw_values)
+        self.assertEqual(l[0], b"x")
+        s = sc.Set[bytes](connection=memory_db, serializer=codecs.dumps_bytes, deserializer=codecs.loads_bytes)
+        s.add(b"a")
+        self.assertTrue(s._raw_values)
+        self.assertEqual(list(s), [b"a"])
+        compressed = sc.List[bytes](
+            connection=memory_db,
+            serializer=codecs.dumps_bytes,
+            deserializer=codecs.loads_bytes,
+            compression=sc.Compression(threshold=0),
+            data=[b"x" * 100],
+        )
+        self.assertFalse(compressed._raw_values)
+        self.assertEqual(compressed[0], b"x" * 100)
+        self.assertFalse(sc.List[bytes](connection=memory_db)._raw_values)
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.base import _SqliteCollectionBaseDatabaseDriver
+from sqlitecollections.compression import decompress
+
+
+class CompressionTestCase(TestCase):
+    def test_compress(self) -> None:
+        blob = b"abc" * 1000
+        for algorithm, flag in (("zlib", 1), ("lzma", 2), ("bz2", 3)):
+            sut = sc.Compression(algorithm, threshold=100)
+            compressed = sut.compress(blob)
+            self.assertEqual(compressed[0], flag)
+            self.assertLess(len(compressed), len(blob))
+            self.assertEqual(decompress(compressed), blob)
+
+    def test_threshold_and_incompressible(self) -> None:
+        sut = sc.Compression(threshold=100)
+        self.assertEqual(sut.compress(b"abc"), b"\x00abc")
+        self.assertEqual(decompress(b"\x00abc"), b"abc")
+        random_blob = os.urandom(200)
+        self.assertEqual(sut.compress(random_blob), b"\x00" + random_blob)
+        with self.assertRaisesRegex(ValueError, "unknown compression flag: 9"):
+            decompress(b"\x09abc")
+
+    def test_validate_and_dumps(self) -> None:
+        sut = sc.Compression("lzma", level=3, threshold=10)
+        self.assertIs(sut.validate(), sut)
+        self.assertEqual(sc.Compression.loads(sut.dumps()), sut)
+        with self.assertRaisesRegex(ValueError, "unsupported compression algorithm: 'snappy'"):
+            sc.Compression("snappy").validate()
+        with self.assertRaisesRegex(ValueError, "threshold must not be negative"):
+            sc.Compression(threshold=-1).validate()
+        with self.assertRaisesRegex(ValueError, "invalid zlib compression level: 42"):
+            sc.Compression(level=42).validate()
+
+
+class CompressedContainerTestCase(DatabaseFileTestCase):
+    def test_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        compression = sc.Compression(threshold=64)
+        sut = sc.Dict[str, str](
+            connection=conn, table_name="items", data={"small": "x", "large": "y" * 1000}, compression=compression
+        )
+        self.assertEqual(sut.compression, compression)
+        self.assertEqual(sut["small"], "x")
+        self.assertEqual(sut["large"], "y" * 1000)
+        self.assertEqual(list(sut.items()), [("small", "x"), ("large", "y" * 1000)])
+        cur = conn.cursor()
+        cur.execute("SELECT serialized_key, substr(serialized_value, 1, 1), length(serialized_value) FROM items")
+        rows = cur.fetchall()
+        self.assertEqual([r[0] for r in rows], [sut.serialize_key("small"), sut.serialize_key("large")])
+        self.assertEqual([r[1] for r in rows], [b"\x00", b"\x01"])
+        self.assertLess(rows[1][2], 100)
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT table_name, name, value FROM metadata_options",
+            [("items", "compression", compression.dumps())],
+        )
+        reopened = sc.Dict[str, str](connection=conn, table_name="items")
+        self.assertEqual(reopened.compression, compression)
+        self.assertEqual(reopened["large"], "y" * 1000)
+        sut.table_name = "renamed"
+        self.assert_sql_result_equals(conn, "SELECT table_name FROM metadata_options", [("renamed",)])
+        copied = sut.copy()
+        self.assertEqual(copied.compression, compression)
+        copy_table_name = copied.table_name
+        del copied
+        self.assert_sql_result_equals(
+            conn, f"SELECT COUNT(*) FROM metadata_options WHERE table_name='{copy_table_name}'", [(0,)]
+        )
+
+    def test_enable_and_change_compression_on_existing_table(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.List[str](connection=conn, table_name="items", data=["a" * 500, "b"])
+        sut = sc.List[str](connection=conn, table_name="items", compression=sc.Compression(threshold=64))
+        self.assertEqual(list(sut), ["a" * 500, "b"])
+        self.assertEqual(sut.index("a" * 500), 0)
+        sut = sc.List[str](connection=conn, table_name="items", compression=sc.Compression("bz2", threshold=0))
+        self.assertEqual(list(sut), ["a" * 500, "b"])
+        self.assertIn("b", sut)
+        self.assert_sql_result_equals(
+            conn, "SELECT substr(serialized_value, 1, 1) FROM items ORDER BY item_index", [(b"\x03",), (b"\x00",)]
+        )
+
+    def test_enable_compression_in_batches(self) -> None:
+        conn = sqlite3.connect(self.path)
+        data = [str(i) * 100 for i in range(5)]
+        sc.List[str](connection=conn, table_name="items", data=data)
+        with patch.object(_SqliteCollectionBaseDatabaseDriver, "row_batch_size", 2):
+            sut = sc.List[str](connection=conn, table_name="items", compression=sc.Compression(threshold=64))
+        self.assertEqual(list(sut), data)
+        self.assert_sql_result_equals(conn, "SELECT DISTINCT substr(serialized_value, 1, 1) FROM items", [(b"\x01",)])
+
+    def test_compression_with_column_type(self) -> None:
+        with self.assertRaisesRegex(ValueError, "compression can't be combined with column_type"):
+            sc.List[int](column_type=sc.ColumnType.INTEGER, compression=sc.Compression())
+        with self.assertRaisesRegex(ValueError, "compression can't be combined with value_column_type"):
+            sc.Dict[str, int](value_column_type=sc.ColumnType.INTEGER, compression=sc.Compression())
+
+    def test_dictionary_compression(self) -> None:
+        conn = sqlite3.connect(self.path)
+        compression = sc.Compression("zlib_dict", dictionary_size=4096, sample_size=50)
+        records = {
+            f"user{i}": {"name": f"user{i}", "email": f"user{i}@example.com", "active": True} for i in range(200)
+        }
+        sut = sc.Dict[str, Any](connection=conn, table_name="items", data=records, compression=compression)
+        self.assert_sql_result_equals(conn, "SELECT DISTINCT substr(serialized_value, 1, 1) FROM items", [(b"\x00",)])
+        before = conn.execute("SELECT SUM(length(serialized_value)) FROM items").fetchone()[0]
+        sut.optimize()
+        self.assert_sql_result_equals(conn, "SELECT DISTINCT substr(serialized_value, 1, 1) FROM items", [(b"\x00",)])
+        sut.update(records)
+        after = conn.execute("SELECT SUM(length(serialized_value)) FROM items").fetchone()[0]
+        self.assertLess(after * 2, before)
+        self.assert_sql_result_equals(
+            conn, "SELECT DISTINCT substr(serialized_value, 1, 5) FROM items", [(b"\x04\x00\x00\x00\x00",)]
+        )
+        self.assertEqual(dict(sut.items()), records)
+        sut["new"] = {"name": "new", "email": "new@example.com", "active": False}
+        self.assertEqual(sut["new"]["email"], "new@example.com")
+
+        reopened = sc.Dict[str, Any](connection=sqlite3.connect(self.path), table_name="items")
+        self.assertEqual(reopened.compression, compression)
+        self.assertEqual(reopened["user3"], records["user3"])
+        sut.optimize()
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT name FROM metadata_options WHERE name LIKE 'compression_dictionary.%' ORDER BY name",
+            [("compression_dictionary.0",), ("compression_dictionary.1",)],
+        )
+        self.assertEqual(reopened["user4"], records["user4"])
+        self.assertEqual(reopened["new"]["name"], "new")
+        reopened.update(records)
+        reopened["new"] = {"name": "new", "email": "new@example.com", "active": False}
+        self.assert_sql_result_equals(
+            conn, "SELECT DISTINCT substr(serialized_value, 1, 5) FROM items", [(b"\x04\x00\x00\x00\x01",)]
+        )
+        sut.optimize()
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT name FROM metadata_options WHERE name LIKE 'compression_dictionary.%' ORDER BY name",
+            [("compression_dictionary.1",), ("compression_dictionary.2",)],
+        )
+        self.assertEqual(dict(reopened.items()), {**records, "new": sut["new"]})
+
+    def test_dictionary_compression_lookups(self) -> None:
+        compression = sc.Compression("zlib_dict", threshold=0, dictionary_size=4096, sample_size=50)
+        records = [f'{{"name": "user{i}", "email": "user{i}@example.com", "active": true}}' for i in range(100)]
+        sut = sc.List[str](connection=self.path, table_name="items", data=records, compression=compression)
+        sut.optimize()
+        sut.append(records[0])
+        other = sc.List[str](connection=self.path, table_name="items")
+        other.optimize()
+        other.append(records[0])
+        other.append("added by other")
+        self.assertIn(records[1], sut)
+        self.assertIn("added by other", sut)
+        self.assertEqual(sut.index("added by other"), 102)
+        self.assertEqual(sut.count(records[0]), 3)
+        self.assertEqual(sut.index(records[0], 1), 100)
+        sut.remove(records[0])
+        self.assertEqual(sut[0], records[1])
+        self.assertNotIn("missing", sut)
+
+    def test_dictionary_compression_on_empty_table(self) -> None:
+        sut = sc.List[str](connection=self.path, compression=sc.Compression("zlib_dict"))
+        sut.optimize()
+        self.assertEqual(list(sut), [])
+        with self.assertRaisesRegex(ValueError, "unknown compression dictionary version: 7"):
+            decompress(b"\x04\x00\x00\x00\x07abc")
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+class ConnectionPoolTestCase(DatabaseFileTestCase):
+    def test_init(self) -> None:
+        sut = sc.ConnectionPool(self.path, timeout=1.5)
+        self.assertEqual(sut.database, self.path)
+        self.assertEqual(sut.timeout, 1.5)
+        self.assertTrue(sut.wal)
+        self.assert_sql_result_equals(sut.connection, "PRAGMA journal_mode", [("wal",)])
+        sut.close()
+        with self.assertRaisesRegex(ValueError, "ConnectionPool requires a database file shared by all connections"):
+            sc.ConnectionPool(":memory:")
+
+    def test_connection_per_thread(self) -> None:
+        sut = sc.ConnectionPool(self.path)
+        main_connection = sut.connection
+        self.assertIs(sut.connection, main_connection)
+        connections: Any = []
+
+        def get_connection() -> None:
+            connections.append(sut.connection)
+            connections.append(sut.connection)
+
+        thread = threading.Thread(target=get_connection)
+        thread.start()
+        thread.join()
+        self.assertIs(connections[0], connections[1])
+        self.assertIsNot(connections[0], main_connection)
+        sut.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            main_connection.cursor()
+        self.assertIsNot(sut.connection, main_connection)
+        sut.close()
+
+    def test_connections_of_exited_threads_are_closed(self) -> None:
+        sut = sc.ConnectionPool(self.path)
+        connections: Any = []
+        for _ in range(3):
+            thread = threading.Thread(target=lambda: connections.append(sut.connection))
+            thread.start()
+            thread.join()
+        self.assertEqual(len(sut._connections), 1)
+        for conn in connections[:2]:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.cursor()
+        self.assert_sql_result_equals(connections[2], "SELECT 1", [(1,)])
+        main_connection = sut.connection
+        self.assertEqual(len(sut._connections), 1)
+        self.assertIs(sut.connection, main_connection)
+        sut.close()
+
+    def test_collection_with_pool(self) -> None:
+        pool = sc.ConnectionPool(self.path)
+        sut = sc.Dict[int, int](connection=pool, table_name="items", data={i: i for i in range(100)})
+        self.assertIs(sut.connection_pool, pool)
+        self.assertIs(sut.connection, pool.connection)
+
+        def read(i: int) -> int:
+            return sum(sut[j] for j in range(i, i + 10))
+
+        def write(i: int) -> None:
+            sut[i + 100] = i
+
+        with ThreadPoolExecutor(4) as executor:
+            actual = list(executor.map(read, range(90)))
+            list(executor.map(write, range(50)))
+        self.assertEqual(actual, [sum(range(i, i + 10)) for i in range(90)])
+        self.assertEqual(len(sut), 150)
+        copied = sut.copy()
+        self.assertIs(copied.connection_pool, pool)
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(executor.submit(len, copied).result(), 150)
+        del copied
+        pool.close()
+
+    def test_failed_write_is_rolled_back(self) -> None:
+        pool = sc.ConnectionPool(self.path)
+        sut = sc.Set[Any](connection=pool, table_name="items", data=[1])
+        with self.assertRaisesRegex(TypeError, "unhashable type: 'list'"):
+            sut.update([2, 3, []])
+        self.assertFalse(pool.connection.in_transaction)
+        self.assertEqual(set(sut), {1})
+
+        def add(x: int) -> None:
+            sut.add(x)
+
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(add, range(2, 10)))
+        self.assertEqual(set(sut), set(range(1, 10)))
+        pool.close()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_reconnect_after_fork(self) -> None:
+        pool = sc.ConnectionPool(self.path)
+        sut = sc.Dict[str, int](connection=pool, table_name="items")
+        parent_connection = pool.connection
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = pool.connection is not parent_connection
+                sut["child"] = 1
+                os._exit(0 if ok else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        self.assertIs(pool.connection, parent_connection)
+        self.assertEqual(sut["child"], 1)
+        pool.close()
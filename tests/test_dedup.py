@@ -0,0 +1,134 @@
+import sqlite3
+from hashlib import sha256
+from typing import Any, List, Tuple
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+class DeduplicationTestCase(DatabaseFileTestCase):
+    def assert_blobs_equal(self, conn: sqlite3.Connection, expected: List[Tuple[bytes, int]]) -> None:
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT serialized_value, refcount FROM main.metadata_blobs ORDER BY serialized_value",
+            sorted(expected),
+        )
+
+    def test_list(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.List[str](
+            connection=conn,
+            table_name="items",
+            serializer=str.encode,
+            deserializer=bytes.decode,
+            data=["a", "b", "a", "a"],
+            deduplicate=True,
+        )
+        self.assertTrue(sut.deduplicate)
+        self.assertEqual(list(sut), ["a", "b", "a", "a"])
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT serialized_value FROM items ORDER BY item_index",
+            [(sha256(d).digest(),) for d in (b"a", b"b", b"a", b"a")],
+        )
+        self.assert_blobs_equal(conn, [(b"a", 3), (b"b", 1)])
+        sut[1] = "a"
+        del sut[0]
+        sut.append("c")
+        self.assertEqual(list(sut), ["a", "a", "a", "c"])
+        self.assertEqual(sut.index("c"), 3)
+        self.assertEqual(sut.count("a"), 3)
+        self.assert_blobs_equal(conn, [(b"a", 3), (b"c", 1)])
+        sut[1:3] = ["d", "a"]
+        sut *= 2
+        self.assertEqual(list(sut[2:4]), ["a", "c"])
+        self.assert_blobs_equal(conn, [(b"a", 4), (b"c", 2), (b"d", 2)])
+        sut.remove("c")
+        self.assertEqual(sut.pop(), "c")
+        sut.clear()
+        self.assert_blobs_equal(conn, [])
+
+    def test_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        snapshot = {"config": list(range(100))}
+        sut = sc.Dict[str, Any](
+            connection=conn, table_name="items", data={"a": snapshot, "b": snapshot}, deduplicate=True
+        )
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs", [(2,)])
+        sut["c"] = snapshot
+        sut["a"] = {}
+        self.assertEqual(sut["b"], snapshot)
+        self.assertEqual(dict(sut.items()), {"a": {}, "b": snapshot, "c": snapshot})
+        self.assertIn({}, sut.values())
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs ORDER BY refcount", [(1,), (2,)])
+        del sut["b"]
+        self.assertEqual(sut.pop("c"), snapshot)
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs", [(1,)])
+
+    def test_dict_setdefault(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, List[int]](connection=conn, table_name="items", deduplicate=True)
+        self.assertEqual(sut.setdefault("a", [1, 2]), [1, 2])
+        self.assertEqual(sut.setdefault("a", [3]), [1, 2])
+        self.assertEqual(sut.setdefault("b", [1, 2]), [1, 2])
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(sc.Dict[str, List[int]](connection=conn, table_name="items")["a"], [1, 2])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs", [(2,)])
+
+    def test_shared_blobs_copy_rename_and_drop(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.List[str](connection=conn, table_name="items", data=["x", "x"], deduplicate=True)
+        other = sc.Dict[str, str](connection=conn, table_name="other", data={"k": "x"}, deduplicate=True)
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs", [(3,)])
+        copied = sut.copy()
+        sliced = sut[:1]
+        self.assertTrue(copied.deduplicate)
+        self.assertEqual(list(sliced), ["x"])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(3,)])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM temp.metadata_blobs", [(3,)])
+        del copied, sliced
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(3,)])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM temp.metadata_blobs", [])
+        sut.table_name = "renamed"
+        sut.append("x")
+        recreated = sc.List[str](connection=conn, table_name="items", data=["x"], deduplicate=True)
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(5,)])
+        del other["k"]
+        recreated.clear()
+        self.assertEqual(list(sut), ["x", "x", "x"])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(3,)])
+
+    def test_enable_on_existing_table_and_reopen(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.List[str](connection=conn, table_name="items", data=["a", "b", "a"])
+        sut = sc.List[str](connection=conn, table_name="items", deduplicate=True)
+        self.assertEqual(list(sut), ["a", "b", "a"])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs ORDER BY refcount", [(1,), (2,)])
+        self.assert_sql_result_equals(
+            conn, "SELECT table_name, name, value FROM metadata_options", [("items", "deduplicate", "1")]
+        )
+        reopened = sc.List[str](connection=sqlite3.connect(self.path), table_name="items")
+        self.assertTrue(reopened.deduplicate)
+        self.assertEqual(reopened[1], "b")
+
+    def test_optimize_removes_unreferenced_blobs(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.List[str](connection=conn, table_name="items", deduplicate=True)
+        sut.append("a")
+        conn.execute("INSERT INTO metadata_blobs (hash, serialized_value, refcount) VALUES (x'00', x'00', 0)")
+        conn.commit()
+        sut.optimize()
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM metadata_blobs", [(1,)])
+
+    def test_invalid_combinations(self) -> None:
+        with self.assertRaisesRegex(ValueError, "deduplicate can't be combined with compression"):
+            sc.List[str](deduplicate=True, compression=sc.Compression())
+        with self.assertRaisesRegex(ValueError, "deduplicate can't be combined with column_type"):
+            sc.List[int](deduplicate=True, column_type=sc.ColumnType.INTEGER)
+        with self.assertRaisesRegex(ValueError, "deduplicate can't be combined with value_column_type"):
+            sc.Dict[str, int](deduplicate=True, value_column_type=sc.ColumnType.INTEGER)
+        conn = sqlite3.connect(self.path)
+        sc.List[str](connection=conn, table_name="items", compression=sc.Compression())
+        with self.assertRaisesRegex(ValueError, "deduplicate can't be combined with compression"):
+            sc.List[str](connection=conn, table_name="items", deduplicate=True)
@@ -3,7 +3,7 @@ import sqlite3
 import sys
 import warnings
 from collections.abc import Hashable
-from typing import Any
+from typing import Any, Generator, cast
 from unittest.mock import MagicMock, patch
 
 if sys.version_info > (3, 9):
@@ -292,6 +292,67 @@ class DictTestCase(SqlTestCase):
         self.assertIsInstance(actual, Iterator)
         self.assertEqual(list(actual), ["a", "b", "c", "d"])
 
+    def test_get_raw_and_iter_raw_items(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Dict[str, int](connection=memory_db, table_name="items", data={"a": 1, "b": 2})
+        self.assertEqual(sut.get_raw("a"), pickle.dumps(1))
+        self.assertEqual(list(sut.iter_raw_items()), [(pickle.dumps(k), pickle.dumps(v)) for k, v in sut.items()])
+        with self.assertRaisesRegex(KeyError, "'c'"):
+            sut.get_raw("c")
+        compressed = sc.Dict[str, str](
+            connection=memory_db, data={"a": "x" * 100}, compression=sc.Compression(threshold=0)
+        )
+        self.assertEqual(compressed.get_raw("a"), pickle.dumps("x" * 100))
+        self.assertEqual(list(compressed.iter_raw_items()), [(pickle.dumps("a"), pickle.dumps("x" * 100))])
+
+    def test_iter_with_fetch_size(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Dict[int, int](connection=memory_db, table_name="items", data={i: i for i in range(10)})
+        self.assertIsNone(sut.fetch_size)
+        self.assertEqual(sut.prefetch, 0)
+        sut.set_fetch_size(3)
+        self.assertEqual(list(sut), list(range(10)))
+        sut.set_fetch_size(3, prefetch=2)
+        self.assertEqual(sut.fetch_size, 3)
+        self.assertEqual(sut.prefetch, 2)
+        self.assertEqual(list(sut), list(range(10)))
+        if sys.version_info >= (3, 8):
+            self.assertEqual(list(reversed(sut)), list(range(9, -1, -1)))
+        it = cast(Generator[int, None, None], iter(sut))
+        self.assertEqual([next(it) for _ in range(4)], [0, 1, 2, 3])
+        it.close()
+        with self.assertRaisesRegex(ValueError, "fetch_size must be positive"):
+            sut.set_fetch_size(0)
+        with self.assertRaisesRegex(ValueError, "prefetch must not be negative"):
+            sut.set_fetch_size(1, prefetch=-1)
+        with self.assertRaisesRegex(ValueError, "prefetch requires fetch_size"):
+            sut.set_fetch_size(None, prefetch=1)
+
+    def test_items_and_values_with_fetch_size(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        data = {f"k{i}": "v" * i for i in range(10)}
+        for kwargs in ({}, {"compression": sc.Compression(threshold=0)}, {"deduplicate": True}):
+            sut = sc.Dict[str, str](connection=memory_db, data=data, **kwargs)  # type: ignore
+            sut["k0"] = "first"
+            with patch.object(sut._driver_class, "get_serialized_value_by_serialized_key", side_effect=AssertionError):
+                self.assertEqual(list(sut.items()), [("k0", "first")] + list(data.items())[1:])
+                self.assertEqual(list(sut.values()), ["first"] + list(data.values())[1:])
+                sut.set_fetch_size(3, prefetch=2)
+                self.assertEqual(list(sut.items()), [("k0", "first")] + list(data.items())[1:])
+                self.assertEqual(list(sut.values()), ["first"] + list(data.values())[1:])
+            self.assertIn(("k3", "vvv"), sut.items())
+            self.assertIn("vvv", sut.values())
+            self.assertEqual(len(sut.items()), 10)
+        sut = sc.Dict[str, str](
+            connection=memory_db,
+            table_name=sut.table_name,
+            value_deserializer=lambda x: 1 // 0,  # type: ignore
+            rebuild_strategy=sc.RebuildStrategy.SKIP,
+        )
+        sut.set_fetch_size(3, prefetch=2)
+        with self.assertRaises(ZeroDivisionError):
+            list(sut.values())
+
     def test_clear(self) -> None:
         memory_db = sqlite3.connect(":memory:")
         self.get_fixture(memory_db, "dict/base.sql")
@@ -577,3 +638,30 @@ class DictTestCase(SqlTestCase):
         )
         del actual
         self.assert_items_table_only(memory_db)
+
+    def test_column_type(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Dict[str, float](
+            connection=memory_db,
+            table_name="items",
+            key_column_type=sc.ColumnType.TEXT,
+            value_column_type=sc.ColumnType.REAL,
+            data={"a": 1, "b": 2.5},
+        )
+        self.assert_dict_state_equals(memory_db, [("a", 1.0, 0), ("b", 2.5, 1)])
+        self.assertEqual(sut["a"], 1.0)
+        self.assertEqual(sut.copy().value_column_type, sc.ColumnType.REAL)
+        with self.assertRaisesRegex(TypeError, "ColumnType.TEXT requires str, not 'int'"):
+            sut[0] = 1.0  # type: ignore
+        self.assertFalse(0 in sut)  # type: ignore
+        self.assertIsNone(sut.get(0))  # type: ignore
+        self.assertEqual(sut.get(0, 2.0), 2.0)  # type: ignore
+        self.assertEqual(sut.pop(0, 3.0), 3.0)  # type: ignore
+        with self.assertRaises(KeyError):
+            sut[0]  # type: ignore
+        with self.assertRaises(KeyError):
+            del sut[0]  # type: ignore
+        numbers = sc.Dict[int, str](connection=memory_db, key_column_type=sc.ColumnType.INTEGER, data={1: "a"})
+        self.assertFalse("a" in numbers)  # type: ignore
+        self.assertEqual(numbers.get("a", "b"), "b")  # type: ignore
+        self.assertEqual(numbers[1.0], "a")  # type: ignore
@@ -0,0 +1,121 @@
+import pickle
+import sqlite3
+import sys
+from typing import Any
+from unittest.mock import patch
+
+from test_base import SqlTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.base import _SqliteCollectionBaseDatabaseDriver
+
+
+class IntegerKeyDictTestCase(SqlTestCase):
+    def assert_dict_state_equals(self, conn: sqlite3.Connection, expected: Any) -> None:
+        return self.assert_sql_result_equals(
+            conn,
+            "SELECT serialized_key, serialized_value FROM items ORDER BY serialized_key",
+            expected,
+        )
+
+    def test_initialize(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[Any](connection=memory_db, table_name="items")
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "IntegerKeyDict")])
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name, type, pk FROM pragma_table_info('items') ORDER BY cid",
+            [("serialized_key", "INTEGER", 1), ("serialized_value", "BLOB", 0)],
+        )
+        self.assertFalse(sut.ordered)
+
+    def test_initialize_ordered(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[Any](connection=memory_db, table_name="items", ordered=True)
+        self.assert_metadata_state_equals(memory_db, [("items", "0_ordered", "IntegerKeyDict")])
+        self.assertTrue(sut.ordered)
+
+    def test_setitem_stores_key_as_integer(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[Any](connection=memory_db, table_name="items")
+        sut[2**40] = "a"
+        sut[-1] = ["b"]
+        sut[2**40] = "c"
+        self.assert_dict_state_equals(memory_db, [(-1, pickle.dumps(["b"])), (2**40, pickle.dumps("c"))])
+        self.assertEqual(sut[2**40], "c")
+        self.assertTrue(-1 in sut)
+        self.assertFalse(0 in sut)
+        with self.assertRaisesRegex(TypeError, "IntegerKeyDict keys must be int, not 'str'"):
+            sut["a"] = 0  # type: ignore
+        with self.assertRaises(OverflowError):
+            sut[2**63] = 0
+
+    def test_lookup_of_other_keys(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[str](connection=memory_db, table_name="items", data={1: "a"})
+        for key in ["a", 2**64, 1.5, None]:
+            self.assertFalse(key in sut)
+            self.assertIsNone(sut.get(key))  # type: ignore
+            self.assertEqual(sut.pop(key, "default"), "default")  # type: ignore
+            with self.assertRaises(KeyError):
+                sut[key]  # type: ignore
+            with self.assertRaises(KeyError):
+                del sut[key]  # type: ignore
+        self.assertTrue(1.0 in sut)
+        self.assertEqual(sut[1.0], "a")  # type: ignore
+        sut[2.0] = "b"  # type: ignore
+        self.assertEqual(list(sut.items()), [(1, "a"), (2, "b")])
+        self.assertEqual(sut.pop(2.0), "b")  # type: ignore
+        with self.assertRaisesRegex(TypeError, "IntegerKeyDict keys must be int, not 'float'"):
+            sut[1.5] = "c"  # type: ignore
+
+    def test_reopen_with_other_layout(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sc.IntegerKeyDict[str](connection=memory_db, table_name="items", data={5: "a", 1: "b", 3: "c"})
+        with patch.object(_SqliteCollectionBaseDatabaseDriver, "row_batch_size", 2):
+            sut = sc.IntegerKeyDict[str](connection=memory_db, table_name="items", ordered=True)
+        self.assertTrue(sut.ordered)
+        self.assert_metadata_state_equals(memory_db, [("items", "0_ordered", "IntegerKeyDict")])
+        sut[2] = "d"
+        self.assertEqual(list(sut), [1, 3, 5, 2])
+        kept = sc.IntegerKeyDict[str](connection=memory_db, table_name="items")
+        self.assertTrue(kept.ordered)
+        self.assertEqual(list(kept), [1, 3, 5, 2])
+        sut = sc.IntegerKeyDict[str](connection=memory_db, table_name="items", ordered=False)
+        self.assertFalse(sut.ordered)
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "IntegerKeyDict")])
+        self.assertEqual(list(sut.items()), [(1, "b"), (2, "d"), (3, "c"), (5, "a")])
+
+    def test_iteration_order(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[str](connection=memory_db, table_name="items", data={5: "a", 1: "b", 3: "c"})
+        self.assertEqual(list(sut), [1, 3, 5])
+        self.assertEqual(sut.popitem(), (5, "a"))
+        ordered = sc.IntegerKeyDict[str](
+            connection=memory_db, table_name="ordered_items", ordered=True, data={5: "a", 1: "b", 3: "c"}
+        )
+        self.assertEqual(list(ordered), [5, 1, 3])
+        self.assertEqual(list(ordered.items()), [(5, "a"), (1, "b"), (3, "c")])
+        self.assertEqual(ordered.popitem(), (3, "c"))
+        if sys.version_info >= (3, 8):
+            self.assertEqual(list(reversed(sut)), [3, 1])
+            self.assertEqual(list(reversed(ordered)), [1, 5])
+
+    def test_irange(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        for ordered in (False, True):
+            sut = sc.IntegerKeyDict[int](
+                connection=memory_db, table_name=f"items_{ordered}", ordered=ordered, data={i: i for i in (9, 1, 5, 3)}
+            )
+            self.assertEqual(list(sut.irange()), [1, 3, 5, 9])
+            self.assertEqual(list(sut.irange(3, 9)), [3, 5, 9])
+            self.assertEqual(list(sut.irange(3, 9, inclusive=(False, False))), [5])
+            self.assertEqual(list(sut.irange(maximum=5, reverse=True)), [5, 3, 1])
+
+    def test_copy(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.IntegerKeyDict[str](connection=memory_db, table_name="items", ordered=True, data={2: "a", 1: "b"})
+        actual = sut.copy()
+        self.assertIsInstance(actual, sc.IntegerKeyDict)
+        self.assertTrue(actual.ordered)
+        self.assertEqual(list(actual.items()), [(2, "a"), (1, "b")])
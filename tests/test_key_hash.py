@@ -0,0 +1,127 @@
+import sqlite3
+from typing import List, Tuple
+from unittest.mock import patch
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.base import (
+    _SqliteCollectionBaseDatabaseDriver,
+    hash_serialized_key,
+)
+
+
+class KeyHashTestCase(DatabaseFileTestCase):
+    def assert_indexes_equal(self, conn: sqlite3.Connection, table_name: str, expected: List[Tuple[str]]) -> None:
+        self.assert_sql_result_equals(
+            conn, f"SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='{table_name}'", expected
+        )
+
+    def test_hash_serialized_key(self) -> None:
+        self.assertEqual(hash_serialized_key(b"abc"), hash_serialized_key(b"abc"))
+        self.assertNotEqual(hash_serialized_key(b"abc"), hash_serialized_key(b"abd"))
+        self.assertTrue(-(2**63) <= hash_serialized_key(b"abc") < 2**63)
+
+    def test_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, int](connection=conn, table_name="items", data={"a": 1, "b": 2}, key_hash=True)
+        self.assertTrue(sut.key_hash)
+        self.assertEqual(sut.schema_version, "0_key_hash")
+        sut["c"] = 3
+        sut["a"] = 4
+        del sut["b"]
+        self.assertEqual(list(sut.items()), [("a", 4), ("c", 3)])
+        self.assertIn("c", sut)
+        self.assertNotIn("b", sut)
+        self.assertEqual(sut.pop("c"), 3)
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT key_hash FROM items",
+            [(hash_serialized_key(sut.serialize_key("a")),)],
+        )
+        self.assert_sql_result_equals(
+            conn, "SELECT schema_version FROM metadata WHERE table_name='items'", [("0_key_hash",)]
+        )
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT serialized_value FROM items WHERE key_hash=? AND serialized_key=?", (0, b"")
+        ).fetchall()
+        self.assertIn("(key_hash=?)", plan[0][-1])
+        self.assert_indexes_equal(conn, "items", [("items_key_hash",)])
+        reopened = sc.Dict[str, int](connection=conn, table_name="items")
+        self.assertTrue(reopened.key_hash)
+        self.assertEqual(reopened["a"], 4)
+        copied = sut.copy()
+        self.assertTrue(copied.key_hash)
+        self.assertEqual(dict(copied.items()), {"a": 4})
+        sut.table_name = "renamed"
+        self.assert_indexes_equal(conn, "renamed", [("renamed_key_hash",)])
+        self.assertEqual(sut["a"], 4)
+        with self.assertRaisesRegex(ValueError, "key_hash can't be combined with key_column_type"):
+            sc.Dict[int, int](key_column_type=sc.ColumnType.INTEGER, key_hash=True)
+
+    def test_hash_collisions(self) -> None:
+        with patch("sqlitecollections.dict.hash_serialized_key", return_value=0), patch(
+            "sqlitecollections.set.hash_serialized_key", return_value=0
+        ):
+            d = sc.Dict[str, str](connection=self.path, key_hash=True, data={"a": "x", "b": "y"})
+            d["c"] = "z"
+            d["a"] = "w"
+            self.assertEqual(d["b"], "y")
+            del d["b"]
+            self.assertEqual(list(d.items()), [("a", "w"), ("c", "z")])
+            s = sc.Set[str](connection=self.path, key_hash=True, data=["a", "b", "c"])
+            s.add("a")
+            s.discard("b")
+            self.assertEqual(sorted(s), ["a", "c"])
+            self.assertIn("c", s)
+            self.assertNotIn("b", s)
+            s.intersection_update(["c", "d"])
+            self.assertEqual(sorted(s), ["c"])
+            s.symmetric_difference_update(["c", "e"])
+            self.assertEqual(sorted(s), ["e"])
+
+    def test_migrate_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.Dict[str, bytes](connection=conn, table_name="items", data={"a": b"x" * 100, "b": b"y"}, deduplicate=True)
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", key_hash=True, deduplicate=True)
+        self.assertTrue(sut.key_hash)
+        self.assertEqual(list(sut.items()), [("a", b"x" * 100), ("b", b"y")])
+        self.assert_sql_result_equals(
+            conn, "SELECT schema_version FROM metadata WHERE table_name='items'", [("0_key_hash",)]
+        )
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_blobs", [(2,)])
+        del sut["a"]
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_blobs", [(1,)])
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", key_hash=False)
+        self.assertFalse(sut.key_hash)
+        self.assertEqual(list(sut.items()), [("b", b"y")])
+        self.assert_sql_result_equals(conn, "SELECT schema_version FROM metadata WHERE table_name='items'", [("0",)])
+        self.assertNotIn("key_hash", [d[1] for d in conn.execute("PRAGMA table_info(items)")])
+
+    def test_migrate_in_batches(self) -> None:
+        conn = sqlite3.connect(self.path)
+        with patch.object(_SqliteCollectionBaseDatabaseDriver, "row_batch_size", 2):
+            d = sc.Dict[int, str](connection=conn, table_name="d", data={i: str(i) for i in range(5, 0, -1)})
+            d = sc.Dict[int, str](connection=conn, table_name="d", key_hash=True)
+            s = sc.Set[int](connection=conn, table_name="s", data=range(5))
+            s = sc.Set[int](connection=conn, table_name="s", key_hash=True)
+        self.assertEqual(list(d.items()), [(i, str(i)) for i in range(5, 0, -1)])
+        self.assertEqual(sorted(s), list(range(5)))
+        self.assertIn(3, s)
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM s", [(5,)])
+
+    def test_migrate_set(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.Set[str](connection=conn, table_name="items", data=["a", "b"])
+        sut = sc.Set[str](connection=conn, table_name="items", key_hash=True)
+        self.assertTrue(sut.key_hash)
+        self.assertEqual(sorted(sut), ["a", "b"])
+        self.assertIn("a", sut)
+        self.assert_indexes_equal(conn, "items", [("items_key_hash",)])
+        self.assertTrue(sc.Set[str](connection=conn, table_name="items").key_hash)
+        self.assertTrue(sut.copy().key_hash)
+        sut = sc.Set[str](connection=conn, table_name="items", key_hash=False)
+        self.assertEqual(sut.schema_version, "0")
+        self.assertEqual(sorted(sut), ["a", "b"])
+        with self.assertRaisesRegex(ValueError, "key_hash can't be combined with column_type"):
+            sc.Set[int](column_type=sc.ColumnType.INTEGER, key_hash=True)
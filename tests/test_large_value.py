@@ -0,0 +1,121 @@
+import os
+import pickle
+import sqlite3
+from typing import List
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+class LargeValueTestCase(DatabaseFileTestCase):
+    def test_write_and_read(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, bytes](
+            connection=conn, table_name="items", value_serializer=bytes, value_deserializer=bytes, data={"a": b"x"}
+        )
+        payload = os.urandom(2500)
+        with sut.open_value("big", "wb", chunk_size=1000) as f:
+            for i in range(0, len(payload), 300):
+                f.write(payload[i : i + 300])
+        self.assert_sql_result_equals(
+            conn,
+            "SELECT chunk_index, length(data) FROM metadata_chunks ORDER BY chunk_index",
+            [(0, 1000), (1, 1000), (2, 500)],
+        )
+        self.assert_sql_result_equals(conn, "SELECT typeof(serialized_value) FROM items", [("blob",), ("integer",)])
+        self.assertEqual(sut["big"], payload)
+        self.assertEqual(dict(sut.items())["big"], payload)
+        with sut.open_value("big") as f:
+            self.assertEqual(f.read(10), payload[:10])
+            self.assertEqual(f.read(1500), payload[10:1510])
+            self.assertEqual(f.read(), payload[1510:])
+        with sut.open_value("a") as f:
+            self.assertEqual(f.read(), b"x")
+        with self.assertRaises(KeyError):
+            sut.open_value("missing")
+
+    def test_stream_pickle(self) -> None:
+        sut = sc.Dict[str, List[List[int]]](connection=self.path, table_name="items")
+        value = [list(range(100)) for _ in range(50)]
+        with sut.open_value("k", "wb", chunk_size=256) as f:
+            pickle.dump(value, f)
+        with sut.open_value("k") as f:
+            self.assertEqual(pickle.load(f), value)
+        self.assertEqual(sut["k"], value)
+        self.assertEqual(sut.copy()["k"], value)
+        reopened = sc.Dict[str, List[List[int]]](connection=self.path, table_name="items")
+        self.assertEqual(reopened["k"], value)
+
+    def test_integer_key_dict_reopen(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.IntegerKeyDict[bytes](
+            connection=conn, table_name="items", value_serializer=bytes, value_deserializer=bytes
+        )
+        with sut.open_value(1, "wb", chunk_size=4) as f:
+            f.write(b"x" * 10)
+        sut[2] = b"y"
+        for rebuild_strategy in (sc.RebuildStrategy.CHECK_WITH_FIRST_ELEMENT, sc.RebuildStrategy.ALWAYS):
+            reopened = sc.IntegerKeyDict[bytes](
+                connection=conn,
+                table_name="items",
+                value_serializer=bytes,
+                value_deserializer=bytes,
+                rebuild_strategy=rebuild_strategy,
+            )
+            self.assertEqual(dict(reopened.items()), {1: b"x" * 10, 2: b"y"})
+            self.assert_sql_result_equals(
+                conn, "SELECT typeof(serialized_value) FROM items ORDER BY serialized_key", [("integer",), ("blob",)]
+            )
+            self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(3,)])
+
+    def test_chunks_are_removed_with_value(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", value_serializer=bytes, value_deserializer=bytes)
+        for key in ("a", "b", "a"):
+            with sut.open_value(key, "wb", chunk_size=4) as f:
+                f.write(key.encode() * 10)
+        self.assert_sql_result_equals(conn, "SELECT COUNT(DISTINCT value_id) FROM metadata_chunks", [(2,)])
+        self.assertEqual(sut["a"], b"a" * 10)
+        sut["a"] = b"inline"
+        self.assert_sql_result_equals(conn, "SELECT COUNT(DISTINCT value_id) FROM metadata_chunks", [(1,)])
+        sut.table_name = "renamed"
+        del sut["b"]
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(0,)])
+        with sut.open_value("c", "wb") as f:
+            f.write(b"c")
+        volatile = sc.Dict[str, bytes](connection=conn, persist=False)
+        with volatile.open_value("d", "wb") as f:
+            f.write(b"d")
+        del sut["c"]
+        del volatile, f
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(0,)])
+
+    def test_abort_on_error(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", data={"a": b"old"})
+        with self.assertRaises(RuntimeError):
+            with sut.open_value("a", "wb", chunk_size=2) as f:
+                f.write(b"new value")
+                raise RuntimeError
+        self.assertEqual(sut["a"], b"old")
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(0,)])
+
+    def test_abandoned_writer_is_discarded(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", data={"a": b"old"})
+        f = sut.open_value("a", "wb", chunk_size=2)
+        f.write(b"partial")
+        del f
+        self.assertEqual(sut["a"], b"old")
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(0,)])
+
+    def test_invalid_arguments(self) -> None:
+        sut = sc.Dict[str, int](value_column_type=sc.ColumnType.INTEGER)
+        with self.assertRaisesRegex(ValueError, "open_value can't be used with value_column_type"):
+            sut.open_value("a", "wb")
+        blobs = sc.Dict[str, bytes]()
+        with self.assertRaisesRegex(ValueError, "invalid mode: 'r'"):
+            blobs.open_value("a", "r")
+        with self.assertRaisesRegex(ValueError, "chunk_size must be positive"):
+            blobs.open_value("a", "wb", chunk_size=0)
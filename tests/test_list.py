@@ -612,6 +612,25 @@ class ListTestCase(SqlTestCase):
         actual = len(sut)
         self.assertEqual(actual, expected)
 
+    def test_iter_with_fetch_size(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        data = ["v" * i for i in range(10)]
+        for kwargs in ({}, {"compression": sc.Compression(threshold=0)}, {"deduplicate": True}):
+            sut = sc.List[str](connection=memory_db, data=data, **kwargs)  # type: ignore
+            with patch.object(sut._driver_class, "get_serialized_value_by_index", side_effect=AssertionError):
+                self.assertEqual(list(sut), data)
+                sut.set_fetch_size(3, prefetch=2)
+                self.assertEqual(list(sut), data)
+        sut = sc.List[str](
+            connection=memory_db,
+            table_name=sut.table_name,
+            deserializer=lambda x: 1 // 0,  # type: ignore
+            rebuild_strategy=sc.RebuildStrategy.SKIP,
+        )
+        sut.set_fetch_size(3, prefetch=2)
+        with self.assertRaises(ZeroDivisionError):
+            list(sut)
+
     def test_index(self) -> None:
         memory_db = sqlite3.connect(":memory:")
         self.get_fixture(memory_db, "list/base.sql")
@@ -826,3 +845,55 @@ class ListTestCase(SqlTestCase):
             memory_db,
             generate_expected([(1, 3), (2, 2), (7, 2), (5, 1), (8, 1), (4, 1), (9, 0), (3, 0), (0, 0), (6, 0)]),
         )
+
+    def test_column_type(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.List[int](
+            connection=memory_db, table_name="items", column_type=sc.ColumnType.INTEGER, data=[3, 1, 2**70, 2]
+        )
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT serialized_value, typeof(serialized_value) FROM items ORDER BY item_index",
+            [(3, "integer"), (1, "integer"), (pickle.dumps(2**70), "blob"), (2, "integer")],
+        )
+        self.assertEqual(list(sut), [3, 1, 2**70, 2])
+        self.assertEqual(sut.index(2), 3)
+        with self.assertRaisesRegex(TypeError, "ColumnType.INTEGER requires int, not 'str'"):
+            sut.append("a")  # type: ignore
+        with self.assertRaisesRegex(ValueError, "column_type cannot be used together with serializer"):
+            _ = sc.List[int](connection=memory_db, column_type=sc.ColumnType.INTEGER, serializer=pickle.dumps)
+
+    def test_column_type_lookup_of_other_types(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.List[str](connection=memory_db, table_name="items", column_type=sc.ColumnType.TEXT, data=["a", "b"])
+        self.assertFalse(5 in sut)  # type: ignore
+        self.assertEqual(sut.count(5), 0)  # type: ignore
+        with self.assertRaisesRegex(ValueError, "'5' is not in list"):
+            sut.index(5)
+        with self.assertRaisesRegex(ValueError, "'5' is not in list"):
+            sut.remove(5)  # type: ignore
+        numbers = sc.List[int](connection=memory_db, column_type=sc.ColumnType.INTEGER, data=[1, 2, 2])
+        self.assertTrue(2.0 in numbers)
+        self.assertEqual(numbers.count(2.0), 2)  # type: ignore
+        self.assertEqual(numbers.index(True), 0)
+
+    def test_column_type_sort(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.List[str](
+            connection=memory_db, table_name="items", column_type=sc.ColumnType.TEXT, data=["b", "c", "a", "b"]
+        )
+        sut.sort()
+        self.assertEqual(list(sut), ["a", "b", "b", "c"])
+        sut.sort(reverse=True)
+        self.assertEqual(list(sut), ["c", "b", "b", "a"])
+        sut.sort(key=lambda x: x == "b")
+        self.assertEqual(list(sut), ["c", "a", "b", "b"])
+
+    def test_column_type_rebuild_from_pickled(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        _ = sc.List[float](connection=memory_db, table_name="items", data=[0.5, 1.5])
+        sut = sc.List[float](connection=memory_db, table_name="items", column_type=sc.ColumnType.REAL)
+        self.assert_sql_result_equals(
+            memory_db, "SELECT serialized_value, item_index FROM items ORDER BY item_index", [(0.5, 0), (1.5, 1)]
+        )
+        self.assertEqual(list(sut), [0.5, 1.5])
@@ -0,0 +1,138 @@
+import operator
+import pickle
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def key_and_double(item: Tuple[str, int]) -> Tuple[str, int]:
+    return (item[0], item[1] * 2)
+
+
+class PickleTestCase(DatabaseFileTestCase):
+    def test_pickle_by_reference(self) -> None:
+        original = sc.List[int](connection=sqlite3.connect(self.path), table_name="items", data=[1, 2, 3])
+        sut = pickle.loads(pickle.dumps(original))
+        self.assertIsInstance(sut, sc.List)
+        self.assertEqual(sut.table_name, "items")
+        self.assertFalse(sut.readonly)
+        self.assertEqual(list(sut), [1, 2, 3])
+        sut.append(4)
+        self.assertEqual(list(original), [1, 2, 3, 4])
+        self.assertLess(len(pickle.dumps(original)), 1024)
+
+    def test_pickle_dict(self) -> None:
+        original = sc.Dict[str, int](connection=self.path, table_name="items", data={"a": 1, "b": 2})
+        sut = pickle.loads(pickle.dumps(original))
+        self.assertEqual(list(sut.items()), [("a", 1), ("b", 2)])
+
+    def test_pickle_leaves_out_caches(self) -> None:
+        original = sc.Set[int](connection=self.path, table_name="items", data=range(1000), bloom_filter=True)
+        size = len(pickle.dumps(original))
+        self.assertIn(3, original)
+        self.assertNotIn(-1, original)
+        self.assertEqual(len(pickle.dumps(original)), size)
+        sut = pickle.loads(pickle.dumps(original))
+        self.assertTrue(sut.bloom_filter)
+        self.assertIn(3, sut)
+        self.assertNotIn(-1, sut)
+
+        compression = sc.Compression("zlib_dict", dictionary_size=1024, sample_size=20)
+        records = {f"k{i}": f"value {i} " * 20 for i in range(50)}
+        compressed = sc.Dict[str, str](
+            connection=self.path, table_name="compressed", data=records, compression=compression
+        )
+        compressed.optimize()
+        size = len(pickle.dumps(compressed))
+        self.assertEqual(compressed["k1"], records["k1"])
+        self.assertEqual(len(pickle.dumps(compressed)), size)
+        self.assertLess(size, 1024)
+        restored = pickle.loads(pickle.dumps(compressed))
+        restored["new"] = "value new " * 20
+        self.assertEqual(dict(compressed.items()), {**records, "new": "value new " * 20})
+        self.assert_sql_result_equals(
+            sqlite3.connect(self.path),
+            "SELECT substr(serialized_value, 1, 1) FROM compressed ORDER BY item_order DESC LIMIT 1",
+            [(b"\x04",)],
+        )
+
+    def test_pickle_volatile_container_does_not_drop_table(self) -> None:
+        original = sc.List[int](connection=self.path, table_name="items", data=[1, 2, 3], persist=False)
+        sut = pickle.loads(pickle.dumps(original))
+        del sut
+        self.assertEqual(list(original), [1, 2, 3])
+
+    def test_pickle_in_memory_database(self) -> None:
+        sut = sc.List[int](connection=":memory:", data=[1, 2, 3])
+        with self.assertRaisesRegex(TypeError, "cannot pickle 'List' backed by an in-memory database"):
+            pickle.dumps(sut)
+
+    def test_as_readonly(self) -> None:
+        original = sc.List[int](connection=self.path, table_name="items", data=[1, 2, 3])
+        sut = original.as_readonly()
+        self.assertTrue(sut.readonly)
+        self.assertEqual(list(sut), [1, 2, 3])
+        with self.assertRaisesRegex(sqlite3.OperationalError, "readonly database"):
+            sut.append(4)
+        self.assertTrue(pickle.loads(pickle.dumps(sut)).readonly)
+
+
+class ParallelMapTestCase(DatabaseFileTestCase):
+    def test_parallel_map_list(self) -> None:
+        sut = sc.List[int](connection=self.path, data=range(100))
+        self.assertEqual(sut.parallel_map(square, workers=3), [d * d for d in range(100)])
+        del sut[10:20]
+        self.assertEqual(sut.parallel_map(square, workers=4), [d * d for d in sut])
+
+    def test_parallel_map_dict(self) -> None:
+        data = {f"k{i}": i for i in range(50)}
+        sut = sc.Dict[str, int](connection=self.path, data=data)
+        self.assertEqual(sut.parallel_map(key_and_double, workers=4), [(k, v * 2) for k, v in data.items()])
+
+    def test_parallel_map_set_and_empty(self) -> None:
+        sut = sc.Set[int](connection=self.path, data=range(20))
+        self.assertEqual(sorted(sut.parallel_map(square, workers=2)), [d * d for d in range(20)])
+        empty = sc.List[int](connection=self.path)
+        self.assertEqual(empty.parallel_map(square, workers=2), [])
+        with self.assertRaisesRegex(ValueError, "workers must be positive"):
+            empty.parallel_map(square, workers=0)
+
+
+class PartitionsTestCase(DatabaseFileTestCase):
+    def test_partitions(self) -> None:
+        sut = sc.List[int](connection=self.path, data=range(100))
+        partitions = sut.partitions(4)
+        self.assertEqual(len(partitions), 4)
+        self.assertEqual([len(list(d)) for d in partitions], [25, 25, 25, 25])
+        self.assertEqual([d for p in partitions for d in p], list(range(100)))
+        self.assertEqual([len(d) for d in partitions[0].batches(10)], [10, 10, 5])
+        self.assertEqual(list(pickle.loads(pickle.dumps(partitions[1]))), list(range(25, 50)))
+        self.assertEqual(len(sut.partitions(200)), 100)
+        self.assertEqual([list(d) for d in sc.List[int](connection=self.path).partitions(3)], [[]])
+        with self.assertRaisesRegex(ValueError, "n must be positive"):
+            sut.partitions(0)
+
+    def test_partitions_dict(self) -> None:
+        data = {f"k{i}": i for i in range(30)}
+        sut = sc.Dict[str, int](connection=self.path, data=data)
+        self.assertEqual([d for p in sut.partitions(4) for d in p], list(data.items()))
+
+    def test_map_reduce(self) -> None:
+        sut = sc.List[int](connection=self.path, data=range(100))
+        self.assertEqual(sut.map_reduce(square, operator.add, workers=3), sum(d * d for d in range(100)))
+        with ThreadPoolExecutor(4) as executor:
+            self.assertEqual(
+                sut.map_reduce(str, operator.add, executor=executor, workers=4), "".join(str(d) for d in range(100))
+            )
+        empty = sc.Set[int](connection=self.path)
+        self.assertEqual(empty.map_reduce(square, operator.add, initial=0, workers=2), 0)
+        with self.assertRaisesRegex(TypeError, "map_reduce\\(\\) of empty container with no initial value"):
+            empty.map_reduce(square, operator.add, workers=2)
@@ -0,0 +1,95 @@
+import pickle
+import sqlite3
+from typing import Any
+
+from test_base import SqlTestCase
+
+import sqlitecollections as sc
+
+
+class PriorityQueueTestCase(SqlTestCase):
+    def assert_queue_state_equals(self, conn: sqlite3.Connection, expected: Any) -> None:
+        return self.assert_sql_result_equals(
+            conn,
+            "SELECT sequence, priority, serialized_value FROM items ORDER BY sequence",
+            expected,
+        )
+
+    def test_initialize(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.PriorityQueue[str](connection=memory_db, table_name="items", data=[("a", 2), ("b", 1)])
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "PriorityQueue")])
+        self.assert_queue_state_equals(memory_db, [(1, 2.0, pickle.dumps("a")), (2, 1.0, pickle.dumps("b"))])
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name FROM pragma_index_info('items_priority') ORDER BY seqno",
+            [("priority",), ("sequence",)],
+        )
+        self.assertEqual(len(sut), 2)
+        self.assertEqual(list(sut), ["b", "a"])
+        self.assertTrue("a" in sut)
+        self.assertFalse("c" in sut)
+
+    def test_push_pop_fifo(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.PriorityQueue[str](connection=memory_db, table_name="items")
+        sut.push("low", 10)
+        sut.push("first", 1)
+        sut.push("second", 1)
+        sut.push("default")
+        self.assertEqual(sut.peek(), "default")
+        self.assertEqual([sut.pop() for _ in range(4)], ["default", "first", "second", "low"])
+        with self.assertRaisesRegex(IndexError, "pop from an empty priority queue"):
+            sut.pop()
+        with self.assertRaisesRegex(IndexError, "peek from an empty priority queue"):
+            sut.peek()
+        with self.assertRaisesRegex(ValueError, "priority must not be nan"):
+            sut.push("x", float("nan"))
+        with self.assertRaisesRegex(TypeError, "priority must be a real number, not 'str'"):
+            sut.push("x", "1")  # type: ignore
+
+    def test_pushpop(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.PriorityQueue[str](connection=memory_db, table_name="items")
+        self.assertEqual(sut.pushpop("a", 1), "a")
+        self.assertEqual(len(sut), 0)
+        sut.push("b", 2)
+        self.assertEqual(sut.pushpop("a", 1), "a")
+        self.assertEqual(sut.pushpop("c", 2), "b")
+        self.assertEqual(sut.pushpop("d", 3), "c")
+        self.assertEqual(list(sut), ["d"])
+
+    def test_push_many_and_nsmallest(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.PriorityQueue[int](connection=memory_db, table_name="items")
+        sut.push_many((i, -(i % 3)) for i in range(9))
+        self.assertEqual(len(sut), 9)
+        self.assertEqual(sut.nsmallest(4), [2, 5, 8, 1])
+        self.assertEqual(sut.nsmallest(0), [])
+        self.assertEqual(sut.nsmallest(100), [2, 5, 8, 1, 4, 7, 0, 3, 6])
+        self.assertEqual(len(sut), 9)
+        sut.clear()
+        self.assertEqual(len(sut), 0)
+
+    def test_rebuild(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sc.PriorityQueue[str](connection=memory_db, table_name="items", data=[("a", 2), ("b", 1)])
+        sut = sc.PriorityQueue[str](
+            connection=memory_db,
+            table_name="items",
+            serializer=lambda x: x.encode("utf-8"),
+            deserializer=lambda x: x.decode("utf-8") if x[:1] != b"\x80" else pickle.loads(x),
+        )
+        self.assert_queue_state_equals(memory_db, [(1, 2.0, b"a"), (2, 1.0, b"b")])
+        self.assertEqual(sut.pop(), "b")
+
+    def test_table_name(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.PriorityQueue[str](connection=memory_db, table_name="items", data=[("a", 1)])
+        sut.table_name = "renamed"
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='renamed'",
+            [("renamed_priority",)],
+        )
+        self.assertEqual(sut.pop(), "a")
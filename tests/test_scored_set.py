@@ -0,0 +1,124 @@
+import pickle
+import sqlite3
+from typing import Any
+
+from test_base import SqlTestCase
+
+import sqlitecollections as sc
+
+
+class ScoredSetTestCase(SqlTestCase):
+    def assert_scored_set_state_equals(self, conn: sqlite3.Connection, expected: Any) -> None:
+        return self.assert_sql_result_equals(
+            conn,
+            "SELECT serialized_member, score FROM items ORDER BY score, serialized_member",
+            expected,
+        )
+
+    def test_initialize(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 2, "b": 1.5})
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "ScoredSet")])
+        self.assert_scored_set_state_equals(memory_db, [(pickle.dumps("b"), 1.5), (pickle.dumps("a"), 2.0)])
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name FROM pragma_index_info('items_score') ORDER BY seqno",
+            [("score",), ("serialized_member",)],
+        )
+        self.assertEqual(len(sut), 2)
+        self.assertTrue("a" in sut)
+        self.assertFalse("c" in sut)
+        self.assertEqual(list(sut), ["b", "a"])
+
+    def test_add_and_score(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items")
+        sut.add("a", 3)
+        sut.add("b", 1)
+        sut.add("a", 0.5)
+        self.assert_scored_set_state_equals(memory_db, [(pickle.dumps("a"), 0.5), (pickle.dumps("b"), 1.0)])
+        self.assertEqual(sut.score("b"), 1.0)
+        with self.assertRaisesRegex(KeyError, "'c'"):
+            sut.score("c")
+        with self.assertRaisesRegex(ValueError, "score must not be nan"):
+            sut.add("c", float("nan"))
+        with self.assertRaisesRegex(TypeError, "score must be a real number, not 'str'"):
+            sut.add("c", "1")  # type: ignore
+        with self.assertRaisesRegex(TypeError, "unhashable type: 'list'"):
+            sut.add([], 1)  # type: ignore
+
+    def test_incr_score(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data=[("a", 1)])
+        self.assertEqual(sut.incr_score("a", 2.5), 3.5)
+        self.assertEqual(sut.incr_score("b"), 1.0)
+        self.assertEqual(list(sut.items()), [("b", 1.0), ("a", 3.5)])
+
+    def test_rank(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[int](
+            connection=memory_db,
+            table_name="items",
+            serializer=lambda x: x.to_bytes(1, "big"),
+            deserializer=lambda x: int.from_bytes(x, "big"),
+            data={3: 10, 1: 20, 2: 20, 4: 5},
+        )
+        self.assertEqual([sut.rank(d) for d in (4, 3, 1, 2)], [0, 1, 2, 3])
+        self.assertEqual([sut.rank(d, reverse=True) for d in (2, 1, 3, 4)], [0, 1, 2, 3])
+        with self.assertRaisesRegex(KeyError, "5"):
+            sut.rank(5)
+
+    def test_range_by_score(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 1, "b": 2, "c": 3, "d": 4})
+        self.assertEqual(list(sut.range_by_score(2, 3)), ["b", "c"])
+        self.assertEqual(list(sut.range_by_score(2, 4, inclusive=(False, False))), ["c"])
+        self.assertEqual(list(sut.range_by_score(minimum=3, with_scores=True)), [("c", 3.0), ("d", 4.0)])
+        self.assertEqual(list(sut.range_by_score(maximum=2, reverse=True)), ["b", "a"])
+
+    def test_pop_min_max(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 1, "b": 2, "c": 3})
+        self.assertEqual(sut.pop_min(), ("a", 1.0))
+        self.assertEqual(sut.pop_max(), ("c", 3.0))
+        self.assertEqual(sut.pop_max(), ("b", 2.0))
+        with self.assertRaisesRegex(KeyError, "'pop from an empty set'"):
+            sut.pop_min()
+
+    def test_discard_remove_clear(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 1, "b": 2, "c": 3})
+        sut.discard("a")
+        sut.discard("x")
+        sut.remove("b")
+        with self.assertRaisesRegex(KeyError, "'b'"):
+            sut.remove("b")
+        self.assert_scored_set_state_equals(memory_db, [(pickle.dumps("c"), 3.0)])
+        sut.clear()
+        self.assertEqual(len(sut), 0)
+
+    def test_rebuild(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 1, "b": 2})
+        sut = sc.ScoredSet[str](
+            connection=memory_db,
+            table_name="items",
+            serializer=lambda x: x.encode("utf-8"),
+            deserializer=lambda x: x.decode("utf-8") if x[:1] != b"\x80" else pickle.loads(x),
+        )
+        self.assert_scored_set_state_equals(memory_db, [(b"a", 1.0), (b"b", 2.0)])
+        self.assertEqual(list(sut.items()), [("a", 1.0), ("b", 2.0)])
+
+    def test_table_name_and_copy(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.ScoredSet[str](connection=memory_db, table_name="items", data={"a": 1, "b": 2})
+        sut.table_name = "renamed"
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='renamed' AND sql IS NOT NULL",
+            [("renamed_score",)],
+        )
+        actual = sut.copy()
+        self.assertIsInstance(actual, sc.ScoredSet)
+        self.assertEqual(list(actual.items()), [("a", 1.0), ("b", 2.0)])
+        self.assertNotEqual(actual.table_name, sut.table_name)
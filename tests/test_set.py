@@ -178,6 +178,21 @@ class SetTestCase(SqlTestCase):
         self.assertEqual(sorted(list(actual)), expected)
         self.assert_items_table_only(memory_db)
 
+    def test_iter_with_prefetch(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Set[int](connection=memory_db, table_name="items", data=range(100))
+        sut.set_fetch_size(7, prefetch=3)
+        self.assertEqual(sorted(sut), list(range(100)))
+        sut = sc.Set[int](
+            connection=memory_db,
+            table_name="items",
+            deserializer=lambda x: 1 // 0,
+            rebuild_strategy=sc.RebuildStrategy.SKIP,
+        )
+        sut.set_fetch_size(7, prefetch=3)
+        with self.assertRaises(ZeroDivisionError):
+            list(sut)
+
     def test_isdisjoint(self) -> None:
         memory_db = sqlite3.connect(":memory:")
         self.get_fixture(memory_db, "set/base.sql", "set/isdisjoint.sql")
@@ -854,3 +869,44 @@ class SetTestCase(SqlTestCase):
             [],
         )
         self.assert_items_table_only(memory_db)
+
+    def test_column_type_lookup_of_other_types(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Set[int](connection=memory_db, table_name="items", column_type=sc.ColumnType.INTEGER, data=[1, 2, 3])
+        self.assertFalse("a" in sut)  # type: ignore
+        self.assertTrue(2.0 in sut)
+        self.assertTrue(True in sut)
+        sut.discard("a")  # type: ignore
+        with self.assertRaises(KeyError):
+            sut.remove("a")  # type: ignore
+        self.assertTrue(sut.isdisjoint(["a"]))  # type: ignore
+        self.assertFalse(sut.issuperset(["a"]))  # type: ignore
+        sut.difference_update(["a", 3])  # type: ignore
+        self.assertEqual(sorted(sut), [1, 2])
+        sut.intersection_update(["a", 1.0])  # type: ignore
+        self.assertEqual(sorted(sut), [1])
+        with self.assertRaisesRegex(TypeError, "unhashable type: 'list'"):
+            [] in sut  # type: ignore
+        with self.assertRaisesRegex(TypeError, "ColumnType.INTEGER requires int, not 'str'"):
+            sut.add("a")  # type: ignore
+
+    def test_column_type_mixed(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.Set[Hashable](
+            connection=memory_db,
+            table_name="items",
+            column_type=sc.ColumnType.MIXED,
+            data=[1, 1.5, "a", b"a", None, (1, 2)],
+        )
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT typeof(serialized_value), quote(serialized_value) FROM items WHERE typeof(serialized_value) <> 'blob'",
+            [("integer", "1"), ("real", "1.5"), ("text", "'a'")],
+        )
+        self.assertEqual(len(sut), 6)
+        self.assertTrue(1.0 in sut)
+        self.assertTrue(b"a" in sut)
+        self.assertFalse("b" in sut)
+        sut.add(1.0)
+        self.assertEqual(len(sut), 6)
+        self.assertEqual(set(sut.copy()), {1, 1.5, "a", b"a", None, (1, 2)})
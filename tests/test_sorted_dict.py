@@ -0,0 +1,92 @@
+import pickle
+import sqlite3
+import sys
+from typing import Any
+
+from test_base import SqlTestCase
+
+import sqlitecollections as sc
+from sqlitecollections import codecs
+
+
+class SortedDictTestCase(SqlTestCase):
+    def test_initialize(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[str, Any](connection=memory_db, table_name="items", data={"b": 1, "a": 2})
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "SortedDict")])
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT serialized_key, serialized_value FROM items ORDER BY serialized_key",
+            [(codecs.dumps_ordered("a"), pickle.dumps(2)), (codecs.dumps_ordered("b"), pickle.dumps(1))],
+        )
+        self.assertEqual(sut.key_serializer, codecs.dumps_ordered)
+
+    def test_iteration_order(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[int, str](connection=memory_db, table_name="items", data={5: "a", -1: "b", 3: "c"})
+        self.assertEqual(list(sut), [-1, 3, 5])
+        self.assertEqual(list(sut.items()), [(-1, "b"), (3, "c"), (5, "a")])
+        sut[0] = "d"
+        self.assertEqual(list(sut), [-1, 0, 3, 5])
+        if sys.version_info >= (3, 8):
+            self.assertEqual(list(reversed(sut)), [5, 3, 0, -1])
+        self.assertEqual(sut.popitem(), (5, "a"))
+        self.assertEqual(list(sut), [-1, 0, 3])
+
+    def test_mixed_numeric_keys(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[float, str](connection=memory_db, table_name="items", data={2: "a", 1.5: "b", -1: "c"})
+        self.assertIn(2.0, sut)
+        self.assertEqual(sut[2.0], "a")
+        sut[-1.0] = "d"
+        self.assertEqual(list(sut.items()), [(-1, "d"), (1.5, "b"), (2, "a")])
+        self.assertEqual(list(sut.irange(0, 2.0)), [1.5, 2])
+        self.assertEqual(
+            list(sut.iter_raw_items()),
+            [(codecs.dumps_ordered(k), pickle.dumps(v)) for k, v in [(-1, "d"), (1.5, "b"), (2, "a")]],
+        )
+
+    def test_irange(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[int, int](connection=memory_db, table_name="items", data={i: i for i in range(10)})
+        self.assertEqual(list(sut.irange(3, 6)), [3, 4, 5, 6])
+        self.assertEqual(list(sut.irange(3, 6, inclusive=(False, False))), [4, 5])
+        self.assertEqual(list(sut.irange(minimum=7)), [7, 8, 9])
+        self.assertEqual(list(sut.irange(maximum=2, reverse=True)), [2, 1, 0])
+        self.assertEqual(list(sut.irange()), list(range(10)))
+
+    def test_prefix(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[Any, int](
+            connection=memory_db,
+            table_name="items",
+            data={"user:1": 1, "user:2": 2, "users": 3, "user": 4, "group:1": 5, ("user:", 1): 6},
+        )
+        self.assertEqual(list(sut.prefix("user:")), ["user:1", "user:2"])
+        self.assertEqual(list(sut.prefix("user", reverse=True)), ["users", "user:2", "user:1", "user"])
+        self.assertEqual(list(sut.prefix(("user:",))), [("user:", 1)])
+        self.assertEqual(list(sut.prefix("x")), [])
+
+    def test_peekitem_and_bisect(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[int, str](connection=memory_db, table_name="items", data={10: "a", 20: "b", 30: "c"})
+        self.assertEqual(sut.peekitem(), (30, "c"))
+        self.assertEqual(sut.peekitem(0), (10, "a"))
+        self.assertEqual(sut.peekitem(-2), (20, "b"))
+        with self.assertRaisesRegex(IndexError, "list index out of range"):
+            sut.peekitem(3)
+        self.assertEqual(sut.bisect_left(20), 1)
+        self.assertEqual(sut.bisect_right(20), 2)
+        self.assertEqual(sut.bisect(25), 2)
+        self.assertEqual(sut.bisect_left(0), 0)
+
+    def test_copy(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.SortedDict[int, str](connection=memory_db, table_name="items", data={2: "a", 1: "b"})
+        actual = sut.copy()
+        self.assertIsInstance(actual, sc.SortedDict)
+        self.assertEqual(list(actual.items()), [(1, "b"), (2, "a")])
+        if sys.version_info >= (3, 9):
+            merged = sut | {0: "c"}
+            self.assertIsInstance(merged, sc.SortedDict)
+            self.assertEqual(list(merged), [0, 1, 2])
@@ -0,0 +1,133 @@
+import os
+import pickle
+import sys
+import unittest
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+import sqlitecollections as sc
+
+
+class SpillTestCase(TestCase):
+    def database_file(self, container: Any) -> str:
+        cur = container.connection.execute("PRAGMA database_list")
+        return str([path for _, name, path in cur.fetchall() if name == "main"][0])
+
+    def test_spill_by_bytes(self) -> None:
+        sut = sc.Dict[str, bytes]()
+        self.assertFalse(sut.spilled)
+        self.assertEqual(sut.spill_policy, sc.SpillPolicy())
+        self.assertEqual(self.database_file(sut), "")
+        sut.set_spill_policy(sc.SpillPolicy(max_bytes=64 * 1024))
+        for i in range(10):
+            sut[str(i)] = b"x" * 1000
+        self.assertFalse(sut.spilled)
+        sut.update({str(i): b"y" * 1000 for i in range(10, 100)})
+        self.assertTrue(sut.spilled)
+        self.assertTrue(os.path.exists(self.database_file(sut)))
+        self.assertEqual(len(sut), 100)
+        self.assertEqual(sut["5"], b"x" * 1000)
+        self.assertEqual(sut["50"], b"y" * 1000)
+        sut["100"] = b"z"
+        self.assertEqual(sut.pop("100"), b"z")
+
+    def test_spill_by_entries(self) -> None:
+        sut = sc.List[int](compression=sc.Compression(threshold=0))
+        sut.set_spill_policy(sc.SpillPolicy(max_bytes=None, max_entries=1000))
+        sut.extend(range(1000))
+        self.assertFalse(sut.spilled)
+        sut.extend(range(1000))
+        self.assertTrue(sut.spilled)
+        self.assertEqual(list(sut), list(range(1000)) * 2)
+        self.assertEqual(sut.compression, sc.Compression(threshold=0))
+
+    def test_spill_by_entries_of_small_values(self) -> None:
+        sut = sc.Dict[int, int]()
+        sut.set_spill_policy(sc.SpillPolicy(max_entries=10))
+        for i in range(10):
+            sut[i] = i
+        self.assertFalse(sut.spilled)
+        sut[10] = 10
+        self.assertTrue(sut.spilled)
+        for i in range(11, 100):
+            sut[i] = i
+        self.assertEqual(len(sut), 100)
+
+    def test_spill_by_entries_counts_rarely(self) -> None:
+        sut = sc.Dict[int, int]()
+        sut.set_spill_policy(sc.SpillPolicy(max_bytes=None, max_entries=160))
+        with patch.object(sut._driver_class, "get_count", wraps=sut._driver_class.get_count) as get_count:
+            for i in range(160):
+                sut[i] = i
+            for i in range(100):
+                sut[0] = i
+            self.assertFalse(sut.spilled)
+            self.assertLessEqual(get_count.call_count, 10)
+            for i in range(160, 170):
+                sut[i] = i
+            self.assertTrue(sut.spilled)
+        self.assertEqual(len(sut), 170)
+
+    def test_shared_connection(self) -> None:
+        sut = sc.Dict[int, int](data={1: 2})
+        copied = sut.copy()
+        self.assertEqual(dict(copied.items()), {1: 2})
+        with self.assertRaisesRegex(ValueError, "in-memory connection of a container that hasn't spilled"):
+            copied.set_persist(True)
+        other = sc.Set[int](connection=sut.connection, data=[3])
+        self.assertTrue(sut.spilled)
+        self.assertIs(other.connection, sut.connection)
+        self.assertEqual(list(other), [3])
+        self.assertEqual(dict(sut.items()), {1: 2})
+        sut[3] = 4
+        self.assertEqual(
+            dict(sc.Dict[int, int](connection=other.connection, table_name=sut.table_name).items()), {1: 2, 3: 4}
+        )
+
+    @unittest.skipIf(sys.version_info < (3, 9), "dict union requires Python 3.9")
+    def test_union_of_unspilled_containers(self) -> None:
+        for sut in (
+            sc.Dict[int, int](data={1: 2}),
+            sc.SortedDict[int, int](data={1: 2}),
+            sc.IntegerKeyDict[int](data={1: 2}),
+        ):
+            self.assertFalse(sut.spilled)
+            res = sut | {3: 4}
+            self.assertTrue(sut.spilled)
+            self.assertEqual(dict(res.items()), {1: 2, 3: 4})
+            self.assertEqual(dict(sut.items()), {1: 2})
+
+    def test_spill_on_demand(self) -> None:
+        sut = sc.Set[int](data=[1, 2, 3])
+        self.assertFalse(sut.spilled)
+        restored = pickle.loads(pickle.dumps(sut))
+        self.assertTrue(sut.spilled)
+        self.assertEqual(sorted(restored), [1, 2, 3])
+        sut = sc.Set[int](data=[1, 2, 3])
+        sut.set_spill_policy(sc.SpillPolicy(max_bytes=0))
+        self.assertTrue(sut.spilled)
+        sut.spill()
+        self.assertEqual(sorted(sut), [1, 2, 3])
+        self.assertTrue(sc.Set[int](connection=sut.connection).spilled)
+
+    def test_copies_of_spilled_container(self) -> None:
+        sut = sc.Dict[int, int](data={1: 2})
+        readonly = sut.as_readonly()
+        self.assertTrue(sut.spilled)
+        self.assertTrue(readonly.spilled)
+        self.assertEqual(dict(readonly.items()), {1: 2})
+        self.assertEqual(dict(pickle.loads(pickle.dumps(readonly)).items()), {1: 2})
+        restored = pickle.loads(pickle.dumps(sc.Dict[int, int](data={1: 2})))
+        self.assertTrue(restored.spilled)
+        restored.set_spill_policy(sc.SpillPolicy(max_bytes=1))
+        restored[3] = 4
+        self.assertEqual(dict(restored.items()), {1: 2, 3: 4})
+
+    def test_snapshot(self) -> None:
+        sut = sc.Dict[int, int](data={1: 2})
+        with sut.snapshot(enable_wal=True) as snapshot:
+            self.assertTrue(sut.spilled)
+            self.assertEqual(dict(snapshot.items()), {1: 2})
+        sut[3] = 4
+        self.assertEqual(dict(sut.items()), {1: 2, 3: 4})
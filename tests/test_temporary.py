@@ -0,0 +1,153 @@
+import pickle
+import sqlite3
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+class TemporaryTableTestCase(DatabaseFileTestCase):
+    def data_version(self, conn: sqlite3.Connection) -> int:
+        return int(conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def test_volatile_copies_do_not_write_main_database(self) -> None:
+        conn = sqlite3.connect(self.path)
+        observer = sqlite3.connect(self.path)
+        d = sc.Dict[str, int](connection=conn, table_name="d", data={"a": 1, "b": 2})
+        l = sc.List[int](connection=conn, table_name="l", data=[1, 2, 3, 4])
+        s = sc.Set[int](connection=conn, table_name="s", data=[1, 2, 3])
+        version = self.data_version(observer)
+        copied = d.copy()
+        self.assertTrue(copied.temporary)
+        self.assertFalse(copied.persist)
+        copied["c"] = 3
+        self.assertEqual(dict(copied.items()), {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(list(l[1:3]), [2, 3])
+        self.assertEqual(sorted(s | {4}), [1, 2, 3, 4])
+        self.assertEqual(sorted(s & {2, 3, 5}), [2, 3])
+        self.assertEqual(sorted(s ^ {3, 4}), [1, 2, 4])
+        self.assert_sql_result_equals(
+            conn, f"SELECT name FROM temp.sqlite_master WHERE name='{copied.table_name}'", [(copied.table_name,)]
+        )
+        self.assert_metadata_state_equals(conn, [("d", "0", "Dict"), ("l", "0", "List"), ("s", "0", "Set")])
+        self.assertEqual(self.data_version(observer), version)
+        table_name = copied.table_name
+        del copied
+        self.assert_sql_result_equals(conn, f"SELECT name FROM temp.sqlite_master WHERE name='{table_name}'", [])
+        self.assertEqual(self.data_version(observer), version)
+
+    def test_sorted_dict_integer_key_dict_and_scored_set(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sorted_dict = sc.SortedDict[int, str](connection=conn, data={2: "b", 1: "a"}).copy()
+        self.assertTrue(sorted_dict.temporary)
+        self.assertEqual(list(sorted_dict.items()), [(1, "a"), (2, "b")])
+        integer_key_dict = sc.IntegerKeyDict[str](connection=conn, data={2: "b", 1: "a"}).copy()
+        self.assertTrue(integer_key_dict.temporary)
+        self.assertEqual(dict(integer_key_dict.items()), {1: "a", 2: "b"})
+        scored_set = sc.ScoredSet[str](connection=conn, data={"a": 2.0, "b": 1.0}).copy()
+        self.assertTrue(scored_set.temporary)
+        self.assertEqual(list(scored_set), ["b", "a"])
+
+    def test_deduplicated_copy(self) -> None:
+        conn = sqlite3.connect(self.path)
+        d = sc.Dict[str, bytes](connection=conn, data={"a": b"x" * 100}, deduplicate=True)
+        copied = d.copy()
+        self.assertTrue(copied.temporary)
+        copied["b"] = b"x" * 100
+        self.assertEqual(dict(copied.items()), {"a": b"x" * 100, "b": b"x" * 100})
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(1,)])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM temp.metadata_blobs", [(2,)])
+        del copied
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(1,)])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM temp.metadata_blobs", [])
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM main.metadata_options", [(1,)])
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM temp.metadata_options", [(0,)])
+
+    def test_side_tables_of_copies_stay_in_temp(self) -> None:
+        conn = sqlite3.connect(self.path)
+        observer = sqlite3.connect(self.path)
+        compressed = sc.List[str](
+            connection=conn,
+            table_name="compressed",
+            data=[f"value {i} " * 20 for i in range(10)],
+            compression=sc.Compression("zlib_dict", dictionary_size=256, sample_size=10, threshold=0),
+        )
+        compressed.optimize()
+        deduplicated = sc.Dict[str, bytes](
+            connection=conn, table_name="deduplicated", data={"a": b"x" * 100}, deduplicate=True
+        )
+        sc.Set[int](connection=conn, table_name="bloom", data=[1, 2], bloom_filter=True)
+
+        def dump() -> object:
+            return [
+                conn.execute(f"SELECT * FROM main.{table_name} ORDER BY 1, 2").fetchall()
+                for table_name in ("sqlite_master", "metadata_options", "metadata_blobs")
+            ]
+
+        before = dump()
+        version = self.data_version(observer)
+        compressed_copy = compressed.copy()
+        compressed_copy.append("value 10 " * 20)
+        compressed_copy.optimize()
+        deduplicated_copy = deduplicated.copy()
+        deduplicated_copy["b"] = b"y" * 100
+        bloom = sc.Set[int](connection=conn, data=[3, 4], bloom_filter=True, temporary=True)
+        self.assertIn(3, bloom)
+        self.assertEqual(compressed_copy[10], "value 10 " * 20)
+        self.assertEqual(dict(deduplicated_copy.items()), {"a": b"x" * 100, "b": b"y" * 100})
+        self.assertEqual(dump(), before)
+        self.assertEqual(self.data_version(observer), version)
+        self.assertFalse(conn.in_transaction)
+        del compressed_copy, deduplicated_copy, bloom
+        self.assertEqual(dump(), before)
+        self.assertEqual(self.data_version(observer), version)
+        for table_name in ("metadata_options", "metadata_blobs"):
+            self.assert_sql_result_equals(conn, f"SELECT COUNT(*) FROM temp.{table_name}", [(0,)])
+
+    def test_restrictions(self) -> None:
+        copied = sc.List[int](connection=self.path, data=[1, 2]).copy()
+        with self.assertRaisesRegex(TypeError, "cannot pickle 'List' backed by a temporary table"):
+            pickle.dumps(copied)
+        del copied
+        pool = sc.ConnectionPool(self.path)
+        pooled = sc.List[int](connection=pool, data=[1, 2]).copy()
+        self.assertFalse(pooled.temporary)
+        del pooled
+        with self.assertRaisesRegex(ValueError, "temporary can't be combined with a ConnectionPool"):
+            sc.List[int](connection=pool, temporary=True)
+        pool.close()
+
+    def test_persist_copy(self) -> None:
+        conn = sqlite3.connect(self.path)
+        l = sc.List[int](connection=conn, table_name="l", data=[3, 1, 2]).copy()
+        l.set_persist(True)
+        self.assertFalse(l.temporary)
+        self.assertTrue(l.persist)
+        l.append(4)
+        self.assertEqual(list(pickle.loads(pickle.dumps(l))), [3, 1, 2, 4])
+        self.assertEqual(list(sc.List[int](connection=self.path, table_name=l.table_name)), [3, 1, 2, 4])
+        self.assert_sql_result_equals(conn, "SELECT name FROM temp.sqlite_master", [])
+        d = sc.Dict[str, bytes](connection=conn, data={"a": b"x" * 100}, deduplicate=True, key_hash=True).copy()
+        d.set_persist(True)
+        d["b"] = b"x" * 100
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(3,)])
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM temp.metadata_blobs", [])
+        self.assert_sql_result_equals(
+            conn,
+            f"SELECT name FROM sqlite_master WHERE tbl_name='{d.table_name}' ORDER BY name",
+            [
+                (f"{d.table_name}{suffix}",)
+                for suffix in ["", "_blob_delete", "_blob_insert", "_blob_update", "_key_hash"]
+            ],
+        )
+        del d["a"]
+        self.assertEqual(dict(d.items()), {"b": b"x" * 100})
+        self.assert_sql_result_equals(conn, "SELECT refcount FROM main.metadata_blobs", [(2,)])
+
+    def test_copy_of_readonly_container(self) -> None:
+        l = sc.List[int](connection=self.path, table_name="items", data=[1, 2, 3])
+        copied = l.as_readonly().copy()
+        self.assertTrue(copied.temporary)
+        copied.append(4)
+        self.assertEqual(list(copied), [1, 2, 3, 4])
+        self.assertEqual(list(l), [1, 2, 3])
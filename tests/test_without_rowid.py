@@ -0,0 +1,102 @@
+import sqlite3
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+
+
+class WithoutRowidTestCase(DatabaseFileTestCase):
+    def assert_without_rowid(self, conn: sqlite3.Connection, table_name: str, expected: bool) -> None:
+        cur = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+        self.assertEqual("WITHOUT ROWID" in cur.fetchone()[0], expected)
+
+    def test_unordered_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, int](connection=conn, table_name="items", data={"b": 1, "a": 2}, ordered=False)
+        self.assertFalse(sut.ordered)
+        self.assertEqual(sut.schema_version, "0_unordered")
+        self.assert_without_rowid(conn, "items", True)
+        self.assertNotIn("item_order", [d[1] for d in conn.execute("PRAGMA table_info(items)")])
+        sut["c"] = 3
+        sut["a"] = 4
+        del sut["b"]
+        self.assertEqual(sut["a"], 4)
+        self.assertIn("c", sut)
+        self.assertEqual(sorted(sut.items()), [("a", 4), ("c", 3)])
+        self.assertEqual(list(reversed(list(sut))), list(reversed(sut)))
+        self.assertEqual(len(sut.popitem()), 2)
+        self.assertEqual(len(sut), 1)
+        sut.update({str(i): i for i in range(100)})
+        self.assertEqual(sorted(x for p in sut.partitions(3) for x in p), sorted(sut.items()))
+        self.assertFalse(sut.copy().ordered)
+        reopened = sc.Dict[str, int](connection=conn, table_name="items")
+        self.assertFalse(reopened.ordered)
+        self.assertEqual(len(reopened), 101)
+        rebuilt = sc.Dict[str, int](connection=conn, table_name="items", rebuild_strategy=sc.RebuildStrategy.ALWAYS)
+        self.assertEqual(dict(rebuilt.items()), dict(reopened.items()))
+        with self.assertRaisesRegex(ValueError, "key_hash can't be combined with ordered=False"):
+            sc.Dict[str, int](ordered=False, key_hash=True)
+
+    def test_unordered_dict_with_large_values_and_deduplication(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Dict[str, bytes](connection=conn, table_name="items", ordered=False, deduplicate=True)
+        sut["a"] = b"x" * 100
+        sut["b"] = b"x" * 100
+        with sut.open_value("c", "wb") as f:
+            f.write(b"y" * 1000)
+        with sut.open_value("c") as f:
+            self.assertEqual(f.read(), b"y" * 1000)
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_blobs", [(1,)])
+        del sut["a"], sut["b"], sut["c"]
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_blobs", [(0,)])
+        self.assert_sql_result_equals(conn, "SELECT COUNT(*) FROM metadata_chunks", [(0,)])
+
+    def test_migrate_dict(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.Dict[str, int](connection=conn, table_name="items", data={"b": 1, "a": 2})
+        sut = sc.Dict[str, int](connection=conn, table_name="items", ordered=False)
+        self.assertEqual(sorted(sut.items()), [("a", 2), ("b", 1)])
+        self.assert_sql_result_equals(
+            conn, "SELECT schema_version FROM metadata WHERE table_name='items'", [("0_unordered",)]
+        )
+        sut = sc.Dict[str, int](connection=conn, table_name="items", key_hash=True)
+        self.assertTrue(sut.ordered)
+        self.assertTrue(sut.key_hash)
+        self.assertEqual(sorted(sut.items()), [("a", 2), ("b", 1)])
+        sut = sc.Dict[str, int](connection=conn, table_name="items", ordered=True, key_hash=False)
+        self.assertEqual(sut.schema_version, "0")
+        self.assert_without_rowid(conn, "items", False)
+        self.assertEqual(sorted(sut.items()), [("a", 2), ("b", 1)])
+
+    def test_set(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sut = sc.Set[str](connection=conn, table_name="items", data=["a", "b"], without_rowid=True)
+        self.assertTrue(sut.without_rowid)
+        self.assertEqual(sut.schema_version, "0_without_rowid")
+        self.assert_without_rowid(conn, "items", True)
+        sut.add("c")
+        sut.discard("a")
+        self.assertEqual(sorted(sut), ["b", "c"])
+        sut.intersection_update(["b", "c", "d"])
+        sut.symmetric_difference_update(["c", "e"])
+        self.assertEqual(sorted(sut), ["b", "e"])
+        self.assertTrue(sut > {"b"})
+        sut.update(str(i) for i in range(100))
+        self.assertEqual(sorted(x for p in sut.partitions(3) for x in p), sorted(sut))
+        self.assertTrue(sut.copy().without_rowid)
+        self.assertTrue(sc.Set[str](connection=conn, table_name="items").without_rowid)
+        rebuilt = sc.Set[str](connection=conn, table_name="items", rebuild_strategy=sc.RebuildStrategy.ALWAYS)
+        self.assertEqual(len(rebuilt), 102)
+        with self.assertRaisesRegex(ValueError, "key_hash can't be combined with without_rowid"):
+            sc.Set[str](without_rowid=True, key_hash=True)
+
+    def test_migrate_set(self) -> None:
+        conn = sqlite3.connect(self.path)
+        sc.Set[str](connection=conn, table_name="items", data=["a", "b"], key_hash=True)
+        sut = sc.Set[str](connection=conn, table_name="items", without_rowid=True)
+        self.assertFalse(sut.key_hash)
+        self.assertEqual(sorted(sut), ["a", "b"])
+        self.assert_without_rowid(conn, "items", True)
+        sut = sc.Set[str](connection=conn, table_name="items", without_rowid=False)
+        self.assertEqual(sut.schema_version, "0")
+        self.assertEqual(sorted(sut), ["a", "b"])
@@ -0,0 +1,123 @@
+import os
+import pickle
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from typing import Any, List
+from unittest.mock import patch
+
+from test_base import SqlTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.work_queue import Job, _WorkQueueDatabaseDriver
+
+
+class WorkQueueTestCase(SqlTestCase):
+    def assert_queue_state_equals(self, conn: sqlite3.Connection, expected: Any) -> None:
+        return self.assert_sql_result_equals(
+            conn,
+            "SELECT job_id, serialized_payload, state, attempts FROM items ORDER BY job_id",
+            expected,
+        )
+
+    def test_initialize(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.WorkQueue[str](connection=memory_db, table_name="items", data=["a", "b"])
+        self.assert_metadata_state_equals(memory_db, [("items", "0", "WorkQueue")])
+        self.assert_queue_state_equals(memory_db, [(1, pickle.dumps("a"), 0, 0), (2, pickle.dumps("b"), 0, 0)])
+        self.assert_sql_result_equals(
+            memory_db,
+            "SELECT name FROM pragma_index_info('items_state') ORDER BY seqno",
+            [("state",), ("available_at",)],
+        )
+        self.assertEqual(len(sut), 2)
+        self.assertEqual(sut.ready_count, 2)
+        self.assertEqual(sut.claimed_count, 0)
+
+    def test_claim_uses_index(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sc.WorkQueue[str](connection=memory_db, table_name="items")
+        cur = memory_db.cursor()
+        cur.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id FROM items WHERE state=0 AND available_at<=? "
+            "ORDER BY available_at, job_id LIMIT 1",
+            (0.0,),
+        )
+        details = " ".join(d[-1] for d in cur.fetchall())
+        self.assertIn("INDEX items_state", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    def test_put_claim_ack(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.WorkQueue[str](connection=memory_db, table_name="items")
+        self.assertEqual(sut.put("a"), 1)
+        sut.put_many(["b", "c"])
+        sut.put("later", delay=3600)
+        jobs = sut.claim(2)
+        self.assertEqual([(d.job_id, d.payload, d.attempts) for d in jobs], [(1, "a", 1), (2, "b", 1)])
+        self.assertEqual(len({d.lease for d in jobs}), 1)
+        self.assertEqual(sut.claimed_count, 2)
+        self.assertEqual([d.payload for d in sut.claim(10)], ["c"])
+        self.assertEqual(sut.claim(10), [])
+        self.assertTrue(sut.ack(jobs[0]))
+        self.assertFalse(sut.ack(jobs[0]))
+        self.assertEqual(len(sut), 3)
+
+    def test_nack(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.WorkQueue[str](connection=memory_db, table_name="items", data=["a"])
+        job = sut.claim()[0]
+        self.assertTrue(sut.nack(job))
+        self.assertFalse(sut.ack(job))
+        retried = sut.claim()[0]
+        self.assertEqual((retried.job_id, retried.attempts), (job.job_id, 2))
+        self.assertNotEqual(retried.lease, job.lease)
+        self.assertTrue(sut.nack(retried, delay=3600))
+        self.assertEqual(sut.claim(), [])
+
+    def test_visibility_timeout(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.WorkQueue[str](connection=memory_db, table_name="items", data=["a"])
+        job = sut.claim(lease_seconds=0)[0]
+        time.sleep(0.01)
+        retried = sut.claim()[0]
+        self.assertEqual((retried.job_id, retried.attempts), (job.job_id, 2))
+        self.assertFalse(sut.ack(job))
+        self.assertTrue(sut.ack(retried))
+        self.assertEqual(len(sut), 0)
+        sut.put("b")
+        sut.claim(lease_seconds=0)
+        time.sleep(0.01)
+        self.assertEqual(sut.requeue_expired(), 1)
+        self.assertEqual(sut.ready_count, 1)
+
+    def test_claim_without_returning(self) -> None:
+        memory_db = sqlite3.connect(":memory:")
+        sut = sc.WorkQueue[str](connection=memory_db, table_name="items", data=["a", "b", "c"])
+        with patch.object(_WorkQueueDatabaseDriver, "supports_returning", False):
+            jobs = sut.claim(2)
+            self.assertEqual(sut.claim(0), [])
+        self.assertEqual([(d.job_id, d.payload, d.attempts) for d in jobs], [(1, "a", 1), (2, "b", 1)])
+        self.assertFalse(memory_db.in_transaction)
+        self.assertEqual(sut.claimed_count, 2)
+
+    def test_concurrent_claims_are_exclusive(self) -> None:
+        with TemporaryDirectory() as d:
+            path = os.path.join(d, "queue.db")
+            sc.WorkQueue[int](connection=path, table_name="items", data=range(200))
+
+            def consume(_: int) -> Any:
+                sut = sc.WorkQueue[int](connection=sqlite3.connect(path, timeout=30), table_name="items")
+                res: List[int] = []
+                while True:
+                    jobs = sut.claim(7)
+                    if len(jobs) == 0:
+                        return res
+                    for job in jobs:
+                        self.assertTrue(sut.ack(job))
+                        res.append(job.payload)
+
+            with ThreadPoolExecutor(4) as executor:
+                results = [d for res in executor.map(consume, range(4)) for d in res]
+            self.assertEqual(sorted(results), list(range(200)))
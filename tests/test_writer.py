@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from test_base import DatabaseFileTestCase
+
+import sqlitecollections as sc
+from sqlitecollections.writer import GroupCommitWriter
+
+
+class GroupCommitWriterTestCase(DatabaseFileTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pool = sc.ConnectionPool(self.path)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        super().tearDown()
+
+    def test_submit(self) -> None:
+        sut = sc.Dict[str, int](connection=self.pool, table_name="items")
+        future = sut.submit(sut.__setitem__, "a", 1)
+        self.assertIsNone(future.result())
+        self.assertEqual(sut.submit(sut.get, "a").result(), 1)
+        self.assertEqual(sut["a"], 1)
+        self.assertIsInstance(self.pool.writer, GroupCommitWriter)
+        self.assertIs(self.pool.writer, self.pool.writer)
+
+    def test_submit_without_pool(self) -> None:
+        sut = sc.Dict[str, int](table_name="items")
+        with self.assertRaisesRegex(ValueError, "submit requires the container to be created with a ConnectionPool"):
+            sut.submit(sut.__setitem__, "a", 1)
+
+    def test_batch(self) -> None:
+        sut = sc.List[int](connection=self.pool, table_name="items")
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        blocker = sut.submit(block)
+        started.wait()
+        futures = [sut.submit(sut.append, i) for i in range(10)]
+        failing = sut.submit(sut.__setitem__, 100, 0)
+        futures.extend(sut.submit(sut.append, i) for i in range(10, 20))
+        batch_count = self.pool.writer.batch_count
+        release.set()
+        blocker.result()
+        for future in futures:
+            future.result()
+        with self.assertRaisesRegex(IndexError, "list assignment index out of range"):
+            failing.result()
+        self.assertEqual(self.pool.writer.batch_count, batch_count + 2)
+        self.assertEqual(list(sut), list(range(20)))
+
+    def test_concurrent_producers(self) -> None:
+        sut = sc.Dict[int, int](connection=self.pool, table_name="items")
+
+        def produce(i: int) -> Any:
+            return [sut.submit(sut.__setitem__, i * 100 + j, j) for j in range(100)]
+
+        with ThreadPoolExecutor(8) as executor:
+            futures = [d for res in executor.map(produce, range(8)) for d in res]
+        for future in futures:
+            future.result()
+        self.assertEqual(len(sut), 800)
+        self.assertLess(self.pool.writer.batch_count, 800)
+
+    def test_max_batch_size(self) -> None:
+        with self.assertRaisesRegex(ValueError, "max_batch_size must be positive"):
+            GroupCommitWriter(self.pool, max_batch_size=0)
+        writer = GroupCommitWriter(self.pool, max_batch_size=2)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        writer.submit(block)
+        started.wait()
+        futures = [writer.submit(lambda x: x, i) for i in range(5)]
+        release.set()
+        self.assertEqual([d.result() for d in futures], list(range(5)))
+        self.assertEqual(writer.batch_count, 4)
+        writer.close()
+        with self.assertRaisesRegex(RuntimeError, "cannot submit to a closed writer"):
+            writer.submit(lambda: None)
+
+    def test_close_flushes(self) -> None:
+        sut = sc.Set[int](connection=self.pool, table_name="items")
+        for i in range(50):
+            sut.submit(sut.add, i)
+        self.pool.writer.flush()
+        self.assertEqual(len(sut), 50)
+        futures = [sut.submit(sut.add, i) for i in range(50, 100)]
+        self.pool.close()
+        self.assertTrue(all(d.done() for d in futures))
+        self.assertEqual(len(sc.Set[int](connection=self.pool, table_name="items")), 100)